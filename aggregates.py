@@ -0,0 +1,87 @@
+from typing import Tuple
+import numpy as np
+
+
+class AggregateTracker:
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total_mass = 0.0
+        self.mass_weighted_x = 0.0
+        self.mass_weighted_y = 0.0
+        self.momentum_x = 0.0
+        self.momentum_y = 0.0
+        self.kinetic_energy = 0.0
+        self.reference_momentum: Tuple[float, float] | None = None
+
+    def add(self, mass: float, x: float, y: float, x_velocity: float = 0.0, y_velocity: float = 0.0) -> None:
+        self.count += 1
+        self.total_mass += mass
+        self.mass_weighted_x += mass * x
+        self.mass_weighted_y += mass * y
+        self.momentum_x += mass * x_velocity
+        self.momentum_y += mass * y_velocity
+        self.kinetic_energy += 0.5 * mass * (x_velocity ** 2 + y_velocity ** 2)
+        self.reference_momentum = None
+
+    def remove(self, mass: float, x: float, y: float, x_velocity: float = 0.0, y_velocity: float = 0.0) -> None:
+        self.count -= 1
+        if not self.count:
+            self.clear()
+            return
+
+        self.total_mass -= mass
+        self.mass_weighted_x -= mass * x
+        self.mass_weighted_y -= mass * y
+        self.momentum_x -= mass * x_velocity
+        self.momentum_y -= mass * y_velocity
+        self.kinetic_energy -= 0.5 * mass * (x_velocity ** 2 + y_velocity ** 2)
+        self.reference_momentum = None
+
+    def move(self, mass: float, old_x: float, old_y: float, new_x: float, new_y: float) -> None:
+        self.mass_weighted_x += mass * (new_x - old_x)
+        self.mass_weighted_y += mass * (new_y - old_y)
+
+    def change_mass(
+            self,
+            old_mass: float,
+            new_mass: float,
+            x: float,
+            y: float,
+            x_velocity: float = 0.0,
+            y_velocity: float = 0.0
+    ) -> None:
+        difference = new_mass - old_mass
+        self.total_mass += difference
+        self.mass_weighted_x += difference * x
+        self.mass_weighted_y += difference * y
+        self.momentum_x += difference * x_velocity
+        self.momentum_y += difference * y_velocity
+        self.kinetic_energy += 0.5 * difference * (x_velocity ** 2 + y_velocity ** 2)
+        self.reference_momentum = None
+
+    def shift(self, dx: float, dy: float) -> None:
+        self.mass_weighted_x += self.total_mass * dx
+        self.mass_weighted_y += self.total_mass * dy
+
+    def update_from_arrays(self, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray) -> None:
+        self.count = len(masses)
+        self.total_mass = float(masses.sum())
+        self.mass_weighted_x, self.mass_weighted_y = (masses @ positions).tolist() if self.count else (0.0, 0.0)
+        self.momentum_x, self.momentum_y = (masses @ velocities).tolist() if self.count else (0.0, 0.0)
+        self.kinetic_energy = 0.5 * float(masses @ (velocities ** 2).sum(axis=1)) if self.count else 0.0
+
+    def center_of_mass(self) -> Tuple[float, float] | None:
+        if self.count and self.total_mass:
+            return self.mass_weighted_x / self.total_mass, self.mass_weighted_y / self.total_mass
+        return None
+
+    def momentum_drift(self) -> float:
+        if self.reference_momentum is None:
+            self.reference_momentum = self.momentum_x, self.momentum_y
+            return 0.0
+
+        reference_x, reference_y = self.reference_momentum
+        return ((self.momentum_x - reference_x) ** 2 + (self.momentum_y - reference_y) ** 2) ** 0.5
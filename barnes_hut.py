@@ -0,0 +1,151 @@
+from typing import Tuple
+import numpy as np
+
+from engine import ArrayEngine
+
+
+class QuadTree:
+    MAX_DEPTH = 16
+
+    def __init__(self, positions: np.ndarray, leaf_size: int = 8) -> None:
+        self.leaf_size = leaf_size
+
+        lower = positions.min(axis=0)
+        extent = float((positions.max(axis=0) - lower).max()) or 1.0
+        self.root_size = extent * (1 + 1e-9)
+
+        cells = np.floor((positions - lower) / self.root_size * (1 << self.MAX_DEPTH)).astype(np.uint64)
+        codes = interleave_bits(cells[:, 0]) | (interleave_bits(cells[:, 1]) << np.uint64(1))
+        self.order = np.argsort(codes, kind="stable")
+        self.sorted_positions = positions[self.order]
+        self.sorted_codes = codes[self.order]
+
+        self.build()
+
+    def build(self) -> None:
+        number_of_bodies = len(self.sorted_codes)
+        prefix_sums = np.zeros((number_of_bodies + 1, 2))
+        np.cumsum(self.sorted_positions, axis=0, out=prefix_sums[1:])
+
+        starts_per_level = []
+        ends_per_level = []
+        starts = np.zeros(1, dtype=np.int64)
+        ends = np.full(1, number_of_bodies, dtype=np.int64)
+
+        for level in range(self.MAX_DEPTH + 1):
+            starts_per_level.append(starts)
+            ends_per_level.append(ends)
+            if level == self.MAX_DEPTH or (ends - starts).max() <= self.leaf_size:
+                break
+
+            shift = np.uint64(2 * (self.MAX_DEPTH - level - 1))
+            keys = self.sorted_codes >> shift
+            boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [number_of_bodies]))
+
+        level_offsets = np.cumsum([0] + [len(level_starts) for level_starts in starts_per_level])
+        self.starts = np.concatenate(starts_per_level)
+        self.ends = np.concatenate(ends_per_level)
+        self.counts = self.ends - self.starts
+        self.sizes = np.concatenate([
+            np.full(len(level_starts), self.root_size / (1 << level))
+            for level, level_starts in enumerate(starts_per_level)
+        ])
+        self.centroids = (prefix_sums[self.ends] - prefix_sums[self.starts]) / self.counts[:, np.newaxis]
+
+        self.first_children = np.zeros(len(self.starts), dtype=np.int64)
+        self.children_counts = np.zeros(len(self.starts), dtype=np.int64)
+        for level in range(len(starts_per_level) - 1):
+            parents = slice(level_offsets[level], level_offsets[level + 1])
+            children_starts = starts_per_level[level + 1]
+            first = np.searchsorted(children_starts, starts_per_level[level])
+            last = np.searchsorted(children_starts, ends_per_level[level])
+            self.first_children[parents] = first + level_offsets[level + 1]
+            self.children_counts[parents] = last - first
+
+        self.leaves = (self.counts <= self.leaf_size) | (self.children_counts == 0)
+
+    def unit_force_sum(self, targets: np.ndarray, theta: float) -> np.ndarray:
+        number_of_targets = len(targets)
+        forces_x = np.zeros(number_of_targets)
+        forces_y = np.zeros(number_of_targets)
+
+        pending_targets = np.arange(number_of_targets)
+        pending_nodes = np.zeros(number_of_targets, dtype=np.int64)
+
+        while len(pending_targets):
+            dx = self.centroids[pending_nodes, 0] - targets[pending_targets, 0]
+            dy = self.centroids[pending_nodes, 1] - targets[pending_targets, 1]
+            distance_squared = dx * dx + dy * dy
+            sizes = self.sizes[pending_nodes]
+
+            accepted = sizes * sizes < theta * theta * distance_squared
+            if accepted.any():
+                weights = self.counts[pending_nodes[accepted]] / np.sqrt(distance_squared[accepted])
+                forces_x += np.bincount(pending_targets[accepted], dx[accepted] * weights, number_of_targets)
+                forces_y += np.bincount(pending_targets[accepted], dy[accepted] * weights, number_of_targets)
+
+            opened = ~accepted
+            leaves = opened & self.leaves[pending_nodes]
+            if leaves.any():
+                self.add_direct_forces(
+                    targets, pending_targets[leaves], pending_nodes[leaves], forces_x, forces_y
+                )
+
+            inner = opened & ~leaves
+            pending_targets, pending_nodes = expand(
+                pending_targets[inner],
+                self.first_children[pending_nodes[inner]],
+                self.children_counts[pending_nodes[inner]]
+            )
+
+        return np.stack((forces_x, forces_y), axis=-1)
+
+    def add_direct_forces(
+            self,
+            targets: np.ndarray,
+            target_indices: np.ndarray,
+            nodes: np.ndarray,
+            forces_x: np.ndarray,
+            forces_y: np.ndarray
+    ) -> None:
+        target_indices, sources = expand(target_indices, self.starts[nodes], self.counts[nodes])
+        dx = self.sorted_positions[sources, 0] - targets[target_indices, 0]
+        dy = self.sorted_positions[sources, 1] - targets[target_indices, 1]
+
+        inverse_distance = np.hypot(dx, dy)
+        np.divide(1.0, inverse_distance, out=inverse_distance, where=inverse_distance > 0.0)
+
+        forces_x += np.bincount(target_indices, dx * inverse_distance, len(forces_x))
+        forces_y += np.bincount(target_indices, dy * inverse_distance, len(forces_y))
+
+
+class BarnesHutEngine(ArrayEngine):
+    name = "barnes-hut"
+
+    def __init__(self, initial_capacity: int = 64, theta: float = 0.5, leaf_size: int = 8) -> None:
+        super().__init__(initial_capacity)
+        self.theta = theta
+        self.leaf_size = leaf_size
+        self.tree = None
+
+    def compute_accelerations(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        self.tree = QuadTree(positions, self.leaf_size)
+        accelerations = self.tree.unit_force_sum(positions, self.theta)
+        accelerations /= masses[:, np.newaxis]
+        return accelerations
+
+
+def interleave_bits(values: np.ndarray) -> np.ndarray:
+    values = values & np.uint64(0x0000FFFF)
+    for shift, mask in ((8, 0x00FF00FF), (4, 0x0F0F0F0F), (2, 0x33333333), (1, 0x55555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def expand(parents: np.ndarray, firsts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    total = int(counts.sum())
+    repeated_parents = np.repeat(parents, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return repeated_parents, np.repeat(firsts, counts) + offsets
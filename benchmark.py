@@ -0,0 +1,254 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+from time import perf_counter
+from typing import Dict, List, NamedTuple
+import numpy as np
+
+from engine import ENGINE_NAMES, create_engine
+from simulation import Simulation
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BODY_COUNTS = (25, 250, 2_500, 25_000)
+WIDTH = 1000
+HEIGHT = 800
+
+
+class BenchmarkCase(NamedTuple):
+    engine: str
+    bodies: int
+    tracers: bool
+    render: bool
+
+    @property
+    def key(self) -> str:
+        key = f"{self.engine}/{self.bodies}/tracers-{'on' if self.tracers else 'off'}"
+        return f"{key}/render" if self.render else key
+
+
+class BenchmarkResult(NamedTuple):
+    frames: int
+    steps_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mb: float | None
+
+
+def peak_memory_mb() -> float | None:
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def create_simulation(case: BenchmarkCase) -> Simulation:
+    simulation = Simulation(
+        width=WIDTH,
+        height=HEIGHT,
+        starting_number_of_planets=case.bodies,
+        max_number_of_planets=case.bodies,
+        min_planet_mass=50,
+        max_planet_mass=1000,
+        max_tracer_positions=1000,
+        engine=create_engine(case.engine),
+        seed=0
+    )
+    simulation.set_tracers_enabled(case.tracers)
+    return simulation
+
+
+def measure_case(case: BenchmarkCase, frames: int, warmup: int, max_seconds: float) -> BenchmarkResult:
+    simulation = create_simulation(case)
+    advance = simulation.step
+
+    if case.render:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        from main import MainWindow
+        from worker import capture_snapshot
+
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        window = MainWindow(min_width=WIDTH, min_height=HEIGHT, simulation=simulation)
+        window.timer.stop()
+        window.worker.stop()
+        window.tracer_button.setChecked(case.tracers)
+
+        def advance() -> None:
+            simulation.step()
+            window.worker.snapshot = capture_snapshot(simulation)
+            window.update_simulation()
+            window.grab()
+            app.processEvents()
+
+    for _ in range(warmup):
+        advance()
+
+    frame_times = []
+    started = perf_counter()
+    while len(frame_times) < frames and (not frame_times or perf_counter() - started < max_seconds):
+        frame_started = perf_counter()
+        advance()
+        frame_times.append(perf_counter() - frame_started)
+    elapsed = perf_counter() - started
+
+    simulation.close()
+    p50, p99 = np.percentile(frame_times, (50, 99)).tolist()
+    return BenchmarkResult(
+        frames=len(frame_times),
+        steps_per_second=len(frame_times) / elapsed,
+        p50_ms=p50 * 1000,
+        p99_ms=p99 * 1000,
+        peak_memory_mb=peak_memory_mb()
+    )
+
+
+def measure_case_in_process(
+        case: BenchmarkCase,
+        frames: int,
+        warmup: int,
+        max_seconds: float,
+        results: multiprocessing.Queue
+) -> None:
+    results.put(measure_case(case, frames, warmup, max_seconds))
+
+
+def run_case(case: BenchmarkCase, frames: int, warmup: int, max_seconds: float) -> BenchmarkResult:
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=measure_case_in_process,
+        args=(case, frames, warmup, max_seconds, results)
+    )
+    process.start()
+    process.join()
+    if process.exitcode:
+        raise RuntimeError(f"{case.key} failed with exit code {process.exitcode}")
+    return results.get()
+
+
+def predicted_frame_seconds(measurements: List[tuple], bodies: int) -> float | None:
+    if not measurements:
+        return None
+
+    last_bodies, last_seconds = measurements[-1]
+    exponent = 2.0
+    if len(measurements) > 1:
+        previous_bodies, previous_seconds = measurements[-2]
+        exponent = math.log(last_seconds / previous_seconds) / math.log(last_bodies / previous_bodies)
+        exponent = min(max(exponent, 1.0), 2.0)
+    return last_seconds * (bodies / last_bodies) ** exponent
+
+
+def run_benchmarks(
+        engines: List[str],
+        body_counts: List[int],
+        frames: int,
+        warmup: int,
+        max_seconds: float,
+        render: bool
+) -> Dict[str, BenchmarkResult | None]:
+    results = {}
+    for engine in engines:
+        for tracers in (False, True):
+            measurements = []
+            for bodies in sorted(body_counts):
+                case = BenchmarkCase(engine, bodies, tracers, render)
+                predicted = predicted_frame_seconds(measurements, bodies)
+                if predicted is not None and predicted * (warmup + 1) > max_seconds:
+                    results[case.key] = None
+                    print(f"{case.key:<36} skipped, about {predicted:.1f} s per frame", flush=True)
+                    continue
+
+                result = run_case(case, frames, warmup, max_seconds)
+                measurements.append((bodies, result.p50_ms / 1000))
+                results[case.key] = result
+                print(f"{case.key:<36} {format_result(result)}", flush=True)
+    return results
+
+
+def format_result(result: BenchmarkResult) -> str:
+    memory = "n/a" if result.peak_memory_mb is None else f"{result.peak_memory_mb:.0f} MB"
+    return f"{result.steps_per_second:10.1f} steps/s  p50 {result.p50_ms:9.3f} ms  " \
+        f"p99 {result.p99_ms:9.3f} ms  peak {memory}"
+
+
+def find_regressions(
+        results: Dict[str, BenchmarkResult | None],
+        baseline: Dict[str, dict],
+        threshold: float
+) -> List[str]:
+    regressions = []
+    for key, result in results.items():
+        if result is None or key not in baseline:
+            continue
+
+        expected = baseline[key]
+        if result.steps_per_second < expected["steps_per_second"] * (1 - threshold):
+            regressions.append(
+                f"{key}: {result.steps_per_second:.1f} steps/s, baseline {expected['steps_per_second']:.1f}"
+            )
+        if result.p99_ms > expected["p99_ms"] * (1 + threshold):
+            regressions.append(f"{key}: p99 {result.p99_ms:.3f} ms, baseline {expected['p99_ms']:.3f} ms")
+        if result.peak_memory_mb is not None and expected.get("peak_memory_mb") is not None \
+                and result.peak_memory_mb > expected["peak_memory_mb"] * (1 + threshold):
+            regressions.append(
+                f"{key}: peak {result.peak_memory_mb:.0f} MB, baseline {expected['peak_memory_mb']:.0f} MB"
+            )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["cases"]
+
+
+def save_baseline(path: str, results: Dict[str, BenchmarkResult | None]) -> None:
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {"cases": {key: result._asdict() for key, result in results.items() if result is not None}},
+            baseline_file,
+            indent=2
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation over engines, body counts and tracers.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINE_NAMES, default=list(ENGINE_NAMES))
+    parser.add_argument("--bodies", nargs="+", type=int, default=list(BODY_COUNTS))
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--baseline", default="benchmark_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.engines, args.bodies, args.frames, args.warmup, args.max_seconds, args.render)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return
+
+    regressions = find_regressions(results, load_baseline(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"Regression {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
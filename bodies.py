@@ -0,0 +1,178 @@
+from typing import Dict, Iterator, List, Tuple
+from math import sqrt
+import numpy as np
+
+from planet import Planet
+from tracer import TracerBuffer
+
+ARRAY_NAMES = ("positions", "velocities", "masses", "radii", "ids", "tracer_enabled")
+
+
+class BodyStore:
+    def __init__(self, initial_capacity: int = 64, max_tracer_positions: int = 1000) -> None:
+        self.max_tracer_positions = max_tracer_positions
+        self.capacity = 0
+        self.count = 0
+        self.positions = np.empty((0, 2))
+        self.velocities = np.empty((0, 2))
+        self.masses = np.empty(0)
+        self.radii = np.empty(0)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.tracer_enabled = np.empty(0, dtype=bool)
+
+        self.tracers: List[TracerBuffer | None] = []
+        self.views: List[Planet] = []
+        self.index_of: Dict[int, int] = {}
+        self.next_id = 0
+        self.oldest_id = 0
+        self.reserve(initial_capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Planet]:
+        return iter(self.views)
+
+    def __getitem__(self, index: int) -> Planet:
+        return self.views[index]
+
+    def __contains__(self, planet: Planet) -> bool:
+        return isinstance(planet, Planet) and planet.store is self and planet.id in self.index_of
+
+    def index(self, planet: Planet) -> int:
+        if planet not in self:
+            raise ValueError("Planet is not in this store")
+        return self.index_of[planet.id]
+
+    def find(self, body_id: int) -> Planet | None:
+        index = self.index_of.get(body_id)
+        return None if index is None else self.views[index]
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+
+        new_capacity = max(capacity, self.capacity * 2)
+        for name in ARRAY_NAMES:
+            old_array = getattr(self, name)
+            array = np.zeros((new_capacity,) + old_array.shape[1:], dtype=old_array.dtype)
+            array[:self.count] = old_array[:self.count]
+            setattr(self, name, array)
+        self.capacity = new_capacity
+
+    def state(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = self.count
+        return self.positions[:n], self.velocities[:n], self.masses[:n]
+
+    def add(
+            self,
+            x: float,
+            y: float,
+            mass: float,
+            x_velocity: float = 0.0,
+            y_velocity: float = 0.0,
+            tracer_enabled: bool = False
+    ) -> Planet:
+        self.reserve(self.count + 1)
+        index = self.count
+        planet = Planet(self, self.next_id)
+
+        self.positions[index] = x, y
+        self.velocities[index] = x_velocity, y_velocity
+        self.masses[index] = mass
+        self.radii[index] = int(sqrt(mass))
+        self.ids[index] = planet.id
+        self.tracer_enabled[index] = tracer_enabled
+
+        self.tracers.append(None)
+        self.views.append(planet)
+        self.index_of[planet.id] = index
+        self.next_id += 1
+        self.count += 1
+        return planet
+
+    def extend(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            tracer_enabled: bool = False
+    ) -> List[Planet]:
+        number_of_new_bodies = len(masses)
+        start, stop = self.count, self.count + number_of_new_bodies
+        self.reserve(stop)
+
+        self.positions[start:stop] = positions
+        self.velocities[start:stop] = velocities
+        self.masses[start:stop] = masses
+        self.radii[start:stop] = np.floor(np.sqrt(self.masses[start:stop]))
+        self.ids[start:stop] = np.arange(self.next_id, self.next_id + number_of_new_bodies)
+        self.tracer_enabled[start:stop] = tracer_enabled
+
+        ids = self.ids[start:stop].tolist()
+        planets = [Planet(self, body_id) for body_id in ids]
+        self.views.extend(planets)
+        self.tracers.extend([None] * number_of_new_bodies)
+        self.index_of.update(zip(ids, range(start, stop)))
+        self.next_id += number_of_new_bodies
+        self.count = stop
+        return planets
+
+    def tracer_at(self, index: int) -> TracerBuffer:
+        tracer = self.tracers[index]
+        if tracer is None:
+            tracer = self.tracers[index] = TracerBuffer(self.max_tracer_positions)
+        return tracer
+
+    def detach(self, start: int, stop: int) -> "BodyStore":
+        detached = BodyStore(0, self.max_tracer_positions)
+        for name in ARRAY_NAMES:
+            setattr(detached, name, getattr(self, name)[start:stop].copy())
+        detached.capacity = detached.count = stop - start
+        detached.tracers = self.tracers[start:stop]
+        detached.views = self.views[start:stop]
+        detached.index_of = {planet.id: index for index, planet in enumerate(detached.views)}
+        detached.next_id = self.next_id
+
+        for planet in detached.views:
+            planet.store = detached
+        return detached
+
+    def remove(self, planet: Planet) -> bool:
+        if planet not in self:
+            return False
+
+        index = self.index_of[planet.id]
+        self.detach(index, index + 1)
+        del self.index_of[planet.id]
+
+        last = self.count - 1
+        if index != last:
+            for name in ARRAY_NAMES:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved_planet = self.views[last]
+            self.views[index] = moved_planet
+            self.tracers[index] = self.tracers[last]
+            self.index_of[moved_planet.id] = index
+
+        self.views.pop()
+        self.tracers.pop()
+        self.count -= 1
+        return True
+
+    def oldest(self) -> Planet | None:
+        if not self.count:
+            return None
+
+        while self.oldest_id not in self.index_of:
+            self.oldest_id += 1
+        return self.views[self.index_of[self.oldest_id]]
+
+    def clear(self) -> None:
+        self.detach(0, self.count)
+        self.tracers = []
+        self.views = []
+        self.index_of = {}
+        self.count = 0
+        self.oldest_id = self.next_id
@@ -0,0 +1,48 @@
+from typing import Tuple
+import numpy as np
+
+Rect = Tuple[float, float, float, float]
+
+
+class Camera:
+    def __init__(self, min_zoom: float = 0.001, max_zoom: float = 100.0) -> None:
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.reset()
+
+    def reset(self) -> None:
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = 1.0
+
+    def world_to_screen(self, positions: np.ndarray) -> np.ndarray:
+        return (positions - (self.x, self.y)) * self.zoom
+
+    def world_point_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def screen_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        return self.x + x / self.zoom, self.y + y / self.zoom
+
+    def pan(self, dx: float, dy: float) -> None:
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+
+    def zoom_at(self, x: float, y: float, factor: float) -> None:
+        world_x, world_y = self.screen_to_world(x, y)
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), self.max_zoom)
+        self.x = world_x - x / self.zoom
+        self.y = world_y - y / self.zoom
+
+    def visible_rect(self, width: int, height: int) -> Rect:
+        return self.x, self.y, self.x + width / self.zoom, self.y + height / self.zoom
+
+
+def visible_mask(screen_positions: np.ndarray, screen_radii: np.ndarray, width: int, height: int) -> np.ndarray:
+    x = screen_positions[:, 0]
+    y = screen_positions[:, 1]
+    return (x + screen_radii >= 0) & (x - screen_radii <= width) & (y + screen_radii >= 0) & (y - screen_radii <= height)
+
+
+def rects_overlap(first: Rect, second: Rect) -> bool:
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
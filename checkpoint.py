@@ -0,0 +1,123 @@
+from typing import NamedTuple, Tuple
+import numpy as np
+
+MAGIC = b"GRAVCKPT"
+VERSION = 1
+TRACERS_ENABLED = 1
+PAUSED = 2
+COLLISIONS_ENABLED = 4
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("flags", "<u4"),
+    ("number_of_bodies", "<u8"),
+    ("number_of_tracer_points", "<u8"),
+    ("tracer_capacity", "<u8"),
+    ("selected_index", "<i8"),
+    ("steps", "<u8"),
+    ("time", "<f8"),
+    ("random_version", "<u4"),
+    ("random_words", "<u4"),
+    ("gauss_next", "<f8")
+])
+BODY_DTYPE = np.dtype([
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("x_velocity", "<f8"),
+    ("y_velocity", "<f8"),
+    ("mass", "<f8"),
+    ("tracer_x_offset", "<f8"),
+    ("tracer_y_offset", "<f8"),
+    ("tracer_count", "<u4")
+])
+POINT_DTYPE = np.dtype("<f8")
+RANDOM_WORD_DTYPE = np.dtype("<u4")
+
+
+class Checkpoint(NamedTuple):
+    bodies: np.ndarray
+    tracer_points: np.ndarray
+    tracer_capacity: int
+    tracers_enabled: bool
+    collisions_enabled: bool
+    paused: bool
+    selected_index: int | None
+    steps: int
+    time: float
+    random_state: Tuple
+
+
+def write_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    random_version, random_words, gauss_next = checkpoint.random_state
+
+    header = np.zeros((), dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["flags"] = TRACERS_ENABLED * checkpoint.tracers_enabled \
+        | COLLISIONS_ENABLED * checkpoint.collisions_enabled \
+        | PAUSED * checkpoint.paused
+    header["number_of_bodies"] = len(checkpoint.bodies)
+    header["number_of_tracer_points"] = len(checkpoint.tracer_points)
+    header["tracer_capacity"] = checkpoint.tracer_capacity
+    header["selected_index"] = -1 if checkpoint.selected_index is None else checkpoint.selected_index
+    header["steps"] = checkpoint.steps
+    header["time"] = checkpoint.time
+    header["random_version"] = random_version
+    header["random_words"] = len(random_words)
+    header["gauss_next"] = np.nan if gauss_next is None else gauss_next
+
+    with open(path, "wb") as checkpoint_file:
+        checkpoint_file.write(header.tobytes())
+        checkpoint_file.write(checkpoint.bodies.astype(BODY_DTYPE, copy=False).tobytes())
+        checkpoint_file.write(checkpoint.tracer_points.astype(POINT_DTYPE, copy=False).tobytes())
+        checkpoint_file.write(np.array(random_words, dtype=RANDOM_WORD_DTYPE).tobytes())
+
+
+def read_checkpoint(path: str) -> Checkpoint:
+    with open(path, "rb") as checkpoint_file:
+        data = checkpoint_file.read()
+
+    if len(data) < HEADER_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a gravity simulator checkpoint")
+
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1)[0]
+    if bytes(header["magic"]) != MAGIC or int(header["version"]) != VERSION:
+        raise ValueError(f"{path} is not a gravity simulator checkpoint")
+
+    number_of_bodies = int(header["number_of_bodies"])
+    number_of_tracer_points = int(header["number_of_tracer_points"])
+    random_words = int(header["random_words"])
+
+    offset = HEADER_DTYPE.itemsize
+    points_offset = offset + number_of_bodies * BODY_DTYPE.itemsize
+    random_offset = points_offset + number_of_tracer_points * 2 * POINT_DTYPE.itemsize
+    if len(data) != random_offset + random_words * RANDOM_WORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is truncated or corrupted")
+
+    bodies = np.frombuffer(data, dtype=BODY_DTYPE, count=number_of_bodies, offset=offset)
+    tracer_points = np.frombuffer(
+        data, dtype=POINT_DTYPE, count=number_of_tracer_points * 2, offset=points_offset
+    ).reshape(-1, 2)
+    words = np.frombuffer(data, dtype=RANDOM_WORD_DTYPE, count=random_words, offset=random_offset)
+
+    gauss_next = float(header["gauss_next"])
+    selected_index = int(header["selected_index"])
+    flags = int(header["flags"])
+
+    return Checkpoint(
+        bodies=bodies,
+        tracer_points=tracer_points,
+        tracer_capacity=int(header["tracer_capacity"]),
+        tracers_enabled=bool(flags & TRACERS_ENABLED),
+        collisions_enabled=bool(flags & COLLISIONS_ENABLED),
+        paused=bool(flags & PAUSED),
+        selected_index=None if selected_index < 0 else selected_index,
+        steps=int(header["steps"]),
+        time=float(header["time"]),
+        random_state=(
+            int(header["random_version"]),
+            tuple(words.tolist()),
+            None if np.isnan(gauss_next) else gauss_next
+        )
+    )
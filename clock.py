@@ -0,0 +1,30 @@
+class FixedTimestepClock:
+    def __init__(
+            self,
+            dt: float,
+            simulated_time_per_second: float,
+            time_scale: float = 1.0,
+            max_catch_up_steps: int = 100
+    ) -> None:
+        self.dt = dt
+        self.simulated_time_per_second = simulated_time_per_second
+        self.time_scale = time_scale
+        self.max_catch_up_steps = max_catch_up_steps
+        self.accumulator = 0.0
+        self.dropped_steps = 0
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_seconds: float) -> int:
+        self.accumulator += elapsed_seconds * self.simulated_time_per_second * self.time_scale
+        number_of_steps = int(self.accumulator / self.dt + 1e-9)
+
+        if number_of_steps > self.max_catch_up_steps:
+            self.dropped_steps += number_of_steps - self.max_catch_up_steps
+            number_of_steps = self.max_catch_up_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator = max(self.accumulator - number_of_steps * self.dt, 0.0)
+
+        return number_of_steps
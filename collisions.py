@@ -0,0 +1,81 @@
+from typing import Dict, List
+import numpy as np
+
+
+def sweep_and_prune(positions: np.ndarray, radii: np.ndarray, max_pairs_per_chunk: int = 1_000_000) -> np.ndarray:
+    number_of_bodies = len(positions)
+    if number_of_bodies < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    spreads = np.ptp(positions, axis=0)
+    axis = 0 if spreads[0] >= spreads[1] else 1
+    other_axis = 1 - axis
+
+    lower = positions[:, axis] - radii
+    order = np.argsort(lower, kind="stable")
+    sorted_lower = lower[order]
+    sorted_upper = positions[order, axis] + radii[order]
+
+    ends = np.searchsorted(sorted_lower, sorted_upper, side="right")
+    counts = np.maximum(ends - np.arange(number_of_bodies) - 1, 0)
+    cumulative_counts = np.cumsum(counts)
+
+    chunks = []
+    start = 0
+    while start < number_of_bodies:
+        already_counted = cumulative_counts[start - 1] if start else 0
+        end = max(
+            int(np.searchsorted(cumulative_counts, already_counted + max_pairs_per_chunk, side="right")),
+            start + 1
+        )
+        chunk_counts = counts[start:end]
+        total = int(chunk_counts.sum())
+        start, chunk_start = end, start
+        if not total:
+            continue
+
+        firsts = np.repeat(np.arange(chunk_start, end), chunk_counts)
+        run_starts = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        seconds = firsts + 1 + (np.arange(total) - run_starts)
+
+        first_bodies = order[firsts]
+        second_bodies = order[seconds]
+        overlapping = np.abs(positions[first_bodies, other_axis] - positions[second_bodies, other_axis]) \
+            <= radii[first_bodies] + radii[second_bodies]
+        chunks.append(np.stack((first_bodies[overlapping], second_bodies[overlapping]), axis=-1))
+
+    if not chunks:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def find_collisions(positions: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    pairs = sweep_and_prune(positions, radii)
+    if not len(pairs):
+        return pairs
+
+    first, second = pairs.T
+    distances = np.hypot(*(positions[first] - positions[second]).T)
+    return pairs[distances <= radii[first] + radii[second]]
+
+
+def collision_groups(pairs: np.ndarray) -> List[List[int]]:
+    parents: Dict[int, int] = {}
+
+    def find(body: int) -> int:
+        root = parents.setdefault(body, body)
+        while root != parents[root]:
+            root = parents[root]
+        while parents[body] != root:
+            parents[body], body = root, parents[body]
+        return root
+
+    for first, second in pairs.tolist():
+        first_root, second_root = find(first), find(second)
+        if first_root != second_root:
+            parents[second_root] = first_root
+
+    groups: Dict[int, List[int]] = {}
+    for body in parents:
+        groups.setdefault(find(body), []).append(body)
+    return list(groups.values())
@@ -0,0 +1,282 @@
+import argparse
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+from math import sqrt
+from time import perf_counter
+import numpy as np
+
+from planet import Planet
+from bodies import BodyStore
+from integrators import Integrator, EulerIntegrator, create_integrator, INTEGRATOR_NAMES
+
+
+class PhysicsEngine(ABC):
+    name: str = ""
+
+    @abstractmethod
+    def step(self, planets: BodyStore, frozen_planet: Planet | None = None, dt: float = 1.0) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class LoopEngine(PhysicsEngine):
+    name = "loop"
+
+    def step(self, planets: BodyStore, frozen_planet: Planet | None = None, dt: float = 1.0) -> None:
+        positions, velocities, masses = planets.state()
+        frozen_index = planets.index(frozen_planet) if frozen_planet is not None else None
+        points: List[List[float]] = positions.tolist()
+        speeds: List[List[float]] = velocities.tolist()
+
+        for i, (point, speed, mass) in enumerate(zip(points, speeds, masses.tolist())):
+
+            if i == frozen_index:
+                continue
+
+            for j, other_point in enumerate(points):
+                if i != j:
+                    dx = other_point[0] - point[0]
+                    dy = other_point[1] - point[1]
+                    distance = sqrt(dx ** 2 + dy ** 2)
+                    if distance > 0.0:
+                        speed[0] += dx / distance / mass * dt
+                        speed[1] += dy / distance / mass * dt
+
+            point[0] += speed[0] * dt
+            point[1] += speed[1] * dt
+
+        positions[:] = points
+        velocities[:] = speeds
+
+
+class ArrayEngine(PhysicsEngine):
+    def __init__(self, initial_capacity: int = 64, integrator: Integrator | None = None) -> None:
+        self.integrator = integrator or EulerIntegrator()
+        self.frozen_index = None
+        self.capacity = initial_capacity
+
+    @abstractmethod
+    def compute_accelerations(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        pass
+
+    def compute_accelerations_for(self, positions: np.ndarray, masses: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        return self.compute_accelerations(positions, masses)[indices]
+
+    def accelerations(self, positions: np.ndarray, masses: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        if indices is None:
+            accelerations = self.compute_accelerations(positions, masses)
+            if self.frozen_index is not None:
+                accelerations[self.frozen_index] = 0.0
+        else:
+            accelerations = self.compute_accelerations_for(positions, masses, indices)
+            if self.frozen_index is not None:
+                accelerations[indices == self.frozen_index] = 0.0
+        return accelerations
+
+    def step(self, planets: BodyStore, frozen_planet: Planet | None = None, dt: float = 1.0) -> None:
+        if not planets:
+            return
+
+        positions, velocities, masses = planets.state()
+
+        frozen_index = planets.index(frozen_planet) if frozen_planet is not None else None
+        if frozen_index != self.frozen_index:
+            self.frozen_index = frozen_index
+            self.integrator.reset()
+
+        if frozen_index is not None:
+            frozen_position = positions[frozen_index].copy()
+            frozen_velocity = velocities[frozen_index].copy()
+            velocities[frozen_index] = 0.0
+
+        self.integrator.step(positions, velocities, masses, dt, self.accelerations)
+
+        if frozen_index is not None:
+            positions[frozen_index] = frozen_position
+            velocities[frozen_index] = frozen_velocity
+
+    def max_acceleration_error(self, positions: np.ndarray, masses: np.ndarray) -> float:
+        expected = reference_accelerations(positions, masses)
+        actual = self.compute_accelerations(positions, masses)
+        scale = max(float(np.abs(expected).max(initial=0.0)), 1e-12)
+        return float(np.abs(actual - expected).max(initial=0.0)) / scale
+
+    def matches_reference(self, positions: np.ndarray, masses: np.ndarray, tolerance: float = 1e-9) -> bool:
+        return self.max_acceleration_error(positions, masses) <= tolerance
+
+
+class NumpyEngine(ArrayEngine):
+    name = "numpy"
+
+    def __init__(self, initial_capacity: int = 64, block_size: int = 256) -> None:
+        super().__init__(initial_capacity)
+        self.block_size = block_size
+
+    def compute_accelerations(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        accelerations = np.empty_like(positions)
+
+        for start in range(0, len(positions), self.block_size):
+            stop = start + self.block_size
+            accelerations[start:stop] = unit_force_sum(positions[start:stop], positions)
+
+        accelerations /= masses[:, np.newaxis]
+        return accelerations
+
+    def compute_accelerations_for(self, positions: np.ndarray, masses: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        accelerations = np.empty((len(indices), 2))
+
+        for start in range(0, len(indices), self.block_size):
+            block = indices[start:start + self.block_size]
+            accelerations[start:start + self.block_size] = unit_force_sum(positions[block], positions)
+
+        accelerations /= masses[indices, np.newaxis]
+        return accelerations
+
+
+def unit_force_sum(targets: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    dx = sources[np.newaxis, :, 0] - targets[:, np.newaxis, 0]
+    dy = sources[np.newaxis, :, 1] - targets[:, np.newaxis, 1]
+
+    inverse_distance = dx * dx
+    inverse_distance += dy * dy
+    np.sqrt(inverse_distance, out=inverse_distance)
+    np.divide(1.0, inverse_distance, out=inverse_distance, where=inverse_distance > 0.0)
+
+    return np.stack(
+        (
+            np.einsum("ij,ij->i", dx, inverse_distance),
+            np.einsum("ij,ij->i", dy, inverse_distance)
+        ),
+        axis=-1
+    )
+
+
+def total_energy(positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray, block_size: int = 256) -> float:
+    kinetic_energy = 0.5 * float((masses * (velocities ** 2).sum(axis=1)).sum())
+
+    potential_energy = 0.0
+    for start in range(0, len(positions), block_size):
+        block = positions[start:start + block_size]
+        potential_energy += float(np.hypot(
+            positions[np.newaxis, :, 0] - block[:, np.newaxis, 0],
+            positions[np.newaxis, :, 1] - block[:, np.newaxis, 1]
+        ).sum())
+
+    return kinetic_energy + potential_energy / 2
+
+
+def reference_accelerations(positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+    points: List[Tuple[float, float]] = positions.tolist()
+    accelerations = np.zeros_like(positions)
+
+    for i, (x, y) in enumerate(points):
+        ax = ay = 0.0
+        for j, (other_x, other_y) in enumerate(points):
+            if i != j:
+                dx = other_x - x
+                dy = other_y - y
+                distance = sqrt(dx ** 2 + dy ** 2)
+                if distance > 0.0:
+                    ax += dx / distance
+                    ay += dy / distance
+
+        accelerations[i] = ax / masses[i], ay / masses[i]
+
+    return accelerations
+
+
+def create_engine(name: str, **options) -> PhysicsEngine:
+    match name:
+        case LoopEngine.name:
+            return LoopEngine()
+        case NumpyEngine.name:
+            return NumpyEngine(**options)
+        case "barnes-hut":
+            from barnes_hut import BarnesHutEngine
+            return BarnesHutEngine(**options)
+        case "parallel":
+            from parallel import ParallelEngine
+            return ParallelEngine(**options)
+        case "particle-mesh":
+            from particle_mesh import ParticleMeshEngine
+            return ParticleMeshEngine(**options)
+        case _:
+            raise ValueError(f"Unknown physics engine: {name}")
+
+
+def measure_step_time(engine: PhysicsEngine, number_of_bodies: int, area_size: Tuple[int, int], repeats: int = 2) -> float:
+    rng = np.random.default_rng(0)
+    planets = BodyStore(number_of_bodies)
+    planets.extend(
+        rng.uniform((0, 0), area_size, (number_of_bodies, 2)),
+        np.zeros((number_of_bodies, 2)),
+        rng.integers(50, 1000, number_of_bodies, endpoint=True).astype(np.float64)
+    )
+
+    step_time = float("inf")
+    for _ in range(repeats):
+        started = perf_counter()
+        engine.step(planets)
+        step_time = min(step_time, perf_counter() - started)
+    return step_time
+
+
+def max_bodies_for_frame_budget(
+        engine: PhysicsEngine,
+        frame_budget: float,
+        min_number_of_bodies: int = 25,
+        max_number_of_bodies: int = 1_000_000,
+        area_size: Tuple[int, int] = (1000, 800)
+) -> int:
+    fixed_time = measure_step_time(engine, min_number_of_bodies, area_size, repeats=3)
+    fitting_number_of_bodies, fitting_time = min_number_of_bodies, 0.0
+    number_of_bodies = min_number_of_bodies
+
+    while number_of_bodies < max_number_of_bodies:
+        number_of_bodies = min(2 * number_of_bodies, max_number_of_bodies)
+        step_time = measure_step_time(engine, number_of_bodies, area_size) - fixed_time
+        if step_time > frame_budget:
+            return int(
+                fitting_number_of_bodies + (frame_budget - fitting_time)
+                * (number_of_bodies - fitting_number_of_bodies) / (step_time - fitting_time)
+            )
+        fitting_number_of_bodies, fitting_time = number_of_bodies, max(step_time, 0.0)
+
+    return fitting_number_of_bodies
+
+
+ENGINE_NAMES = (LoopEngine.name, NumpyEngine.name, "barnes-hut", "parallel", "particle-mesh")
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--engine", choices=ENGINE_NAMES, default=NumpyEngine.name)
+    parser.add_argument("--theta", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--grid-size", type=int, default=256)
+    parser.add_argument("--p3m", action="store_true")
+    parser.add_argument("--integrator", choices=INTEGRATOR_NAMES, default=EulerIntegrator.name)
+
+
+def create_engine_from_arguments(args: argparse.Namespace) -> PhysicsEngine:
+    match args.engine:
+        case "barnes-hut":
+            engine = create_engine(args.engine, theta=args.theta)
+        case "parallel":
+            engine = create_engine(args.engine, workers=args.workers)
+        case "particle-mesh":
+            engine = create_engine(args.engine, grid_size=args.grid_size, short_range_correction=args.p3m)
+        case _:
+            engine = create_engine(args.engine)
+
+    if isinstance(engine, ArrayEngine):
+        engine.integrator = create_integrator(args.integrator)
+    elif args.integrator != EulerIntegrator.name:
+        raise ValueError(f"The {args.engine} engine only supports the {EulerIntegrator.name} integrator")
+    return engine
+
+
+def check_engine_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.engine == LoopEngine.name and args.integrator != EulerIntegrator.name:
+        parser.error(f"--integrator {args.integrator} cannot be used with --engine {LoopEngine.name}")
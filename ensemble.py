@@ -0,0 +1,216 @@
+import argparse
+import csv
+import sys
+from random import Random
+from time import perf_counter
+from typing import Iterator, List, NamedTuple, Sequence, Tuple
+import numpy as np
+
+from integrators import Integrator, EulerIntegrator, create_integrator
+from scenarios import SCENARIO_NAMES, generate_scenario
+
+ENSEMBLE_INTEGRATOR_NAMES = ("euler", "leapfrog", "rk4", "adaptive")
+
+
+class RunSummary(NamedTuple):
+    seed: int
+    bodies: int
+    total_mass: float
+    escaped: int
+    energy_drift: float
+    center_of_mass_x: float
+    center_of_mass_y: float
+
+
+def random_systems(
+        seeds: Sequence[int],
+        number_of_bodies: int,
+        width: int,
+        height: int,
+        min_mass: int,
+        max_mass: int,
+        scenario: str = "uniform"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    systems = [
+        generate_scenario(
+            scenario, number_of_bodies, width, height, min_mass, max_mass,
+            np.random.default_rng(Random(seed).getrandbits(64))
+        )
+        for seed in seeds
+    ]
+    positions, velocities, masses = (np.stack([system[part] for system in systems]) for part in range(3))
+    return positions.astype(np.float64), velocities.astype(np.float64), masses.astype(np.float64)
+
+
+def batch_pairwise(positions: np.ndarray, max_block_elements: int) -> Iterator[Tuple[slice, np.ndarray, np.ndarray]]:
+    number_of_runs, number_of_bodies = positions.shape[:2]
+    runs_per_block = max(max_block_elements // max(number_of_bodies * number_of_bodies, 1), 1)
+
+    for start in range(0, number_of_runs, runs_per_block):
+        runs = slice(start, start + runs_per_block)
+        block = positions[runs]
+        dx = block[:, np.newaxis, :, 0] - block[:, :, np.newaxis, 0]
+        dy = block[:, np.newaxis, :, 1] - block[:, :, np.newaxis, 1]
+        yield runs, dx, dy
+
+
+def batch_unit_force_sum(positions: np.ndarray, max_block_elements: int = 1 << 22) -> np.ndarray:
+    forces = np.empty_like(positions)
+
+    for runs, dx, dy in batch_pairwise(positions, max_block_elements):
+        inverse_distance = dx * dx
+        inverse_distance += dy * dy
+        np.sqrt(inverse_distance, out=inverse_distance)
+        np.divide(1.0, inverse_distance, out=inverse_distance, where=inverse_distance > 0.0)
+
+        forces[runs, :, 0] = np.einsum("bij,bij->bi", dx, inverse_distance)
+        forces[runs, :, 1] = np.einsum("bij,bij->bi", dy, inverse_distance)
+    return forces
+
+
+def batch_total_energy(
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        masses: np.ndarray,
+        max_block_elements: int = 1 << 22
+) -> np.ndarray:
+    energies = 0.5 * (masses * (velocities ** 2).sum(axis=-1)).sum(axis=-1)
+
+    for runs, dx, dy in batch_pairwise(positions, max_block_elements):
+        energies[runs] += np.hypot(dx, dy).sum(axis=(1, 2)) / 2
+    return energies
+
+
+class Ensemble:
+    def __init__(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            integrator: Integrator | None = None,
+            max_block_elements: int = 1 << 22
+    ) -> None:
+        self.positions = np.array(positions, dtype=np.float64)
+        self.velocities = np.array(velocities, dtype=np.float64)
+        self.masses = np.array(masses, dtype=np.float64)
+        self.integrator = integrator or EulerIntegrator()
+        self.max_block_elements = max_block_elements
+
+        self.steps = 0
+        self.time = 0.0
+        self.initial_energies = self.total_energies()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def accelerations(self, positions: np.ndarray, masses: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        return batch_unit_force_sum(positions, self.max_block_elements) / masses[..., np.newaxis]
+
+    def step(self, dt: float = 1.0) -> None:
+        self.integrator.step(self.positions, self.velocities, self.masses, dt, self.accelerations)
+        self.steps += 1
+        self.time += dt
+
+    def run(self, number_of_steps: int, dt: float = 1.0) -> None:
+        for _ in range(number_of_steps):
+            self.step(dt)
+
+    def total_energies(self) -> np.ndarray:
+        return batch_total_energy(self.positions, self.velocities, self.masses, self.max_block_elements)
+
+    def energy_drifts(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drifts = (self.total_energies() - self.initial_energies) / np.abs(self.initial_energies)
+        return np.nan_to_num(drifts, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def centers_of_mass(self) -> np.ndarray:
+        total_masses = self.masses.sum(axis=1)
+        return np.einsum("bn,bnk->bk", self.masses, self.positions) / total_masses[:, np.newaxis]
+
+    def escape_counts(self, escape_radius: float) -> np.ndarray:
+        offsets = self.positions - self.centers_of_mass()[:, np.newaxis, :]
+        return (np.hypot(offsets[..., 0], offsets[..., 1]) > escape_radius).sum(axis=1)
+
+    def summaries(self, seeds: Sequence[int], escape_radius: float) -> List[RunSummary]:
+        centers_of_mass = self.centers_of_mass().tolist()
+        return [
+            RunSummary(seed, self.positions.shape[1], total_mass, escaped, drift, center_x, center_y)
+            for seed, total_mass, escaped, drift, (center_x, center_y) in zip(
+                seeds,
+                self.masses.sum(axis=1).tolist(),
+                self.escape_counts(escape_radius).tolist(),
+                self.energy_drifts().tolist(),
+                centers_of_mass
+            )
+        ]
+
+
+def run_ensemble(
+        seeds: Sequence[int],
+        number_of_bodies: int,
+        number_of_steps: int,
+        dt: float = 1.0,
+        batch_size: int = 256,
+        integrator: str = "euler",
+        width: int = 1000,
+        height: int = 800,
+        min_mass: int = 50,
+        max_mass: int = 1000,
+        escape_radius: float | None = None,
+        scenario: str = "uniform"
+) -> Iterator[List[RunSummary]]:
+    if escape_radius is None:
+        escape_radius = 2 * max(width, height)
+
+    for start in range(0, len(seeds), batch_size):
+        batch_seeds = seeds[start:start + batch_size]
+        ensemble = Ensemble(
+            *random_systems(batch_seeds, number_of_bodies, width, height, min_mass, max_mass, scenario),
+            integrator=create_integrator(integrator)
+        )
+        ensemble.run(number_of_steps, dt)
+        yield ensemble.summaries(batch_seeds, escape_radius)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run many independent simulations in vectorized batches.")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--planets", type=int, default=25)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--dt", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--integrator", choices=ENSEMBLE_INTEGRATOR_NAMES, default="euler")
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--min-mass", type=int, default=50)
+    parser.add_argument("--max-mass", type=int, default=1000)
+    parser.add_argument("--escape-radius", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", choices=SCENARIO_NAMES, default="uniform")
+    parser.add_argument("--output", default="ensemble.csv")
+    args = parser.parse_args()
+
+    seeds = list(range(args.seed, args.seed + args.runs))
+    started = perf_counter()
+    finished_runs = 0
+
+    with open(args.output, "w", newline="") as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(RunSummary._fields)
+
+        for summaries in run_ensemble(
+                seeds, args.planets, args.steps, args.dt, args.batch_size, args.integrator,
+                args.width, args.height, args.min_mass, args.max_mass, args.escape_radius, args.scenario
+        ):
+            writer.writerows(summaries)
+            output_file.flush()
+            finished_runs += len(summaries)
+            elapsed = perf_counter() - started
+            print(
+                f"{finished_runs}/{len(seeds)} runs, {finished_runs / elapsed * 60:.0f} runs/min",
+                file=sys.stderr
+            )
+
+
+if __name__ == "__main__":
+    main()
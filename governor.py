@@ -0,0 +1,182 @@
+import argparse
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from simulation import Simulation
+
+Settings = Dict[str, float | bool]
+
+
+class QualityKnob(NamedTuple):
+    name: str
+    values: Tuple
+
+
+def halvings(start: int, stop: int) -> Tuple[int, ...]:
+    values = [start]
+    while values[-1] > stop:
+        values.append(max(values[-1] // 2, stop))
+    return tuple(values)
+
+
+def doublings(start: int, stop: int) -> Tuple[int, ...]:
+    values = [start]
+    while values[-1] < stop:
+        values.append(min(values[-1] * 2, stop))
+    return tuple(values)
+
+
+def quality_ladder(knobs: Sequence[QualityKnob]) -> List[Settings]:
+    settings = {knob.name: knob.values[0] for knob in knobs}
+    ladder = [dict(settings)]
+    for depth in range(1, max((len(knob.values) for knob in knobs), default=1)):
+        for knob in knobs:
+            if depth < len(knob.values):
+                settings[knob.name] = knob.values[depth]
+                ladder.append(dict(settings))
+    return ladder
+
+
+def quality_knobs(
+        simulation: Simulation,
+        min_substeps: int = 1,
+        max_theta: float = 1.0,
+        max_tracer_interval: int = 8,
+        min_grid_size: int = 64
+) -> List[QualityKnob]:
+    engine = simulation.engine
+    knobs = [
+        QualityKnob("tracer_interval", doublings(simulation.tracer_interval, max_tracer_interval)),
+        QualityKnob("points", (False, True))
+    ]
+    if hasattr(engine, "theta"):
+        thetas = [engine.theta]
+        while thetas[-1] < max_theta:
+            thetas.append(min(thetas[-1] + 0.25, max_theta))
+        knobs.append(QualityKnob("theta", tuple(thetas)))
+    if getattr(engine, "short_range_correction", False):
+        knobs.append(QualityKnob("p3m", (True, False)))
+    if hasattr(engine, "grid_size"):
+        knobs.append(QualityKnob("grid_size", halvings(engine.grid_size, min(min_grid_size, engine.grid_size))))
+    knobs.append(QualityKnob("substeps", halvings(simulation.substeps, min(min_substeps, simulation.substeps))))
+    return [knob for knob in knobs if len(knob.values) > 1]
+
+
+class QualityGovernor:
+    def __init__(
+            self,
+            knobs: Sequence[QualityKnob],
+            target_fps: float = 60,
+            overrun_share: float = 0.9,
+            headroom_share: float = 0.6,
+            smoothing: float = 0.2,
+            settle_frames: int = 15,
+            recover_frames: int = 60,
+            max_recover_frames: int = 960
+    ) -> None:
+        self.knobs = list(knobs)
+        self.ladder = quality_ladder(self.knobs)
+        self.frame_budget = 1 / target_fps
+        self.overrun_share = overrun_share
+        self.headroom_share = headroom_share
+        self.smoothing = smoothing
+        self.settle_frames = settle_frames
+        self.base_recover_frames = recover_frames
+        self.max_recover_frames = max_recover_frames
+        self.enabled = True
+
+        self.level = 0
+        self.frame_time: float | None = None
+        self.frames_since_change = 0
+        self.headroom_frames = 0
+        self.recover_frames = recover_frames
+        self.last_change_restored = False
+
+    @property
+    def settings(self) -> Settings:
+        return self.ladder[self.level]
+
+    def set_enabled(self, enabled: bool) -> bool:
+        self.enabled = enabled
+        if not enabled and self.level:
+            self.change_level(0)
+            return True
+        return False
+
+    def change_level(self, level: int) -> None:
+        self.last_change_restored = level < self.level
+        self.level = level
+        self.frame_time = None
+        self.frames_since_change = 0
+        self.headroom_frames = 0
+
+    def update(self, frame_time: float) -> bool:
+        if not self.enabled:
+            return False
+
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += self.smoothing * (frame_time - self.frame_time)
+        self.frames_since_change += 1
+        if self.frames_since_change < self.settle_frames:
+            return False
+
+        if self.frame_time > self.overrun_share * self.frame_budget:
+            if self.level == len(self.ladder) - 1:
+                return False
+            if self.last_change_restored:
+                self.recover_frames = min(2 * self.recover_frames, self.max_recover_frames)
+            self.change_level(self.level + 1)
+            return True
+
+        if self.frame_time < self.headroom_share * self.frame_budget and self.level:
+            self.headroom_frames += 1
+            if self.headroom_frames >= self.recover_frames:
+                self.change_level(self.level - 1)
+                return True
+        else:
+            self.headroom_frames = 0
+            if self.frames_since_change >= self.max_recover_frames:
+                self.recover_frames = self.base_recover_frames
+        return False
+
+    def active_knobs(self) -> Settings:
+        best = self.ladder[0]
+        return {name: value for name, value in self.settings.items() if value != best[name]}
+
+    def describe(self) -> str:
+        active_knobs = self.active_knobs()
+        if not active_knobs:
+            return "Quality: full"
+
+        descriptions = []
+        for name, value in active_knobs.items():
+            match value:
+                case True:
+                    descriptions.append(name)
+                case False:
+                    descriptions.append(f"no {name}")
+                case _:
+                    descriptions.append(f"{name}={value}")
+        return f"Quality: {', '.join(descriptions)}"
+
+
+def add_governor_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--target-fps", type=float, default=None)
+    parser.add_argument("--min-substeps", type=int, default=1)
+    parser.add_argument("--max-theta", type=float, default=1.0)
+    parser.add_argument("--max-tracer-interval", type=int, default=8)
+    parser.add_argument("--fixed-quality", action="store_true")
+
+
+def create_governor_from_arguments(
+        args: argparse.Namespace,
+        simulation: Simulation,
+        default_fps: float
+) -> QualityGovernor:
+    governor = QualityGovernor(
+        quality_knobs(simulation, args.min_substeps, args.max_theta, args.max_tracer_interval),
+        target_fps=args.target_fps or default_fps
+    )
+    governor.set_enabled(not args.fixed_quality)
+    return governor
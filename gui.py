@@ -1,5 +1,5 @@
-from typing import Callable, Tuple
-from PyQt5.QtWidgets import QPushButton, QSlider, QLabel, QLineEdit, QMainWindow
+from typing import Callable, Sequence, Tuple
+from PyQt5.QtWidgets import QPushButton, QSlider, QLabel, QLineEdit, QComboBox, QMainWindow
 from PyQt5.QtCore import Qt
 
 
@@ -134,3 +134,34 @@ class GuiCreator:
         input_label.returnPressed.connect(action)
 
         return input_label
+
+    def create_combo_box(
+            self,
+            items: Sequence[str],
+            position: Tuple[int, int],
+            size: Tuple[int, int],
+            action: Callable = None,
+            current_item: str | None = None,
+            background_color: str = "black",
+            text_color: str = "white",
+            border_size: int = 1,
+            border_type: str = "solid",
+            border_color: str = "white"
+    ) -> QComboBox:
+        combo_box = QComboBox(self.gui_window)
+        combo_box.setGeometry(*position, *size)
+        combo_box.setStyleSheet(
+            "QComboBox, QComboBox QAbstractItemView { "
+            f"background-color: {background_color}; "
+            f"color: {text_color}; "
+            f"border: {border_size}px {border_type} {border_color}; "
+            "}"
+        )
+
+        combo_box.addItems(items)
+        if current_item:
+            combo_box.setCurrentText(current_item)
+        if action:
+            combo_box.currentTextChanged.connect(action)
+
+        return combo_box
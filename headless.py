@@ -0,0 +1,111 @@
+import argparse
+import csv
+import sys
+from time import perf_counter
+
+from engine import ArrayEngine, LoopEngine, create_engine_from_arguments, add_engine_arguments, check_engine_arguments
+from integrators import INTEGRATOR_NAMES
+from simulation import Simulation
+from scenarios import SCENARIO_NAMES
+
+
+def write_state(simulation: Simulation, path: str) -> None:
+    with open(path, "w", newline="") as state_file:
+        writer = csv.writer(state_file)
+        writer.writerow(("x", "y", "x_velocity", "y_velocity", "mass"))
+        for planet in simulation.planets:
+            writer.writerow((planet.x, planet.y, planet.x_velocity, planet.y_velocity, planet.mass))
+
+
+def create_simulation(args: argparse.Namespace) -> Simulation:
+    simulation = Simulation(
+        width=args.width,
+        height=args.height,
+        starting_number_of_planets=args.planets,
+        max_number_of_planets=args.planets,
+        min_planet_mass=args.min_mass,
+        max_planet_mass=args.max_mass,
+        max_tracer_positions=0,
+        engine=create_engine_from_arguments(args),
+        dt=args.dt,
+        substeps=args.substeps,
+        seed=args.seed,
+        scenario=args.scenario
+    )
+    simulation.set_collisions_enabled(args.collisions)
+    return simulation
+
+
+def run_simulation(simulation: Simulation, number_of_steps: int) -> str:
+    simulation.energy_drift_rate()
+
+    started = perf_counter()
+    simulation.run(number_of_steps)
+    elapsed = perf_counter() - started
+
+    report = f"{number_of_steps} steps of {len(simulation.planets)} planets in {elapsed:.3f} s " \
+        f"({number_of_steps / elapsed if elapsed else float('inf'):.1f} steps/s), " \
+        f"energy drift {simulation.energy_drift_rate():.3e} per unit of time"
+
+    if isinstance(simulation.engine, ArrayEngine):
+        report += f", {simulation.engine.integrator.evaluations} force evaluations"
+    return report
+
+
+def compare_integrators(args: argparse.Namespace) -> None:
+    for integrator in INTEGRATOR_NAMES:
+        args.integrator = integrator
+        simulation = create_simulation(args)
+        print(f"{integrator}: {run_simulation(simulation, args.steps)}")
+        simulation.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the gravity simulation without a window.")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--planets", type=int, default=25)
+    add_engine_arguments(parser)
+    parser.add_argument("--dt", type=float, default=1.0)
+    parser.add_argument("--substeps", type=int, default=1)
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--min-mass", type=int, default=50)
+    parser.add_argument("--max-mass", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--scenario", choices=SCENARIO_NAMES, default="uniform")
+    parser.add_argument("--collisions", action="store_true")
+    parser.add_argument("--output", default="final_state.csv")
+    parser.add_argument("--record", default=None)
+    parser.add_argument("--record-every", type=int, default=1)
+    parser.add_argument("--restore", default=None)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--profile", default=None)
+    parser.add_argument("--compare-integrators", action="store_true")
+    args = parser.parse_args()
+    check_engine_arguments(parser, args)
+
+    if args.compare_integrators:
+        if args.engine == LoopEngine.name:
+            parser.error(f"--compare-integrators cannot be used with --engine {LoopEngine.name}")
+        compare_integrators(args)
+        return
+
+    simulation = create_simulation(args)
+    if args.restore:
+        simulation.load_checkpoint(args.restore)
+    if args.record:
+        simulation.start_recording(args.record, args.record_every)
+    simulation.profiler.set_enabled(args.profile is not None)
+    report = run_simulation(simulation, args.steps)
+    simulation.close()
+
+    if args.checkpoint:
+        simulation.save_checkpoint(args.checkpoint)
+    if args.profile:
+        simulation.profiler.export(args.profile)
+    write_state(simulation, args.output)
+    print(f"{report}, state written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
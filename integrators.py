@@ -0,0 +1,275 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+import numpy as np
+
+AccelerationFunction = Callable[[np.ndarray, np.ndarray, np.ndarray | None], np.ndarray]
+
+
+class Integrator(ABC):
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+
+    def reset(self) -> None:
+        pass
+
+    def evaluate(
+            self,
+            accelerations: AccelerationFunction,
+            positions: np.ndarray,
+            masses: np.ndarray,
+            indices: np.ndarray | None = None
+    ) -> np.ndarray:
+        self.evaluations += len(positions) if indices is None else len(indices)
+        return accelerations(positions, masses, indices)
+
+    @abstractmethod
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        pass
+
+
+class EulerIntegrator(Integrator):
+    name = "euler"
+
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        velocities += self.evaluate(accelerations, positions, masses) * dt
+        positions += velocities * dt
+
+
+class LeapfrogIntegrator(Integrator):
+    name = "leapfrog"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.cached_positions = None
+        self.cached_masses = None
+        self.cached_accelerations = None
+
+    def reset(self) -> None:
+        self.cached_positions = self.cached_masses = self.cached_accelerations = None
+
+    def initial_accelerations(
+            self,
+            positions: np.ndarray,
+            masses: np.ndarray,
+            accelerations: AccelerationFunction
+    ) -> np.ndarray:
+        if (
+                self.cached_positions is not None
+                and self.cached_positions.shape == positions.shape
+                and np.array_equal(self.cached_positions, positions)
+                and np.array_equal(self.cached_masses, masses)
+        ):
+            return self.cached_accelerations
+        return self.evaluate(accelerations, positions, masses)
+
+    def remember(self, positions: np.ndarray, masses: np.ndarray, final_accelerations: np.ndarray) -> None:
+        self.cached_positions = positions.copy()
+        self.cached_masses = masses.copy()
+        self.cached_accelerations = final_accelerations
+
+    def kick_drift_kick(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            start_accelerations: np.ndarray,
+            accelerations: AccelerationFunction
+    ) -> np.ndarray:
+        velocities += start_accelerations * (dt / 2)
+        positions += velocities * dt
+        end_accelerations = self.evaluate(accelerations, positions, masses)
+        velocities += end_accelerations * (dt / 2)
+        return end_accelerations
+
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        start_accelerations = self.initial_accelerations(positions, masses, accelerations)
+        end_accelerations = self.kick_drift_kick(
+            positions, velocities, masses, dt, start_accelerations, accelerations
+        )
+        self.remember(positions, masses, end_accelerations)
+
+
+class RungeKuttaIntegrator(Integrator):
+    name = "rk4"
+
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        k1_positions = velocities
+        k1_velocities = self.evaluate(accelerations, positions, masses)
+        k2_positions = velocities + k1_velocities * (dt / 2)
+        k2_velocities = self.evaluate(accelerations, positions + k1_positions * (dt / 2), masses)
+        k3_positions = velocities + k2_velocities * (dt / 2)
+        k3_velocities = self.evaluate(accelerations, positions + k2_positions * (dt / 2), masses)
+        k4_positions = velocities + k3_velocities * dt
+        k4_velocities = self.evaluate(accelerations, positions + k3_positions * dt, masses)
+
+        positions += (k1_positions + 2 * k2_positions + 2 * k3_positions + k4_positions) * (dt / 6)
+        velocities += (k1_velocities + 2 * k2_velocities + 2 * k3_velocities + k4_velocities) * (dt / 6)
+
+
+class AdaptiveIntegrator(LeapfrogIntegrator):
+    name = "adaptive"
+
+    def __init__(self, tolerance: float = 0.01, min_step: float = 1e-4) -> None:
+        super().__init__()
+        self.tolerance = tolerance
+        self.min_step = min_step
+        self.step_size = None
+        self.rejected_steps = 0
+
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        start_accelerations = self.initial_accelerations(positions, masses, accelerations)
+        remaining = dt
+        proposed_step_size = self.step_size or dt
+
+        while remaining > 1e-12 * dt:
+            step_size = min(proposed_step_size, remaining)
+
+            full_positions, full_velocities = positions.copy(), velocities.copy()
+            self.kick_drift_kick(
+                full_positions, full_velocities, masses, step_size, start_accelerations, accelerations
+            )
+
+            half_positions, half_velocities = positions.copy(), velocities.copy()
+            middle_accelerations = self.kick_drift_kick(
+                half_positions, half_velocities, masses, step_size / 2, start_accelerations, accelerations
+            )
+            end_accelerations = self.kick_drift_kick(
+                half_positions, half_velocities, masses, step_size / 2, middle_accelerations, accelerations
+            )
+
+            error = float(np.abs(full_positions - half_positions).max(initial=0.0))
+            factor = 0.9 * (self.tolerance / error) ** (1 / 3) if error > 0.0 else 2.0
+
+            if error <= self.tolerance or step_size <= self.min_step:
+                positions[:] = half_positions
+                velocities[:] = half_velocities
+                start_accelerations = end_accelerations
+                remaining -= step_size
+                proposed_step_size = step_size * min(factor, 2.0)
+            else:
+                self.rejected_steps += 1
+                proposed_step_size = max(step_size * max(factor, 0.2), self.min_step)
+
+        self.step_size = proposed_step_size
+        self.remember(positions, masses, start_accelerations)
+
+
+class BlockTimestepIntegrator(LeapfrogIntegrator):
+    name = "block"
+
+    def __init__(self, max_level: int = 4, accuracy: float = 0.05) -> None:
+        super().__init__()
+        self.max_level = max_level
+        self.accuracy = accuracy
+        self.levels = None
+
+    def reset(self) -> None:
+        super().reset()
+        self.levels = None
+
+    def step(
+            self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            accelerations: AccelerationFunction
+    ) -> None:
+        current_accelerations = self.initial_accelerations(positions, masses, accelerations).copy()
+        if self.levels is None or len(self.levels) != len(positions):
+            self.levels = np.zeros(len(positions), dtype=np.int64)
+
+        number_of_ticks = 1 << self.max_level
+        tick = dt / number_of_ticks
+        spans = np.left_shift(1, self.max_level - self.levels)
+        jerks = np.zeros(len(positions))
+
+        for tick_index in range(number_of_ticks):
+            starting = np.flatnonzero(tick_index % spans == 0)
+            velocities[starting] += current_accelerations[starting] * (spans[starting, np.newaxis] * tick / 2)
+
+            positions += velocities * tick
+
+            ending = np.flatnonzero((tick_index + 1) % spans == 0)
+            if not len(ending):
+                continue
+
+            ending_accelerations = self.evaluate(accelerations, positions, masses, ending)
+            own_steps = spans[ending] * tick
+            jerks[ending] = np.hypot(*(ending_accelerations - current_accelerations[ending]).T) / own_steps
+            current_accelerations[ending] = ending_accelerations
+            velocities[ending] += ending_accelerations * (own_steps[:, np.newaxis] / 2)
+
+        self.levels = self.choose_levels(current_accelerations, jerks, dt)
+        self.remember(positions, masses, current_accelerations)
+
+    def choose_levels(self, accelerations: np.ndarray, jerks: np.ndarray, dt: float) -> np.ndarray:
+        magnitudes = np.hypot(accelerations[:, 0], accelerations[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            own_steps = self.accuracy * magnitudes / jerks
+        own_steps = np.where(np.isfinite(own_steps) & (own_steps > 0.0), own_steps, dt)
+        levels = np.ceil(np.log2(np.maximum(dt / own_steps, 1.0)))
+        return np.clip(levels, 0, self.max_level).astype(np.int64)
+
+
+def create_integrator(name: str, **options) -> Integrator:
+    match name:
+        case EulerIntegrator.name:
+            return EulerIntegrator()
+        case LeapfrogIntegrator.name:
+            return LeapfrogIntegrator()
+        case RungeKuttaIntegrator.name:
+            return RungeKuttaIntegrator()
+        case AdaptiveIntegrator.name:
+            return AdaptiveIntegrator(**options)
+        case BlockTimestepIntegrator.name:
+            return BlockTimestepIntegrator(**options)
+        case _:
+            raise ValueError(f"Unknown integrator: {name}")
+
+
+INTEGRATOR_NAMES = (
+    EulerIntegrator.name,
+    LeapfrogIntegrator.name,
+    RungeKuttaIntegrator.name,
+    AdaptiveIntegrator.name,
+    BlockTimestepIntegrator.name
+)
@@ -1,14 +1,26 @@
+import argparse
 import contextlib
 import sys
-from typing import Callable, Tuple
-from random import randint
-from math import sqrt
-from PyQt5.QtWidgets import QApplication, QMainWindow
-from PyQt5.QtGui import QPainter, QColor, QMouseEvent, QPaintEvent, QCloseEvent
-from PyQt5.QtCore import Qt, QTimer
-
-from planet import PlanetBase, Planet
+from time import perf_counter
+from typing import Callable, Iterator, Tuple
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog
+from PyQt5.QtGui import QPainter, QColor, QMouseEvent, QPaintEvent, QCloseEvent, QResizeEvent, QWheelEvent
+from PyQt5.QtCore import Qt, QTimer, QPointF
+
+from planet import PlanetBase
+from tracer import FrozenTracer
 from gui import GuiCreator
+from engine import create_engine_from_arguments, add_engine_arguments, check_engine_arguments, max_bodies_for_frame_budget
+from simulation import Simulation
+from clock import FixedTimestepClock
+from worker import SimulationWorker, SimulationSnapshot, capture_snapshot
+from camera import Camera, visible_mask, rects_overlap
+from trails import TrailLayer, points_to_polygon
+from scenarios import SCENARIO_NAMES
+from view_model import ViewModel
+from telemetry import TelemetryServer, parse_address
+from governor import QualityGovernor, quality_knobs, add_governor_arguments, create_governor_from_arguments
 
 
 class MainWindow(QMainWindow):
@@ -16,71 +28,111 @@ class MainWindow(QMainWindow):
     WHITE = QColor(255, 255, 255)
     RED = QColor(255, 0, 0)
     FPS = 60
+    PHYSICS_FRAME_SHARE = 0.5
+    MAX_TIME_SCALE = 100
+    SPEED_SLIDER_STEPS = 20
+    MAX_CATCH_UP_STEPS = 250
+    ZOOM_STEP = 1.15
+    CHECKPOINT_FILE_FILTER = "Gravsim checkpoints (*.gravsim);;All files (*)"
 
     def __init__(
             self,
             min_width: int,
             min_height: int,
-            starting_number_of_planets: int,
-            max_number_of_planets: int,
-            min_planet_mass: int,
-            max_planet_mass: int,
-            max_tracer_positions: int
+            simulation: Simulation,
+            governor: QualityGovernor | None = None
     ) -> None:
         super().__init__()
         self.min_width = min_width
         self.min_height = min_height
-        self.starting_number_of_planets = starting_number_of_planets
-        self.max_number_of_planets = max_number_of_planets
-        self.min_planet_mass = min_planet_mass
-        self.max_planet_mass = max_planet_mass
-        self.max_tracer_positions = max_tracer_positions
+        self.simulation = simulation
+        self.governor = governor or QualityGovernor(quality_knobs(simulation), target_fps=self.FPS)
+        self.point_rendering = False
+        self.paint_time = 0.0
 
         self.setMinimumSize(self.min_width, self.min_height)
         self.setWindowTitle("Gravsim")
 
+        self.clock = FixedTimestepClock(
+            dt=self.simulation.dt,
+            simulated_time_per_second=self.FPS,
+            max_catch_up_steps=self.MAX_CATCH_UP_STEPS
+        )
+        self.worker = SimulationWorker(self.simulation, self.clock, self.FPS)
+        self.telemetry: TelemetryServer | None = None
+        self.profiler = self.simulation.profiler
+        self.camera = Camera()
+        self.trail_layer = TrailLayer()
+        self.pan_origin = None
+        self.snapshot = self.worker.snapshot
+
         self.timer = QTimer()
-        self.update_simulation_speed()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1000 // self.FPS)
         self.timer.timeout.connect(self.update_simulation)
         self.timer.start()
 
         self.pause_button = None
         self.center_of_mass_button = None
         self.tracer_button = None
+        self.persistent_trails_button = None
+        self.profiler_button = None
+        self.collisions_button = None
+        self.scenario_box = None
 
         self.displayed_selected_planet_info = None
         self.displayed_number_of_planets = None
+        self.displayed_quality = None
 
         self.planet_x_edit_input = None
         self.planet_y_edit_input = None
         self.planet_mass_edit_input = None
 
-        self.planets = []
         self.selected_planet = None
         self.paused_selected_planet = False
-        self.create_planets(self.starting_number_of_planets)
 
+        self.view_model = ViewModel()
         self.gui_creator = GuiCreator(self)
         self.create_gui(self.gui_creator)
+        self.bind_view_model()
         self.update_displayed_number_of_planets()
         self.update_selected_planet_info_label()
+        self.view_model.flush()
+        self.worker.start()
 
     def create_gui(self, gui_creator: GuiCreator) -> None:
+        status_bar = self.statusBar()
+        status_bar.setStyleSheet("color: white")
+        status_bar.setSizeGripEnabled(False)
+        status_bar.messageChanged.connect(lambda message: status_bar.setVisible(bool(message)))
+        status_bar.hide()
         self.add_buttons(gui_creator.create_button)
         self.add_sliders(gui_creator.create_slider)
         self.add_info_labels(gui_creator.create_info_label)
         self.add_input_labels_to_edit_selected_planet(gui_creator.create_input_label)
+        self.scenario_box = gui_creator.create_combo_box(
+            items=SCENARIO_NAMES,
+            position=(910, 95),
+            size=(80, 35),
+            current_item=self.simulation.scenario
+        )
 
     def add_buttons(self, create_button: Callable) -> None:
         data_to_create_buttons = [
-            ("Pause", None, True),
+            ("Pause", self.toggle_pause, True),
             ("Center of mass", None, True),
             ("Tracer", self.toggle_tracer, True),
             ("Spawn planet", self.spawn_planet, False),
             ("Reset planets", self.reset_planets, False),
             ("Remove planet", self.remove_planet, False),
             ("Center planets", self.center_planets, False),
-            ("Change properties", self.edit_all_selected_planet_properties, False)
+            ("Change properties", self.edit_all_selected_planet_properties, False),
+            ("Save state", self.save_checkpoint, False),
+            ("Load state", self.load_checkpoint, False),
+            ("Profiler", self.toggle_profiler, True),
+            ("Export profile", self.export_profile, False),
+            ("Collisions", self.toggle_collisions, True),
+            ("Long trails", self.toggle_persistent_trails, True)
         ]
 
         for i, (button_text, button_action, is_checkable) in enumerate(data_to_create_buttons):
@@ -101,12 +153,37 @@ class MainWindow(QMainWindow):
                     self.tracer_button = button
                 case "Change properties":
                     button.move(310, 95)
+                case "Save state":
+                    button.move(410, 95)
+                case "Load state":
+                    button.move(510, 95)
+                case "Profiler":
+                    self.profiler_button = button
+                    button.move(610, 95)
+                case "Export profile":
+                    button.move(710, 95)
+                case "Collisions":
+                    self.collisions_button = button
+                    button.setChecked(self.simulation.collisions_enabled)
+                    button.move(810, 95)
+                case "Long trails":
+                    self.persistent_trails_button = button
+                    button.move(840, 50)
 
     def add_sliders(self, create_slider: Callable) -> None:
         create_slider(
             position=(730, 10),
             size=(100, 20),
-            action=self.update_simulation_speed
+            action=self.update_simulation_speed,
+            min_value=0,
+            max_value=self.SPEED_SLIDER_STEPS,
+            start_value=0
+        )
+        self.gui_creator.create_button(
+            name="Reset view",
+            action=self.reset_view,
+            position=(840, 10),
+            size=(100, 35)
         )
 
     def add_info_labels(self, create_info_label: Callable) -> None:
@@ -119,6 +196,11 @@ class MainWindow(QMainWindow):
             size=(115, 40),
             border_size=0
         )
+        self.displayed_quality = create_info_label(
+            position=(440, 48),
+            size=(400, 40),
+            border_size=0
+        )
 
     def add_input_labels_to_edit_selected_planet(self, create_input_label: Callable) -> None:
         data_to_create_input_labels = [
@@ -142,126 +224,178 @@ class MainWindow(QMainWindow):
                 case PlanetBase.Mass:
                     self.planet_mass_edit_input = input_label
 
+    def bind_view_model(self) -> None:
+        self.view_model.bind("number_of_planets", self.display_number_of_planets)
+        self.view_model.bind("selected_planet_info", self.display_selected_planet_info)
+        for name, input_label in (
+                ("x_input", self.planet_x_edit_input),
+                ("y_input", self.planet_y_edit_input),
+                ("mass_input", self.planet_mass_edit_input)
+        ):
+            self.view_model.bind(name, input_label.setText, input_label.text())
+            input_label.textEdited.connect(lambda _, name=name: self.view_model.invalidate(name))
+        self.view_model.bind("inputs_read_only", self.set_read_only_mode_for_info_input_fields, True)
+        self.view_model.bind("quality", self.displayed_quality.setText, self.governor.describe())
+
     def edit_all_selected_planet_properties(self) -> None:
         if self.selected_planet:
             self.edit_selected_planet_x_position()
             self.edit_selected_planet_y_position()
             self.edit_selected_planet_mass()
 
-    def update_simulation_speed(self, value: int = 1) -> None:
-        self.timer.setInterval(1000 // (self.FPS * value))
+    def update_simulation_speed(self, value: int = 0) -> None:
+        self.clock.time_scale = self.MAX_TIME_SCALE ** (value / self.SPEED_SLIDER_STEPS)
 
     def update_simulation(self) -> None:
-        if self.selected_planet:
-            self.update_selected_planet_info_label()
-
-        if not self.pause_button.isChecked():
-            for planet in self.planets:
-
-                if planet == self.selected_planet and self.paused_selected_planet:
-                    if planet.tracer_enabled:
-                        planet.add_tracer_position()
-                    continue
+        snapshot = self.worker.snapshot
+        with self.profiler.section("labels"):
+            if snapshot is not self.snapshot:
+                number_of_planets_changed = len(snapshot.planets) != len(self.snapshot.planets)
+                self.snapshot = snapshot
+                if number_of_planets_changed:
+                    self.update_displayed_number_of_planets()
+                    if self.selected_planet and self.selected_planet not in snapshot.planets:
+                        self.selected_planet = None
+                        self.update_planet_info_input_label()
+                        self.update_selected_planet_info_label()
+
+                if self.selected_planet:
+                    self.update_selected_planet_info_label()
+                self.update()
+
+            if self.governor.update(self.worker.physics_time + self.paint_time):
+                self.apply_quality()
+            while self.worker.errors:
+                self.show_status(self.worker.errors.popleft())
+            self.view_model.flush()
+
+    def show_status(self, message: str, timeout: int = 5000) -> None:
+        self.statusBar().showMessage(message, timeout)
+
+    def apply_quality(self) -> None:
+        settings = self.governor.settings
+        self.point_rendering = settings.get("points", False)
+        self.worker.submit(self.simulation.apply_quality, settings)
+        self.view_model.set("quality", self.governor.describe())
+        self.update()
 
-                for other_planet in self.planets:
-                    if planet != other_planet:
-                        dx = other_planet.x - planet.x
-                        dy = other_planet.y - planet.y
-                        distance = sqrt(dx ** 2 + dy ** 2)
+    def toggle_pause(self) -> None:
+        self.worker.paused = self.pause_button.isChecked()
 
-                        force = (dx / distance, dy / distance)
-                        planet.apply_force(force)
+    def toggle_tracer(self) -> None:
+        self.worker.submit(self.simulation.set_tracers_enabled, self.tracer_button.isChecked())
+        self.trail_layer.invalidate()
 
-                planet.update()
+    def toggle_persistent_trails(self) -> None:
+        self.trail_layer.invalidate()
         self.update()
 
-    def toggle_tracer(self) -> None:
-        for planet in self.planets:
-            planet.tracer_enabled = not planet.tracer_enabled
-            if not planet.tracer_enabled:
-                planet.tracer_positions.clear()
-
-    def create_planets(self, number_of_planets_to_create: int = 1, tracer: bool = False) -> bool:
-        if len(self.planets) + number_of_planets_to_create <= self.max_number_of_planets:
-            window_size = self.size()
-            window_width = window_size.width()
-            window_height = window_size.height()
-
-            for _ in range(number_of_planets_to_create):
-                x = randint(0, window_width)
-                y = randint(0, window_height)
-                mass = randint(self.min_planet_mass, self.max_planet_mass)
-                planet = Planet(x, y, mass, tracer, max_tracer_positions=self.max_tracer_positions)
-                self.planets.append(planet)
-
-            return True
-        return False
+    def toggle_collisions(self) -> None:
+        self.worker.submit(self.simulation.set_collisions_enabled, self.collisions_button.isChecked())
 
     def spawn_planet(self) -> bool:
-        if self.create_planets():
-            if self.tracer_button.isChecked():
-                self.planets[-1].tracer_enabled = True
-
-            self.update_displayed_number_of_planets()
-
+        if len(self.snapshot.planets) < self.simulation.max_number_of_planets:
+            self.worker.submit(self.simulation.spawn_planet)
             return True
         return False
 
     def reset_planets(self) -> None:
-        if self.planets:
-            self.planets.clear()
-            self.selected_planet = None
-
-        if self.tracer_button.isChecked():
-            self.create_planets(self.starting_number_of_planets, True)
-        else:
-            self.create_planets(self.starting_number_of_planets)
+        self.worker.submit(self.simulation.reset_planets, self.scenario_box.currentText())
+        self.selected_planet = None
+        self.worker.frozen_planet = None
 
         self.update_selected_planet_info_label()
         self.update_planet_info_input_label()
-        self.update_displayed_number_of_planets()
 
     def remove_planet(self) -> bool:
-        if self.planets:
+        if self.snapshot.planets:
+            self.worker.submit(self.simulation.remove_planet, self.selected_planet)
             if self.selected_planet:
-                self.planets.remove(self.selected_planet)
                 self.selected_planet = None
+                self.worker.frozen_planet = None
                 self.update_selected_planet_info_label()
                 self.update_planet_info_input_label()
-            else:
-                self.planets.pop(0)
-
-            self.update_displayed_number_of_planets()
             return True
         return False
 
-    def center_planets(self) -> None:
-        if not self.planets:
-            return
+    def toggle_profiler(self) -> None:
+        self.profiler.set_enabled(self.profiler_button.isChecked())
+        self.update()
 
-        center_of_mass_x, center_of_mass_y = self.calculate_center_of_mass()
+    def export_profile(self) -> bool:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export profile", "", "CSV (*.csv);;Chrome trace (*.json)"
+        )
+        if path:
+            with contextlib.suppress(OSError):
+                self.profiler.export(path)
+                return True
+        return False
+
+    def center_planets(self) -> None:
         window_size = self.size()
-        center_of_window = {
-            "x": window_size.width() // 2,
-            "y": window_size.height() // 2
-        }
-        difference = {
-            "x": center_of_window["x"] - center_of_mass_x,
-            "y": center_of_window["y"] - center_of_mass_y,
-        }
-
-        for planet in self.planets:
-            planet.x += difference["x"]
-            planet.y += difference["y"]
-
-            if planet.tracer_enabled:
-                planet.tracer_positions = [
-                    (
-                        tracer_position[0] + difference["x"],
-                        tracer_position[1] + difference["y"]
-                    )
-                    for tracer_position in planet.tracer_positions
-                ]
+        center_x, center_y = self.camera.screen_to_world(window_size.width() / 2, window_size.height() / 2)
+        self.worker.submit(self.simulation.center_planets, center_x, center_y)
+
+    def start_telemetry(self, address: str) -> bool:
+        telemetry = TelemetryServer(parse_address(address), self.worker)
+        try:
+            telemetry.start()
+        except OSError:
+            return False
+        self.telemetry = telemetry
+        return True
+
+    def reset_view(self) -> None:
+        self.camera.reset()
+        self.update()
+
+    def save_checkpoint(self) -> bool:
+        path, _ = QFileDialog.getSaveFileName(self, "Save state", "", self.CHECKPOINT_FILE_FILTER)
+        if path:
+            return self.write_checkpoint(path)
+        return False
+
+    def write_checkpoint(self, path: str) -> bool:
+        self.worker.stop()
+        try:
+            self.simulation.save_checkpoint(path, self.selected_planet, self.pause_button.isChecked())
+        except OSError as error:
+            self.show_status(f"Could not save the state: {error}")
+            return False
+        finally:
+            self.worker.start()
+
+        self.show_status(f"State saved to {path}")
+        return True
+
+    def load_checkpoint(self) -> bool:
+        path, _ = QFileDialog.getOpenFileName(self, "Load state", "", self.CHECKPOINT_FILE_FILTER)
+        if path:
+            return self.restore_checkpoint(path)
+        return False
+
+    def restore_checkpoint(self, path: str) -> bool:
+        self.worker.stop()
+        try:
+            self.selected_planet, paused = self.simulation.load_checkpoint(path)
+        except (OSError, ValueError) as error:
+            self.show_status(f"Could not load the state: {error}")
+            self.worker.start()
+            return False
+
+        self.worker.frozen_planet = None
+        self.worker.snapshot = capture_snapshot(self.simulation)
+        self.pause_button.setChecked(paused)
+        self.tracer_button.setChecked(self.simulation.tracers_enabled)
+        self.collisions_button.setChecked(self.simulation.collisions_enabled)
+        self.toggle_pause()
+
+        self.update_simulation()
+        self.update_selected_planet_info_label()
+        self.update_planet_info_input_label()
+        self.worker.start()
+        return True
 
     def edit_selected_planet_x_position(self) -> bool:
         if self.selected_planet:
@@ -269,7 +403,7 @@ class MainWindow(QMainWindow):
             with contextlib.suppress(ValueError):
                 inputted_x = float(self.planet_x_edit_input.text())
                 if -BLOCKED_ZONE <= inputted_x <= BLOCKED_ZONE:
-                    self.selected_planet.x = inputted_x
+                    self.worker.submit(self.simulation.move_planet, self.selected_planet, inputted_x, None)
                     return True
         return False
 
@@ -279,7 +413,7 @@ class MainWindow(QMainWindow):
             with contextlib.suppress(ValueError):
                 inputted_y = float(self.planet_y_edit_input.text())
                 if -BLOCKED_ZONE <= inputted_y <= BLOCKED_ZONE:
-                    self.selected_planet.y = inputted_y
+                    self.worker.submit(self.simulation.move_planet, self.selected_planet, None, inputted_y)
                     return True
         return False
 
@@ -287,25 +421,18 @@ class MainWindow(QMainWindow):
         if self.selected_planet:
             with contextlib.suppress(ValueError):
                 inputted_mass = int(self.planet_mass_edit_input.text())
-                if self.min_planet_mass <= inputted_mass <= self.max_planet_mass:
-                    self.selected_planet.mass = inputted_mass
-                    self.selected_planet.radius = int(sqrt(inputted_mass))
+                if self.simulation.min_planet_mass <= inputted_mass <= self.simulation.max_planet_mass:
+                    self.worker.submit(self.simulation.set_planet_mass, self.selected_planet, inputted_mass)
                     return True
         return False
 
-    def calculate_center_of_mass(self) -> Tuple[int, int] | None:
-        if self.planets:
-            total_mass = sum(planet.mass for planet in self.planets)
-            center_x = int(sum(planet.x * planet.mass for planet in self.planets) / total_mass)
-            center_y = int(sum(planet.y * planet.mass for planet in self.planets) / total_mass)
-            return center_x, center_y
-        return None
-
     def display_center_of_mass(self, painter: QPainter, pen_color: QColor, mark_size: int = 10) -> None:
-        if not self.planets:
+        if not self.snapshot.center_of_mass:
             return
 
-        center_of_mass_x, center_of_mass_y = self.calculate_center_of_mass()
+        center_of_mass_x, center_of_mass_y = map(
+            int, self.camera.world_point_to_screen(*self.snapshot.center_of_mass)
+        )
         painter.setPen(pen_color)
         painter.drawLine(
             center_of_mass_x, center_of_mass_y - mark_size,
@@ -316,33 +443,90 @@ class MainWindow(QMainWindow):
             center_of_mass_x + mark_size, center_of_mass_y
         )
 
-    def update_displayed_number_of_planets(self) -> None:
-        self.displayed_number_of_planets.setText(
-            f"Number of planets: {len(self.planets)}"
+    def display_profiler_overlay(self, painter: QPainter, pen_color: QColor, bar_width: int = 4) -> None:
+        profiler = self.profiler
+        left = 10
+        bottom = self.height() - 10
+
+        painter.setPen(pen_color)
+        painter.drawText(
+            left, bottom - 50,
+            f"FPS {profiler.fps():.0f}  "
+            f"physics {profiler.mean_ms('physics'):.2f} ms (p99 {profiler.percentile_ms('physics', 99):.2f})  "
+            f"tracers {profiler.mean_ms('tracers'):.2f} ms  "
+            f"paint {profiler.mean_ms('paint'):.2f} ms (p99 {profiler.percentile_ms('paint', 99):.2f})  "
+            f"labels {profiler.mean_ms('labels'):.2f} ms  "
+            f"planets {len(self.snapshot.planets)}"
         )
 
+        counts, _ = profiler.histogram("frame")
+        highest = max(int(counts.max()), 1)
+        painter.setBrush(pen_color)
+        for i, count in enumerate(counts.tolist()):
+            height = 40 * count // highest
+            painter.drawRect(left + i * bar_width, bottom - height, bar_width - 1, height)
+
+    @staticmethod
+    def draw_planet(
+            painter: QPainter,
+            x: float,
+            y: float,
+            radius: int,
+            pen_color: QColor,
+            brush_color: QColor
+    ) -> None:
+        painter.setPen(pen_color)
+        painter.setBrush(brush_color)
+        painter.drawEllipse(
+            int(x - radius),
+            int(y - radius),
+            radius * 2, radius * 2
+        )
+
+    def update_displayed_number_of_planets(self) -> None:
+        self.view_model.set("number_of_planets", len(self.snapshot.planets))
+
+    def display_number_of_planets(self, number_of_planets: int) -> None:
+        self.displayed_number_of_planets.setText(f"Number of planets: {number_of_planets}")
+
+    def selected_planet_state(self) -> Tuple[int, int, int | float] | None:
+        if not self.selected_planet:
+            return None
+
+        found = np.flatnonzero(self.snapshot.ids == self.selected_planet.id)
+        if not len(found):
+            return None
+
+        index = found[0]
+        x, y = self.snapshot.positions[index].tolist()
+        mass = float(self.snapshot.masses[index])
+        return int(x), int(y), int(mass) if mass.is_integer() else mass
+
     def update_selected_planet_info_label(self) -> None:
-        if self.selected_planet:
-            selected_planet_info = "Selected Planet: " \
-                f"{PlanetBase.X}={int(self.selected_planet.x)}, " \
-                f"{PlanetBase.Y}={int(self.selected_planet.y)}, " \
-                f"{PlanetBase.Mass}={self.selected_planet.mass}"
-        else:
-            selected_planet_info = "No planet selected"
+        self.view_model.set("selected_planet_info", self.selected_planet_state())
 
-        self.displayed_selected_planet_info.setText(selected_planet_info)
+    def display_selected_planet_info(self, selected_planet_info: Tuple[int, int, int | float] | None) -> None:
+        if selected_planet_info:
+            x, y, mass = selected_planet_info
+            self.displayed_selected_planet_info.setText(
+                f"Selected Planet: {PlanetBase.X}={x}, {PlanetBase.Y}={y}, {PlanetBase.Mass}={mass}"
+            )
+        else:
+            self.displayed_selected_planet_info.setText("No planet selected")
 
     def update_planet_info_input_label(self) -> None:
-        if self.selected_planet:
-            self.planet_x_edit_input.setText(str(int(self.selected_planet.x)))
-            self.planet_y_edit_input.setText(str(int(self.selected_planet.y)))
-            self.planet_mass_edit_input.setText(str(self.selected_planet.mass))
-            self.set_read_only_mode_for_info_input_fields(False)
+        selected_planet_state = self.selected_planet_state()
+        if selected_planet_state:
+            x, y, mass = selected_planet_state
+            self.view_model.set("x_input", str(x))
+            self.view_model.set("y_input", str(y))
+            self.view_model.set("mass_input", str(mass))
+            self.view_model.set("inputs_read_only", False)
         else:
-            self.planet_x_edit_input.setText(PlanetBase.X)
-            self.planet_y_edit_input.setText(PlanetBase.Y)
-            self.planet_mass_edit_input.setText(PlanetBase.Mass)
-            self.set_read_only_mode_for_info_input_fields()
+            self.view_model.set("x_input", PlanetBase.X)
+            self.view_model.set("y_input", PlanetBase.Y)
+            self.view_model.set("mass_input", PlanetBase.Mass)
+            self.view_model.set("inputs_read_only", True)
 
     def set_read_only_mode_for_info_input_fields(self, only_readable_mode: bool = True) -> None:
         self.planet_x_edit_input.setReadOnly(only_readable_mode)
@@ -350,59 +534,228 @@ class MainWindow(QMainWindow):
         self.planet_mass_edit_input.setReadOnly(only_readable_mode)
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        if self.selected_planet:
-            mouse_position = event.pos()
-            self.selected_planet.x, self.selected_planet.y = mouse_position.x(), mouse_position.y()
-            self.update_planet_info_input_label()
+        mouse_position = event.pos()
+        if self.pan_origin:
+            self.camera.pan(mouse_position.x() - self.pan_origin.x(), mouse_position.y() - self.pan_origin.y())
+            self.pan_origin = mouse_position
+            self.update()
+        elif self.selected_planet:
+            x, y = self.camera.screen_to_world(mouse_position.x(), mouse_position.y())
+            self.worker.submit(self.simulation.move_planet, self.selected_planet, x, y)
+            self.view_model.set("x_input", str(int(x)))
+            self.view_model.set("y_input", str(int(y)))
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
-        if event.button() == Qt.LeftButton:
+        if event.button() in (Qt.RightButton, Qt.MiddleButton):
+            self.pan_origin = event.pos()
+        elif event.button() == Qt.LeftButton:
             mouse_position = event.pos()
 
-            for planet in self.planets:
-                if sqrt((planet.x - mouse_position.x()) ** 2 + (planet.y - mouse_position.y()) ** 2) <= planet.radius:
-                    if planet != self.selected_planet:
-                        self.selected_planet = planet
-                        self.update_planet_info_input_label()
-                    self.paused_selected_planet = True
-                    return
+            planet = self.simulation.find_planet_at(*self.camera.screen_to_world(mouse_position.x(), mouse_position.y()))
+            if planet:
+                if planet != self.selected_planet:
+                    self.selected_planet = planet
+                    self.update_planet_info_input_label()
+                self.paused_selected_planet = True
+                self.worker.frozen_planet = planet
+                return
 
             self.selected_planet = None
             self.update_selected_planet_info_label()
             self.update_planet_info_input_label()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
-        if self.paused_selected_planet:
+        if event.button() in (Qt.RightButton, Qt.MiddleButton):
+            self.pan_origin = None
+        elif self.paused_selected_planet:
             self.paused_selected_planet = False
+            self.worker.frozen_planet = None
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        mouse_position = event.pos()
+        self.camera.zoom_at(
+            mouse_position.x(), mouse_position.y(), self.ZOOM_STEP ** (event.angleDelta().y() / 120)
+        )
+        self.update()
 
     def paintEvent(self, event: QPaintEvent) -> None:
+        paint_started = perf_counter()
         painter = QPainter(self)
-        painter.fillRect(event.rect(), self.BLACK)
+        with self.profiler.section("paint"):
+            painter.fillRect(event.rect(), self.BLACK)
+
+            snapshot = self.snapshot
+            width, height = self.width(), self.height()
+            screen_positions = self.camera.world_to_screen(snapshot.positions)
+            screen_radii = snapshot.radii * self.camera.zoom
+            visible = visible_mask(screen_positions, screen_radii, width, height)
+            selected_id = self.selected_planet.id if self.selected_planet else -1
+
+            if self.simulation.tracers_enabled:
+                if self.persistent_trails_button.isChecked():
+                    self.draw_persistent_trails(painter, snapshot, screen_positions, selected_id, width, height)
+                else:
+                    self.draw_tracers(painter, snapshot.ids, snapshot.tracers, width, height)
+
+            painter.setPen(self.WHITE)
+            unselected = visible & (snapshot.ids != selected_id)
+            as_points = unselected & (screen_radii < 1)
+            if self.point_rendering:
+                as_points = unselected
+            if as_points.any():
+                painter.drawPoints(points_to_polygon(screen_positions[as_points]))
+
+            large = np.flatnonzero(visible & ~as_points)
+            for body_id, (x, y), radius in zip(
+                    snapshot.ids[large].tolist(),
+                    screen_positions[large].tolist(),
+                    screen_radii[large].tolist()
+            ):
+                if body_id == selected_id and radius < 1:
+                    painter.setPen(self.RED)
+                    painter.drawPoint(QPointF(x, y))
+                elif body_id == selected_id:
+                    self.draw_planet(painter, x, y, int(radius), self.RED, self.WHITE)
+                else:
+                    self.draw_planet(painter, x, y, int(radius), self.WHITE, self.WHITE)
+
+            if self.center_of_mass_button.isChecked() and snapshot.planets:
+                self.display_center_of_mass(painter, self.RED)
+
+        if self.profiler.enabled:
+            self.profiler.frame()
+            self.display_profiler_overlay(painter, self.WHITE)
+        self.paint_time = perf_counter() - paint_started
+
+    def tracer_screen_points(
+            self,
+            ids: np.ndarray,
+            tracers: Tuple[FrozenTracer | None, ...],
+            width: int,
+            height: int
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        camera = self.camera
+        visible_rect = camera.visible_rect(width, height)
+        stride = max(int(1 / camera.zoom), 1)
+
+        for body_id, tracer in zip(ids.tolist(), tracers):
+            if tracer and len(tracer.points) and rects_overlap(tracer.bounds, visible_rect):
+                yield body_id, camera.world_to_screen(tracer.points[::stride])
+
+    def draw_tracers(
+            self,
+            painter: QPainter,
+            ids: np.ndarray,
+            tracers: Tuple[FrozenTracer | None, ...],
+            width: int,
+            height: int
+    ) -> None:
+        selected_id = self.selected_planet.id if self.selected_planet else -1
 
-        for planet in self.planets:
-            if planet == self.selected_planet:
-                planet.draw(painter, self.RED, self.WHITE)
-            else:
-                planet.draw(painter, self.WHITE, self.WHITE)
+        for body_id, points in self.tracer_screen_points(ids, tracers, width, height):
+            points = points[visible_mask(points, 0.0, width, height)]
+            if len(points):
+                painter.setPen(self.RED if body_id == selected_id else self.WHITE)
+                painter.drawPoints(points_to_polygon(points))
 
-        if self.center_of_mass_button.isChecked() and self.planets:
-            self.display_center_of_mass(painter, self.RED)
+    def draw_persistent_trails(
+            self,
+            painter: QPainter,
+            snapshot: SimulationSnapshot,
+            screen_positions: np.ndarray,
+            selected_id: int,
+            width: int,
+            height: int
+    ) -> None:
+        camera = self.camera
+        self.trail_layer.draw(
+            painter,
+            (snapshot.generation, camera.x, camera.y, camera.zoom, width, height),
+            snapshot.ids,
+            screen_positions,
+            lambda: (
+                points for _, points in self.tracer_screen_points(snapshot.ids, snapshot.tracers, width, height)
+            )
+        )
+
+        selected = np.flatnonzero(snapshot.ids == selected_id)
+        if len(selected):
+            row = int(selected[0])
+            painter.setPen(self.RED)
+            for _, points in self.tracer_screen_points(
+                    snapshot.ids[row:row + 1], snapshot.tracers[row:row + 1], width, height
+            ):
+                self.trail_layer.draw_polyline(painter, points)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        window_size = event.size()
+        self.worker.submit(self.simulation.resize, window_size.width(), window_size.height())
+        super().resizeEvent(event)
 
     def closeEvent(self, event: QCloseEvent) -> None:
         self.timer.stop()
+        if self.telemetry:
+            self.telemetry.stop()
+        self.worker.stop()
+        self.simulation.close()
         event.accept()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    add_engine_arguments(parser)
+    parser.add_argument("--dt", type=float, default=1.0)
+    parser.add_argument("--substeps", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--scenario", choices=SCENARIO_NAMES, default="uniform")
+    parser.add_argument("--planets", type=int, default=5)
+    parser.add_argument("--collisions", action="store_true")
+    parser.add_argument("--record", default=None)
+    parser.add_argument("--record-every", type=int, default=1)
+    parser.add_argument("--restore", default=None)
+    parser.add_argument("--telemetry", default=None)
+    parser.add_argument("--persistent-trails", action="store_true")
+    parser.add_argument("--trail-fade", type=float, default=0.0)
+    add_governor_arguments(parser)
+    args, qt_args = parser.parse_known_args()
+    check_engine_arguments(parser, args)
+
+    engine = create_engine_from_arguments(args)
+    max_number_of_planets = max(
+        max_bodies_for_frame_budget(engine, MainWindow.PHYSICS_FRAME_SHARE / MainWindow.FPS),
+        args.planets
+    )
+
+    simulation = Simulation(
+        width=1000,
+        height=800,
+        starting_number_of_planets=args.planets,
+        max_number_of_planets=max_number_of_planets,
+        min_planet_mass=50,
+        max_planet_mass=1000,
+        max_tracer_positions=1000,
+        engine=engine,
+        dt=args.dt,
+        substeps=args.substeps,
+        seed=args.seed,
+        scenario=args.scenario
+    )
+    simulation.set_collisions_enabled(args.collisions)
+    if args.record:
+        simulation.start_recording(args.record, args.record_every)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     main_window = MainWindow(
         min_width=1000,
         min_height=800,
-        starting_number_of_planets=5,
-        max_number_of_planets=25,
-        min_planet_mass=50,
-        max_planet_mass=1000,
-        max_tracer_positions=1000
+        simulation=simulation,
+        governor=create_governor_from_arguments(args, simulation, MainWindow.FPS)
     )
+    main_window.persistent_trails_button.setChecked(args.persistent_trails)
+    main_window.trail_layer.fade = args.trail_fade
+    if args.restore:
+        main_window.restore_checkpoint(args.restore)
+    if args.telemetry and not main_window.start_telemetry(args.telemetry):
+        parser.error(f"cannot listen for telemetry on {args.telemetry}")
     main_window.show()
     sys.exit(app.exec_())
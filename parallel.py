@@ -0,0 +1,149 @@
+import argparse
+import os
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.pool import Pool
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+from typing import Dict, List, Tuple
+import numpy as np
+
+from engine import ArrayEngine, unit_force_sum
+
+attached_buffers: Dict[str, Tuple[SharedMemory, np.ndarray]] = {}
+
+
+def attach_buffer(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    if name not in attached_buffers:
+        shared_memory = SharedMemory(name=name)
+        attached_buffers[name] = shared_memory, np.ndarray(shape, dtype=np.float64, buffer=shared_memory.buf)
+    return attached_buffers[name][1]
+
+
+def detach_buffers(names_to_keep: Tuple[str, ...]) -> None:
+    for name in [name for name in attached_buffers if name not in names_to_keep]:
+        shared_memory, _ = attached_buffers.pop(name)
+        shared_memory.close()
+
+
+def compute_tile(task: Tuple[Tuple[str, str, str], int, int, int, int]) -> None:
+    names, capacity, number_of_bodies, start, stop = task
+    detach_buffers(names)
+    positions_name, masses_name, accelerations_name = names
+
+    positions = attach_buffer(positions_name, (capacity, 2))[:number_of_bodies]
+    masses = attach_buffer(masses_name, (capacity,))[:number_of_bodies]
+    accelerations = attach_buffer(accelerations_name, (capacity, 2))
+
+    accelerations[start:stop] = unit_force_sum(positions[start:stop], positions)
+    accelerations[start:stop] /= masses[start:stop, np.newaxis]
+
+
+class SharedBuffers:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.blocks = [
+            SharedMemory(create=True, size=max(capacity * 2 * 8, 1)),
+            SharedMemory(create=True, size=max(capacity * 8, 1)),
+            SharedMemory(create=True, size=max(capacity * 2 * 8, 1))
+        ]
+        self.names = tuple(block.name for block in self.blocks)
+        self.positions = np.ndarray((capacity, 2), dtype=np.float64, buffer=self.blocks[0].buf)
+        self.masses = np.ndarray((capacity,), dtype=np.float64, buffer=self.blocks[1].buf)
+        self.accelerations = np.ndarray((capacity, 2), dtype=np.float64, buffer=self.blocks[2].buf)
+
+    def release(self) -> None:
+        self.positions = self.masses = self.accelerations = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def release_resources(pool: Pool | None, buffers: List[SharedBuffers]) -> None:
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+    for shared_buffers in buffers:
+        shared_buffers.release()
+    buffers.clear()
+
+
+class ParallelEngine(ArrayEngine):
+    name = "parallel"
+
+    def __init__(self, initial_capacity: int = 64, workers: int | None = None, tile_size: int = 256) -> None:
+        super().__init__(initial_capacity)
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_size = tile_size
+
+        self.shared_buffers: List[SharedBuffers] = []
+        self.pool = None
+        if self.workers > 1:
+            resource_tracker.ensure_running()
+            self.pool = Pool(self.workers)
+        self.finalizer = weakref.finalize(self, release_resources, self.pool, self.shared_buffers)
+
+    def close(self) -> None:
+        self.finalizer()
+
+    def buffers_for(self, number_of_bodies: int) -> SharedBuffers:
+        if not self.shared_buffers or self.shared_buffers[0].capacity < number_of_bodies:
+            release_resources(None, self.shared_buffers)
+            self.shared_buffers.append(SharedBuffers(max(number_of_bodies, self.capacity)))
+        return self.shared_buffers[0]
+
+    def compute_accelerations(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        number_of_bodies = len(positions)
+        tiles = [
+            (start, min(start + self.tile_size, number_of_bodies))
+            for start in range(0, number_of_bodies, self.tile_size)
+        ]
+
+        if self.pool is None:
+            accelerations = np.empty_like(positions)
+            for start, stop in tiles:
+                accelerations[start:stop] = unit_force_sum(positions[start:stop], positions)
+                accelerations[start:stop] /= masses[start:stop, np.newaxis]
+            return accelerations
+
+        buffers = self.buffers_for(number_of_bodies)
+        buffers.positions[:number_of_bodies] = positions
+        buffers.masses[:number_of_bodies] = masses
+
+        tasks = [
+            (buffers.names, buffers.capacity, number_of_bodies, start, stop)
+            for start, stop in tiles
+        ]
+        self.pool.map(compute_tile, tasks, chunksize=1)
+        return buffers.accelerations[:number_of_bodies].copy()
+
+
+def benchmark_scaling(number_of_bodies: int, number_of_steps: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(0, 1000, (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+
+    reference = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        engine = ParallelEngine(workers=workers)
+        engine.compute_accelerations(positions, masses)
+
+        started = perf_counter()
+        for _ in range(number_of_steps):
+            accelerations = engine.compute_accelerations(positions, masses)
+        elapsed = perf_counter() - started
+        engine.close()
+
+        if reference is None:
+            reference = accelerations
+        identical = np.array_equal(reference, accelerations)
+        print(f"workers={workers} steps/s={number_of_steps / elapsed:.2f} identical={identical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how the parallel engine scales with the number of workers.")
+    parser.add_argument("--bodies", type=int, default=4000)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+    benchmark_scaling(args.bodies, args.steps)
@@ -0,0 +1,191 @@
+import argparse
+from time import perf_counter
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+from engine import ArrayEngine
+from barnes_hut import expand
+
+CORNERS = ((0, 0), (1, 0), (0, 1), (1, 1))
+NEIGHBOR_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class ParticleMeshEngine(ArrayEngine):
+    name = "particle-mesh"
+
+    def __init__(
+            self,
+            initial_capacity: int = 64,
+            grid_size: int = 256,
+            short_range_correction: bool = False,
+            cutoff_cells: float = 3.0
+    ) -> None:
+        super().__init__(initial_capacity)
+        self.grid_size = grid_size
+        self.short_range_correction = short_range_correction
+        self.cutoff_cells = cutoff_cells
+        self.kernel_spectra: Dict[Tuple[int, float], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def kernel_spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
+        softening = self.cutoff_cells if self.short_range_correction else 0.0
+        key = self.grid_size, softening
+        if key not in self.kernel_spectra:
+            self.kernel_spectra[key] = force_kernel_spectra(self.grid_size, softening)
+        return self.kernel_spectra[key]
+
+    def compute_accelerations(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        if len(positions) < 2:
+            return np.zeros_like(positions)
+
+        grid_size = self.grid_size
+        padded_size = 2 * grid_size
+        lower = positions.min(axis=0)
+        extent = float((positions.max(axis=0) - lower).max()) or 1.0
+        cell_size = extent / (grid_size - 1) * (1 + 1e-9)
+
+        coordinates = (positions - lower) / cell_size
+        cells = np.floor(coordinates).astype(np.int64)
+        fractions = coordinates - cells
+        corner_indices, corner_weights = cloud_in_cell(cells, fractions, padded_size)
+
+        density = np.zeros(padded_size * padded_size)
+        for indices, weights in zip(corner_indices, corner_weights):
+            density += np.bincount(indices, weights, padded_size * padded_size)
+        density_spectrum = np.fft.rfft2(density.reshape(padded_size, padded_size))
+
+        accelerations = np.zeros_like(positions)
+        for axis, kernel_spectrum in enumerate(self.kernel_spectrum()):
+            field = np.fft.irfft2(density_spectrum * kernel_spectrum, s=(padded_size, padded_size)).ravel()
+            for indices, weights in zip(corner_indices, corner_weights):
+                accelerations[:, axis] -= field[indices] * weights
+
+        if self.short_range_correction:
+            accelerations += short_range_forces(positions, self.cutoff_cells * cell_size)
+
+        accelerations /= masses[:, np.newaxis]
+        return accelerations
+
+
+def force_kernel_spectra(grid_size: int, softening: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    padded_size = 2 * grid_size
+    offsets = np.fft.fftfreq(padded_size, 1.0 / padded_size)
+    dx = offsets[:, np.newaxis]
+    dy = offsets[np.newaxis, :]
+
+    inverse_scale = np.maximum(np.hypot(dx, dy), softening)
+    np.divide(1.0, inverse_scale, out=inverse_scale, where=inverse_scale > 0.0)
+    return np.fft.rfft2(dx * inverse_scale), np.fft.rfft2(dy * inverse_scale)
+
+
+def cloud_in_cell(
+        cells: np.ndarray,
+        fractions: np.ndarray,
+        padded_size: int
+) -> Tuple[Tuple[np.ndarray, ...], Tuple[np.ndarray, ...]]:
+    weights_x = (1.0 - fractions[:, 0], fractions[:, 0])
+    weights_y = (1.0 - fractions[:, 1], fractions[:, 1])
+
+    indices = tuple(
+        (cells[:, 0] + offset_x) * padded_size + cells[:, 1] + offset_y
+        for offset_x, offset_y in CORNERS
+    )
+    weights = tuple(weights_x[offset_x] * weights_y[offset_y] for offset_x, offset_y in CORNERS)
+    return indices, weights
+
+
+def short_range_forces(positions: np.ndarray, cutoff: float, max_pairs_per_chunk: int = 1 << 22) -> np.ndarray:
+    number_of_bodies = len(positions)
+    bins = np.floor((positions - positions.min(axis=0)) / cutoff).astype(np.int64)
+    stride = int(bins[:, 1].max()) + 3
+    keys = (bins[:, 0] + 1) * stride + bins[:, 1] + 1
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sorted_positions = positions[order]
+    occupied_keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+    ranks = np.arange(number_of_bodies)
+    sorted_forces = np.zeros_like(positions)
+
+    for offset_x, offset_y in NEIGHBOR_OFFSETS:
+        if offset_x == offset_y == 0:
+            firsts = ranks + 1
+            pair_counts = (starts + counts)[np.searchsorted(occupied_keys, sorted_keys)] - firsts
+        else:
+            neighbor_keys = sorted_keys + offset_x * stride + offset_y
+            neighbors = np.minimum(np.searchsorted(occupied_keys, neighbor_keys), len(occupied_keys) - 1)
+            firsts = starts[neighbors]
+            pair_counts = np.where(occupied_keys[neighbors] == neighbor_keys, counts[neighbors], 0)
+        add_pair_forces(sorted_positions, firsts, pair_counts, cutoff, sorted_forces, max_pairs_per_chunk)
+
+    forces = np.empty_like(positions)
+    forces[order] = sorted_forces
+    return forces
+
+
+def add_pair_forces(
+        positions: np.ndarray,
+        firsts: np.ndarray,
+        pair_counts: np.ndarray,
+        cutoff: float,
+        forces: np.ndarray,
+        max_pairs_per_chunk: int
+) -> None:
+    number_of_bodies = len(positions)
+    cumulative_counts = np.cumsum(pair_counts)
+
+    start = 0
+    while start < number_of_bodies:
+        already_counted = cumulative_counts[start - 1] if start else 0
+        end = max(
+            int(np.searchsorted(cumulative_counts, already_counted + max_pairs_per_chunk, side="right")),
+            start + 1
+        )
+        targets, sources = expand(np.arange(start, end), firsts[start:end], pair_counts[start:end])
+        start = end
+        if not len(targets):
+            continue
+
+        dx = positions[sources, 0] - positions[targets, 0]
+        dy = positions[sources, 1] - positions[targets, 1]
+        distance = np.hypot(dx, dy)
+        close = (distance < cutoff) & (distance > 0.0)
+        targets, sources, distance = targets[close], sources[close], distance[close]
+
+        scale = 1.0 / distance - 1.0 / cutoff
+        for axis, difference in enumerate((dx[close], dy[close])):
+            pair_forces = difference * scale
+            forces[:, axis] += np.bincount(targets, pair_forces, number_of_bodies)
+            forces[:, axis] -= np.bincount(sources, pair_forces, number_of_bodies)
+
+
+def accuracy_report(
+        number_of_bodies: int,
+        grid_sizes: Sequence[int],
+        seed: int = 0,
+        area_size: Tuple[int, int] = (1000, 800)
+) -> None:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), area_size, (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+
+    for grid_size in grid_sizes:
+        for short_range_correction in (False, True):
+            engine = ParticleMeshEngine(grid_size=grid_size, short_range_correction=short_range_correction)
+            started = perf_counter()
+            engine.compute_accelerations(positions, masses)
+            elapsed = perf_counter() - started
+
+            error = engine.max_acceleration_error(positions, masses)
+            print(
+                f"grid={grid_size} p3m={short_range_correction} "
+                f"max relative error={error:.2e} time={elapsed * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the particle-mesh solver with the direct sum.")
+    parser.add_argument("--bodies", type=int, default=500)
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=[32, 64, 128, 256])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    accuracy_report(args.bodies, args.grid_sizes, args.seed)
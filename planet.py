@@ -1,6 +1,10 @@
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 from math import sqrt
-from PyQt5.QtGui import QPainter, QColor
+
+from tracer import TracerBuffer
+
+if TYPE_CHECKING:
+    from bodies import BodyStore
 
 
 class PlanetBase:
@@ -10,53 +14,86 @@ class PlanetBase:
 
 
 class Planet:
-    def __init__(
-            self,
-            x: int,
-            y: int,
-            mass: int,
-            tracer_enabled: bool = False,
-            max_tracer_positions: int = 1000
-    ) -> None:
-        self.x = x
-        self.y = y
-        self.mass = mass
-        self.tracer_enabled = tracer_enabled
-        self.max_tracer_positions = max_tracer_positions
-        self.radius = int(sqrt(mass))
-
-        self.x_velocity = 0
-        self.y_velocity = 0
-
-        self.tracer_positions = []
-
-    def apply_force(self, force: Tuple[float]) -> None:
-        ax = force[0] / self.mass
-        ay = force[1] / self.mass
-        self.x_velocity += ax
-        self.y_velocity += ay
-
-    def update(self) -> None:
-        self.x += self.x_velocity
-        self.y += self.y_velocity
-
-        if self.tracer_enabled:
-            self.add_tracer_position()
+    __slots__ = ("store", "id")
+
+    def __init__(self, store: "BodyStore", body_id: int) -> None:
+        self.store = store
+        self.id = body_id
+
+    @property
+    def index(self) -> int:
+        return self.store.index_of[self.id]
+
+    @property
+    def x(self) -> float:
+        return float(self.store.positions[self.index, 0])
+
+    @x.setter
+    def x(self, x: float) -> None:
+        self.store.positions[self.index, 0] = x
+
+    @property
+    def y(self) -> float:
+        return float(self.store.positions[self.index, 1])
+
+    @y.setter
+    def y(self, y: float) -> None:
+        self.store.positions[self.index, 1] = y
+
+    @property
+    def x_velocity(self) -> float:
+        return float(self.store.velocities[self.index, 0])
+
+    @x_velocity.setter
+    def x_velocity(self, x_velocity: float) -> None:
+        self.store.velocities[self.index, 0] = x_velocity
+
+    @property
+    def y_velocity(self) -> float:
+        return float(self.store.velocities[self.index, 1])
+
+    @y_velocity.setter
+    def y_velocity(self, y_velocity: float) -> None:
+        self.store.velocities[self.index, 1] = y_velocity
+
+    @property
+    def mass(self) -> int | float:
+        mass = float(self.store.masses[self.index])
+        return int(mass) if mass.is_integer() else mass
+
+    @property
+    def radius(self) -> int:
+        return int(self.store.radii[self.index])
+
+    @property
+    def tracer_enabled(self) -> bool:
+        return bool(self.store.tracer_enabled[self.index])
+
+    @tracer_enabled.setter
+    def tracer_enabled(self, tracer_enabled: bool) -> None:
+        self.store.tracer_enabled[self.index] = tracer_enabled
+
+    @property
+    def tracer_positions(self) -> TracerBuffer:
+        return self.store.tracer_at(self.index)
+
+    @property
+    def max_tracer_positions(self) -> int:
+        return self.store.max_tracer_positions
+
+    def set_mass(self, mass: int | float) -> None:
+        index = self.index
+        self.store.masses[index] = mass
+        self.store.radii[index] = int(sqrt(mass))
+
+    def apply_force(self, force: Tuple[float], dt: float = 1.0) -> None:
+        mass = self.mass
+        self.x_velocity += force[0] / mass * dt
+        self.y_velocity += force[1] / mass * dt
+
+    def update(self, dt: float = 1.0) -> None:
+        self.x += self.x_velocity * dt
+        self.y += self.y_velocity * dt
 
     def add_tracer_position(self) -> None:
-        self.tracer_positions.append((int(self.x), int(self.y)))
-        if len(self.tracer_positions) > self.max_tracer_positions:
-            self.tracer_positions.pop(0)
-
-    def draw(self, painter: QPainter, pen_color: QColor, brush_color: QColor) -> None:
-        painter.setPen(pen_color)
-        painter.setBrush(brush_color)
-        painter.drawEllipse(
-            int(self.x - self.radius),
-            int(self.y - self.radius),
-            self.radius * 2, self.radius * 2
-        )
-
-        if self.tracer_enabled:
-            for tracer_position in self.tracer_positions:
-                painter.drawPoint(*tracer_position)
+        self.tracer_positions.append(self.x, self.y)
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import threading
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+from typing import ContextManager, Dict, Tuple
+import numpy as np
+
+NULL_SECTION = nullcontext()
+
+
+class ProfiledSection:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *exception) -> None:
+        self.profiler.record(self.name, self.start, perf_counter())
+
+
+class FrameProfiler:
+    def __init__(self, history: int = 600) -> None:
+        self.history = history
+        self.enabled = False
+        self.origin = perf_counter()
+        self.samples: Dict[str, deque] = {}
+        self.events = deque(maxlen=history * 16)
+        self.last_frame_time = None
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.last_frame_time = None
+
+    def clear(self) -> None:
+        self.samples.clear()
+        self.events.clear()
+        self.last_frame_time = None
+
+    def section(self, name: str) -> ContextManager:
+        if self.enabled:
+            return ProfiledSection(self, name)
+        return NULL_SECTION
+
+    def record(self, name: str, start: float, end: float) -> None:
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.history))
+        samples.append(end - start)
+        self.events.append((name, threading.get_ident(), start, end - start))
+
+    def frame(self) -> None:
+        if not self.enabled:
+            return
+
+        now = perf_counter()
+        if self.last_frame_time is not None:
+            self.record("frame", self.last_frame_time, now)
+        self.last_frame_time = now
+
+    def durations(self, name: str) -> np.ndarray:
+        return np.fromiter(self.samples.get(name, ()), dtype=np.float64)
+
+    def mean_ms(self, name: str) -> float:
+        durations = self.durations(name)
+        return float(durations.mean()) * 1000 if len(durations) else 0.0
+
+    def percentile_ms(self, name: str, percentile: float) -> float:
+        durations = self.durations(name)
+        return float(np.percentile(durations, percentile)) * 1000 if len(durations) else 0.0
+
+    def fps(self) -> float:
+        frame_ms = self.mean_ms("frame")
+        return 1000 / frame_ms if frame_ms else 0.0
+
+    def histogram(self, name: str, bins: int = 20, max_ms: float = 50.0) -> Tuple[np.ndarray, np.ndarray]:
+        return np.histogram(np.minimum(self.durations(name) * 1000, max_ms), bins=bins, range=(0.0, max_ms))
+
+    def export_csv(self, path: str) -> None:
+        with open(path, "w", newline="") as profile_file:
+            writer = csv.writer(profile_file)
+            writer.writerow(("section", "thread", "start_ms", "duration_ms"))
+            for name, thread, start, duration in list(self.events):
+                writer.writerow((name, thread, (start - self.origin) * 1000, duration * 1000))
+
+    def export_chrome_trace(self, path: str) -> None:
+        process_id = os.getpid()
+        trace_events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1_000_000,
+                "dur": duration * 1_000_000,
+                "pid": process_id,
+                "tid": thread
+            }
+            for name, thread, start, duration in list(self.events)
+        ]
+        with open(path, "w") as profile_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, profile_file)
+
+    def export(self, path: str) -> None:
+        if path.endswith(".json"):
+            self.export_chrome_trace(path)
+        else:
+            self.export_csv(path)
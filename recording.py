@@ -0,0 +1,163 @@
+import os
+from typing import NamedTuple
+import numpy as np
+
+MAGIC = b"GRAVREC\0"
+VERSION = 1
+BODY_FIELDS = ("x", "y", "x_velocity", "y_velocity", "mass")
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("body_fields", "<u4"),
+    ("max_frames", "<u8"),
+    ("frames_written", "<u8"),
+    ("data_start", "<u8"),
+    ("data_end", "<u8")
+])
+INDEX_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("count", "<u8"),
+    ("step", "<u8"),
+    ("time", "<f8")
+])
+BODY_DTYPE = np.dtype("<f8")
+
+
+class TrajectoryFrame(NamedTuple):
+    step: int
+    time: float
+    positions: np.ndarray
+    velocities: np.ndarray
+    masses: np.ndarray
+
+
+class TrajectoryRecorder:
+    def __init__(
+            self,
+            path: str,
+            max_frames: int = 100_000,
+            initial_data_size: int = 16 * 1024 * 1024,
+            record_every: int = 1,
+            move_chunk_size: int = 16 * 1024 * 1024
+    ) -> None:
+        self.path = path
+        self.max_frames = max_frames
+        self.record_every = record_every
+        self.move_chunk_size = move_chunk_size
+        self.data_start = HEADER_DTYPE.itemsize + max_frames * INDEX_DTYPE.itemsize
+        self.file_size = self.data_start + initial_data_size
+
+        with open(path, "wb") as recording_file:
+            recording_file.truncate(self.file_size)
+        self.map_file()
+
+        self.header["magic"] = MAGIC
+        self.header["version"] = VERSION
+        self.header["body_fields"] = len(BODY_FIELDS)
+        self.header["max_frames"] = max_frames
+        self.header["frames_written"] = 0
+        self.header["data_start"] = self.data_start
+        self.header["data_end"] = self.data_start
+
+    def map_file(self) -> None:
+        self.memory_map = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(self.file_size,))
+        self.header = self.memory_map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        self.index = self.memory_map[HEADER_DTYPE.itemsize:self.data_start].view(INDEX_DTYPE)
+
+    def grow(self, required_size: int) -> None:
+        self.memory_map.flush()
+        del self.header, self.index, self.memory_map
+
+        self.file_size = max(required_size, self.data_start + 2 * (self.file_size - self.data_start))
+        with open(self.path, "r+b") as recording_file:
+            recording_file.truncate(self.file_size)
+        self.map_file()
+
+    def grow_index(self) -> None:
+        data_end = int(self.header["data_end"])
+        shift = self.max_frames * INDEX_DTYPE.itemsize
+        if data_end + shift > self.file_size:
+            self.grow(data_end + shift)
+
+        chunk_end = data_end
+        while chunk_end > self.data_start:
+            chunk_start = max(chunk_end - self.move_chunk_size, self.data_start)
+            self.memory_map[chunk_start + shift:chunk_end + shift] = self.memory_map[chunk_start:chunk_end]
+            chunk_end = chunk_start
+
+        frames_written = int(self.header["frames_written"])
+        self.index["offset"][:frames_written] += shift
+        self.memory_map[self.data_start:self.data_start + shift] = 0
+        self.max_frames *= 2
+        self.data_start += shift
+        self.index = self.memory_map[HEADER_DTYPE.itemsize:self.data_start].view(INDEX_DTYPE)
+
+        self.header["max_frames"] = self.max_frames
+        self.header["data_start"] = self.data_start
+        self.header["data_end"] = data_end + shift
+
+    def record(self, step: int, time: float, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray) -> bool:
+        frame_number = int(self.header["frames_written"])
+        if step % self.record_every and frame_number:
+            return False
+        if frame_number >= self.max_frames:
+            self.grow_index()
+
+        count = len(masses)
+        offset = int(self.header["data_end"])
+        end = offset + count * len(BODY_FIELDS) * BODY_DTYPE.itemsize
+        if end > self.file_size:
+            self.grow(end)
+
+        bodies = self.memory_map[offset:end].view(BODY_DTYPE).reshape(count, len(BODY_FIELDS))
+        bodies[:, 0:2] = positions
+        bodies[:, 2:4] = velocities
+        bodies[:, 4] = masses
+
+        self.index[frame_number] = offset, count, step, time
+        self.header["data_end"] = end
+        self.header["frames_written"] = frame_number + 1
+        return True
+
+    def close(self) -> None:
+        if self.memory_map is None:
+            return
+
+        data_end = int(self.header["data_end"])
+        self.memory_map.flush()
+        del self.header, self.index
+        self.memory_map = None
+
+        with open(self.path, "r+b") as recording_file:
+            recording_file.truncate(data_end)
+
+
+class TrajectoryReader:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.memory_map = np.memmap(path, dtype=np.uint8, mode="r", shape=(os.path.getsize(path),))
+
+        header = self.memory_map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if bytes(header["magic"]) != MAGIC.rstrip(b"\0") or int(header["version"]) != VERSION:
+            raise ValueError(f"{path} is not a gravity simulator recording")
+
+        self.number_of_frames = int(header["frames_written"])
+        data_start = int(header["data_start"])
+        self.index = self.memory_map[HEADER_DTYPE.itemsize:data_start].view(INDEX_DTYPE)[:self.number_of_frames]
+
+    def __len__(self) -> int:
+        return self.number_of_frames
+
+    def frame(self, frame_number: int) -> TrajectoryFrame:
+        if not 0 <= frame_number < self.number_of_frames:
+            raise IndexError(f"Frame {frame_number} is out of range")
+
+        offset, count, step, time = self.index[frame_number].tolist()
+        end = offset + count * len(BODY_FIELDS) * BODY_DTYPE.itemsize
+        bodies = self.memory_map[offset:end].view(BODY_DTYPE).reshape(count, len(BODY_FIELDS))
+        return TrajectoryFrame(step, time, bodies[:, 0:2], bodies[:, 2:4], bodies[:, 4])
+
+    def close(self) -> None:
+        self.index = None
+        self.memory_map = None
@@ -0,0 +1,132 @@
+import argparse
+import sys
+from typing import Callable
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QMainWindow, QSlider
+from PyQt5.QtGui import QPainter, QColor, QPaintEvent, QCloseEvent
+from PyQt5.QtCore import Qt, QTimer
+
+from gui import GuiCreator
+from recording import TrajectoryReader
+
+
+class ReplayWindow(QMainWindow):
+    BLACK = QColor(0, 0, 0)
+    WHITE = QColor(255, 255, 255)
+    FPS = 60
+
+    def __init__(self, min_width: int, min_height: int, reader: TrajectoryReader) -> None:
+        super().__init__()
+        self.min_width = min_width
+        self.min_height = min_height
+        self.reader = reader
+        self.frame_number = 0
+        self.frames_per_tick = 1
+
+        self.setMinimumSize(self.min_width, self.min_height)
+        self.setWindowTitle("Gravsim replay")
+
+        self.pause_button = None
+        self.frame_slider = None
+        self.displayed_frame_info = None
+
+        self.gui_creator = GuiCreator(self)
+        self.create_gui(self.gui_creator)
+        self.update_frame_info_label()
+
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1000 // self.FPS)
+        self.timer.timeout.connect(self.advance_frame)
+        self.timer.start()
+
+    def create_gui(self, gui_creator: GuiCreator) -> None:
+        self.add_buttons(gui_creator.create_button)
+        self.add_sliders(gui_creator.create_slider)
+        self.displayed_frame_info = gui_creator.create_info_label(
+            position=(10, 49),
+            size=(300, 40),
+        )
+
+    def add_buttons(self, create_button: Callable) -> None:
+        self.pause_button = create_button(
+            name="Pause",
+            checkable=True,
+            position=(10, 10),
+            size=(100, 35)
+        )
+
+    def add_sliders(self, create_slider: Callable) -> None:
+        create_slider(
+            position=(120, 10),
+            size=(100, 20),
+            action=self.update_replay_speed
+        )
+        self.frame_slider = create_slider(
+            position=(230, 10),
+            size=(500, 20),
+            action=self.seek,
+            min_value=0,
+            max_value=max(len(self.reader) - 1, 0),
+            start_value=0
+        )
+        self.frame_slider.setTickPosition(QSlider.NoTicks)
+
+    def update_replay_speed(self, value: int = 1) -> None:
+        self.frames_per_tick = value
+
+    def seek(self, frame_number: int) -> None:
+        self.frame_number = frame_number
+        self.update_frame_info_label()
+        self.update()
+
+    def advance_frame(self) -> None:
+        if self.pause_button.isChecked() or not len(self.reader):
+            return
+
+        next_frame_number = min(self.frame_number + self.frames_per_tick, len(self.reader) - 1)
+        if next_frame_number != self.frame_number:
+            self.frame_slider.setValue(next_frame_number)
+
+    def update_frame_info_label(self) -> None:
+        if len(self.reader):
+            frame = self.reader.frame(self.frame_number)
+            frame_info = f"Frame {self.frame_number + 1}/{len(self.reader)}, " \
+                f"step {frame.step}, planets {len(frame.masses)}"
+        else:
+            frame_info = "Empty recording"
+
+        self.displayed_frame_info.setText(frame_info)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.BLACK)
+        if not len(self.reader):
+            return
+
+        frame = self.reader.frame(self.frame_number)
+        radii = np.sqrt(frame.masses).astype(int).tolist()
+
+        painter.setPen(self.WHITE)
+        painter.setBrush(self.WHITE)
+        for (x, y), radius in zip(frame.positions.tolist(), radii):
+            painter.drawEllipse(int(x - radius), int(y - radius), radius * 2, radius * 2)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.timer.stop()
+        event.accept()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded simulation.")
+    parser.add_argument("recording")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    replay_window = ReplayWindow(
+        min_width=1000,
+        min_height=800,
+        reader=TrajectoryReader(args.recording)
+    )
+    replay_window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,221 @@
+from math import tau
+from typing import Tuple
+import numpy as np
+
+from engine import NumpyEngine
+from particle_mesh import ParticleMeshEngine
+
+SCENARIO_NAMES = ("uniform", "disk", "plummer", "binaries", "hierarchical", "collision")
+DIRECT_SUM_LIMIT = 4096
+
+State = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def accelerations_of(positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+    if len(positions) <= DIRECT_SUM_LIMIT:
+        return NumpyEngine().compute_accelerations(positions, masses)
+    return ParticleMeshEngine().compute_accelerations(positions, masses)
+
+
+def perpendicular(vectors: np.ndarray) -> np.ndarray:
+    return np.stack((-vectors[:, 1], vectors[:, 0]), axis=-1)
+
+
+def unit_vectors(angles: np.ndarray) -> np.ndarray:
+    return np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+
+
+def random_masses(rng: np.random.Generator, number_of_bodies: int, min_mass: int, max_mass: int) -> np.ndarray:
+    return rng.integers(min_mass, max_mass + 1, number_of_bodies).astype(np.float64)
+
+
+def disk_positions(rng: np.random.Generator, number_of_bodies: int, radius: float) -> np.ndarray:
+    radii = radius * np.sqrt(rng.random(number_of_bodies))
+    return radii[:, np.newaxis] * unit_vectors(rng.uniform(0.0, tau, number_of_bodies))
+
+
+def body_radii(masses: np.ndarray) -> np.ndarray:
+    return np.floor(np.sqrt(masses))
+
+
+def two_body_speeds(
+        separations: np.ndarray,
+        count_a: int,
+        masses_a: np.ndarray,
+        count_b: int,
+        masses_b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    total_masses = masses_a + masses_b
+    force = count_a * count_b
+    return (
+        np.sqrt(separations * masses_b / total_masses * force / masses_a),
+        np.sqrt(separations * masses_a / total_masses * force / masses_b)
+    )
+
+
+def group_orbits(positions: np.ndarray, masses: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    accelerations = accelerations_of(positions, masses)
+    group_masses = np.bincount(groups, masses)
+
+    offsets = np.empty((len(group_masses), 2))
+    group_accelerations = np.empty((len(group_masses), 2))
+    for axis in range(2):
+        offsets[:, axis] = np.bincount(groups, masses * positions[:, axis]) / group_masses
+        group_accelerations[:, axis] = np.bincount(groups, masses * accelerations[:, axis]) / group_masses
+    offsets -= masses @ positions / masses.sum()
+
+    squared_speeds = np.maximum(-(group_accelerations * offsets).sum(axis=1), 0.0)
+    return offsets, squared_speeds
+
+
+def rotation_velocities(positions: np.ndarray, masses: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    offsets, squared_speeds = group_orbits(positions, masses, groups)
+    distances = np.hypot(offsets[:, 0], offsets[:, 1])
+    scale = np.divide(np.sqrt(squared_speeds), distances, out=np.zeros_like(distances), where=distances > 0.0)
+    return (perpendicular(offsets) * scale[:, np.newaxis])[groups]
+
+
+def uniform(
+        rng: np.random.Generator,
+        number_of_bodies: int,
+        width: int,
+        height: int,
+        min_mass: int,
+        max_mass: int
+) -> State:
+    positions = rng.integers(0, (width + 1, height + 1), (number_of_bodies, 2)).astype(np.float64)
+    masses = random_masses(rng, number_of_bodies, min_mass, max_mass)
+    return positions, np.zeros_like(positions), masses
+
+
+def disk(rng: np.random.Generator, number_of_bodies: int, radius: float, min_mass: int, max_mass: int) -> State:
+    positions = disk_positions(rng, number_of_bodies, radius)
+    masses = random_masses(rng, number_of_bodies, min_mass, max_mass)
+    return positions, rotation_velocities(positions, masses, np.arange(number_of_bodies)), masses
+
+
+def plummer(rng: np.random.Generator, number_of_bodies: int, radius: float, min_mass: int, max_mass: int) -> State:
+    scale_radius = radius / 4
+    fractions = rng.uniform(0.0, 0.99, number_of_bodies)
+    radii = scale_radius * np.sqrt(fractions / (1.0 - fractions))
+    positions = radii[:, np.newaxis] * unit_vectors(rng.uniform(0.0, tau, number_of_bodies))
+    masses = random_masses(rng, number_of_bodies, min_mass, max_mass)
+
+    _, squared_speeds = group_orbits(positions, masses, np.arange(number_of_bodies))
+    velocities = rng.normal(size=(number_of_bodies, 2)) * np.sqrt(squared_speeds / 2)[:, np.newaxis]
+    return positions, velocities, masses
+
+
+def binaries(rng: np.random.Generator, number_of_bodies: int, radius: float, min_mass: int, max_mass: int) -> State:
+    number_of_pairs = number_of_bodies // 2
+    pair_masses = random_masses(rng, number_of_pairs, min_mass, max_mass)
+    separations = 2 * body_radii(pair_masses) * rng.uniform(1.5, 3.0, number_of_pairs)
+    directions = unit_vectors(rng.uniform(0.0, tau, number_of_pairs))
+    offsets = directions * (separations / 2)[:, np.newaxis]
+    centers = disk_positions(rng, number_of_pairs, radius)
+
+    speeds, _ = two_body_speeds(separations, 1, pair_masses, 1, pair_masses)
+    orbits = perpendicular(directions) * speeds[:, np.newaxis]
+
+    single_count = number_of_bodies - 2 * number_of_pairs
+    positions = np.concatenate((
+        np.stack((centers - offsets, centers + offsets), axis=1).reshape(-1, 2),
+        disk_positions(rng, single_count, radius)
+    ))
+    velocities = np.concatenate((np.stack((-orbits, orbits), axis=1).reshape(-1, 2), np.zeros((single_count, 2))))
+    masses = np.concatenate((np.repeat(pair_masses, 2), random_masses(rng, single_count, min_mass, max_mass)))
+    groups = np.concatenate((np.repeat(np.arange(number_of_pairs), 2), number_of_pairs + np.arange(single_count)))
+
+    velocities += rotation_velocities(positions, masses, groups)
+    return positions, velocities, masses
+
+
+def hierarchical(rng: np.random.Generator, number_of_bodies: int, radius: float, min_mass: int, max_mass: int) -> State:
+    number_of_triples = number_of_bodies // 3
+    triple_masses = random_masses(rng, number_of_triples, min_mass, max_mass)
+    inner_separations = 2 * body_radii(triple_masses) * rng.uniform(1.5, 2.5, number_of_triples)
+    outer_separations = inner_separations * rng.uniform(4.0, 8.0, number_of_triples)
+    inner_directions = unit_vectors(rng.uniform(0.0, tau, number_of_triples))
+    outer_directions = unit_vectors(rng.uniform(0.0, tau, number_of_triples))
+    centers = disk_positions(rng, number_of_triples, radius)
+
+    inner_offsets = inner_directions * (inner_separations / 2)[:, np.newaxis]
+    binary_centers = centers - outer_directions * (outer_separations / 3)[:, np.newaxis]
+    third_positions = centers + outer_directions * (2 * outer_separations / 3)[:, np.newaxis]
+
+    inner_speeds, _ = two_body_speeds(inner_separations, 1, triple_masses, 1, triple_masses)
+    binary_speeds, third_speeds = two_body_speeds(outer_separations, 2, 2 * triple_masses, 1, triple_masses)
+    inner_orbits = perpendicular(inner_directions) * inner_speeds[:, np.newaxis]
+    binary_orbits = perpendicular(outer_directions) * -binary_speeds[:, np.newaxis]
+    third_orbits = perpendicular(outer_directions) * third_speeds[:, np.newaxis]
+
+    single_count = number_of_bodies - 3 * number_of_triples
+    positions = np.concatenate((
+        np.stack((binary_centers - inner_offsets, binary_centers + inner_offsets, third_positions), axis=1).reshape(-1, 2),
+        disk_positions(rng, single_count, radius)
+    ))
+    velocities = np.concatenate((
+        np.stack((binary_orbits - inner_orbits, binary_orbits + inner_orbits, third_orbits), axis=1).reshape(-1, 2),
+        np.zeros((single_count, 2))
+    ))
+    masses = np.concatenate((np.repeat(triple_masses, 3), random_masses(rng, single_count, min_mass, max_mass)))
+    groups = np.concatenate((np.repeat(np.arange(number_of_triples), 3), number_of_triples + np.arange(single_count)))
+
+    velocities += rotation_velocities(positions, masses, groups)
+    return positions, velocities, masses
+
+
+def collision(rng: np.random.Generator, number_of_bodies: int, radius: float, min_mass: int, max_mass: int) -> State:
+    if number_of_bodies < 2:
+        return plummer(rng, number_of_bodies, radius / 2, min_mass, max_mass)
+
+    first_count = number_of_bodies // 2
+    second_count = number_of_bodies - first_count
+    first = plummer(rng, first_count, radius / 2, min_mass, max_mass)
+    second = plummer(rng, second_count, radius / 2, min_mass, max_mass)
+
+    separation = np.array([1.6 * radius])
+    first_speed, second_speed = two_body_speeds(
+        separation, first_count, np.array([first[2].sum()]), second_count, np.array([second[2].sum()])
+    )
+    first[0][:] += (-0.8 * radius, -0.15 * radius)
+    second[0][:] += (0.8 * radius, 0.15 * radius)
+    first[1][:] += (0.0, -0.3 * first_speed[0])
+    second[1][:] += (0.0, 0.3 * second_speed[0])
+
+    positions, velocities, masses = (np.concatenate(arrays) for arrays in zip(first, second))
+    return positions, velocities, masses
+
+
+def generate_scenario(
+        name: str,
+        number_of_bodies: int,
+        width: int,
+        height: int,
+        min_mass: int,
+        max_mass: int,
+        rng: np.random.Generator
+) -> State:
+    radius = 0.4 * min(width, height)
+    if not number_of_bodies and name in SCENARIO_NAMES:
+        return np.empty((0, 2)), np.empty((0, 2)), np.empty(0)
+
+    match name:
+        case "uniform":
+            return uniform(rng, number_of_bodies, width, height, min_mass, max_mass)
+        case "disk":
+            positions, velocities, masses = disk(rng, number_of_bodies, radius, min_mass, max_mass)
+        case "plummer":
+            positions, velocities, masses = plummer(rng, number_of_bodies, radius, min_mass, max_mass)
+        case "binaries":
+            positions, velocities, masses = binaries(rng, number_of_bodies, radius, min_mass, max_mass)
+        case "hierarchical":
+            positions, velocities, masses = hierarchical(rng, number_of_bodies, radius, min_mass, max_mass)
+        case "collision":
+            positions, velocities, masses = collision(rng, number_of_bodies, radius, min_mass, max_mass)
+        case _:
+            raise ValueError(f"Unknown scenario: {name}")
+
+    positions += (width / 2, height / 2)
+    velocities -= masses @ velocities / masses.sum()
+    return positions, velocities, masses
@@ -0,0 +1,399 @@
+import threading
+from typing import Dict, List, Tuple
+from random import Random
+from math import sqrt
+import numpy as np
+
+from planet import Planet
+from bodies import BodyStore
+from engine import PhysicsEngine, ArrayEngine, create_engine, total_energy
+from aggregates import AggregateTracker
+from recording import TrajectoryRecorder
+from checkpoint import Checkpoint, BODY_DTYPE, write_checkpoint, read_checkpoint
+from spatial_index import SpatialHash
+from collisions import find_collisions, collision_groups
+from profiler import FrameProfiler
+from scenarios import generate_scenario
+from tracer import restore_tracers
+
+
+class Simulation:
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            starting_number_of_planets: int,
+            max_number_of_planets: int,
+            min_planet_mass: int,
+            max_planet_mass: int,
+            max_tracer_positions: int,
+            engine: PhysicsEngine | None = None,
+            dt: float = 1.0,
+            substeps: int = 1,
+            seed: int | None = None,
+            scenario: str = "uniform"
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.starting_number_of_planets = starting_number_of_planets
+        self.max_number_of_planets = max_number_of_planets
+        self.min_planet_mass = min_planet_mass
+        self.max_planet_mass = max_planet_mass
+        self.max_tracer_positions = max_tracer_positions
+        self.engine = engine or create_engine("numpy")
+        self.dt = dt
+        self.substeps = substeps
+        self.random = Random(seed)
+        self.scenario = scenario
+
+        self.planets = BodyStore(max(max_number_of_planets, 1), max_tracer_positions)
+        self.tracers_enabled = False
+        self.tracer_interval = 1
+        self.generation = 0
+        self.collisions_enabled = False
+        self.steps = 0
+        self.time = 0.0
+        self.energy_reference: Tuple[float, float] | None = None
+        self.aggregates = AggregateTracker()
+        self.recorder: TrajectoryRecorder | None = None
+        self.profiler = FrameProfiler()
+
+        self.index = SpatialHash(cell_size=max(2 * int(sqrt(self.max_planet_mass)), 1))
+        self.index_lock = threading.RLock()
+        self.index_outdated = False
+        self.reset_planets()
+
+    def resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+
+    def step(self, frozen_planet: Planet | None = None) -> None:
+        profiler = self.profiler
+        substep_dt = self.dt / self.substeps
+        with profiler.section("physics"):
+            for _ in range(self.substeps):
+                self.engine.step(self.planets, frozen_planet, substep_dt)
+
+        if self.collisions_enabled:
+            with profiler.section("collisions"):
+                self.merge_colliding_planets(frozen_planet)
+
+        if self.tracers_enabled and self.steps % self.tracer_interval == 0:
+            with profiler.section("tracers"):
+                tracers = self.planets.tracers
+                for index, (x, y) in enumerate(self.planets.state()[0].tolist()):
+                    (tracers[index] or self.planets.tracer_at(index)).append(x, y)
+
+        self.steps += 1
+        self.time += self.dt
+        self.index_outdated = True
+
+        with profiler.section("bookkeeping"):
+            state = self.state_arrays()
+            self.aggregates.update_from_arrays(*state)
+            if self.recorder:
+                self.recorder.record(self.steps, self.time, *state)
+
+    def apply_quality(self, settings: Dict[str, float | bool]) -> None:
+        for name, value in settings.items():
+            match name:
+                case "substeps":
+                    if value != self.substeps and isinstance(self.engine, ArrayEngine):
+                        self.engine.integrator.reset()
+                    self.substeps = value
+                case "tracer_interval":
+                    self.tracer_interval = value
+                case "theta":
+                    self.engine.theta = value
+                case "p3m":
+                    self.engine.short_range_correction = value
+                case "grid_size":
+                    self.engine.grid_size = value
+
+    def start_recording(self, path: str, record_every: int = 1) -> None:
+        self.stop_recording()
+        self.recorder = TrajectoryRecorder(path, record_every=record_every)
+        self.recorder.record(self.steps, self.time, *self.state_arrays())
+
+    def stop_recording(self) -> None:
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def close(self) -> None:
+        self.stop_recording()
+        self.engine.close()
+
+    def create_checkpoint(self, selected_planet: Planet | None = None, paused: bool = False) -> Checkpoint:
+        positions, velocities, masses = self.state_arrays()
+        bodies = np.zeros(len(self.planets), dtype=BODY_DTYPE)
+        bodies["x"], bodies["y"] = positions.T
+        bodies["x_velocity"], bodies["y_velocity"] = velocities.T
+        bodies["mass"] = masses
+
+        tracer_points = []
+        for body, tracer in zip(bodies, self.planets.tracers):
+            if tracer:
+                body["tracer_x_offset"] = tracer.x_offset
+                body["tracer_y_offset"] = tracer.y_offset
+                body["tracer_count"] = len(tracer)
+                tracer_points.append(tracer.stored_points())
+
+        return Checkpoint(
+            bodies=bodies,
+            tracer_points=np.concatenate(tracer_points) if tracer_points else np.empty((0, 2)),
+            tracer_capacity=self.max_tracer_positions,
+            tracers_enabled=self.tracers_enabled,
+            collisions_enabled=self.collisions_enabled,
+            paused=paused,
+            selected_index=self.planets.index(selected_planet) if selected_planet in self.planets else None,
+            steps=self.steps,
+            time=self.time,
+            random_state=self.random.getstate()
+        )
+
+    def restore_checkpoint(self, checkpoint: Checkpoint) -> Tuple[Planet | None, bool]:
+        bodies = checkpoint.bodies
+
+        with self.index_lock:
+            self.planets.clear()
+            self.index.clear()
+            self.planets.extend(
+                np.column_stack((bodies["x"], bodies["y"])),
+                np.column_stack((bodies["x_velocity"], bodies["y_velocity"])),
+                bodies["mass"],
+                checkpoint.tracers_enabled
+            )
+
+            self.planets.tracers[:] = restore_tracers(
+                self.planets.max_tracer_positions,
+                checkpoint.tracer_points,
+                bodies["tracer_count"],
+                bodies["tracer_x_offset"],
+                bodies["tracer_y_offset"]
+            )
+            self.index_outdated = True
+
+        self.tracers_enabled = checkpoint.tracers_enabled
+        self.collisions_enabled = checkpoint.collisions_enabled
+        self.steps = checkpoint.steps
+        self.time = checkpoint.time
+        self.random.setstate(checkpoint.random_state)
+        self.generation += 1
+
+        self.aggregates.clear()
+        self.aggregates.update_from_arrays(
+            np.column_stack((bodies["x"], bodies["y"])),
+            np.column_stack((bodies["x_velocity"], bodies["y_velocity"])),
+            bodies["mass"]
+        )
+        self.reset_energy_reference()
+        if isinstance(self.engine, ArrayEngine):
+            self.engine.integrator.reset()
+
+        selected_index = checkpoint.selected_index
+        if selected_index is not None and selected_index < len(self.planets):
+            return self.planets[selected_index], checkpoint.paused
+        return None, checkpoint.paused
+
+    def save_checkpoint(self, path: str, selected_planet: Planet | None = None, paused: bool = False) -> None:
+        write_checkpoint(path, self.create_checkpoint(selected_planet, paused))
+
+    def load_checkpoint(self, path: str) -> Tuple[Planet | None, bool]:
+        return self.restore_checkpoint(read_checkpoint(path))
+
+    def run(self, number_of_steps: int, frozen_planet: Planet | None = None) -> None:
+        for _ in range(number_of_steps):
+            self.step(frozen_planet)
+
+    def create_planets(self, number_of_planets_to_create: int = 1) -> bool:
+        if len(self.planets) + number_of_planets_to_create <= self.max_number_of_planets:
+            with self.index_lock:
+                for _ in range(number_of_planets_to_create):
+                    x = self.random.randint(0, self.width)
+                    y = self.random.randint(0, self.height)
+                    mass = self.random.randint(self.min_planet_mass, self.max_planet_mass)
+                    self.planets.add(x, y, mass, tracer_enabled=self.tracers_enabled)
+                    self.aggregates.add(mass, x, y)
+                self.index_outdated = True
+
+            self.reset_energy_reference()
+            return True
+        return False
+
+    def spawn_planet(self) -> Planet | None:
+        if self.create_planets():
+            return self.planets[-1]
+        return None
+
+    def reset_planets(self, scenario: str | None = None) -> None:
+        if scenario:
+            self.scenario = scenario
+
+        positions, velocities, masses = generate_scenario(
+            self.scenario,
+            min(self.starting_number_of_planets, self.max_number_of_planets),
+            self.width,
+            self.height,
+            self.min_planet_mass,
+            self.max_planet_mass,
+            np.random.default_rng(self.random.getrandbits(64))
+        )
+        with self.index_lock:
+            self.planets.clear()
+            self.index.clear()
+            self.planets.extend(positions, velocities, masses, self.tracers_enabled)
+            self.index_outdated = True
+        self.generation += 1
+
+        self.aggregates.clear()
+        self.aggregates.update_from_arrays(*self.state_arrays())
+        self.reset_energy_reference()
+        if isinstance(self.engine, ArrayEngine):
+            self.engine.integrator.reset()
+
+    def remove_planet(self, planet: Planet | None = None) -> bool:
+        if self.planets:
+            with self.index_lock:
+                planet = planet or self.planets.oldest()
+                if not self.planets.remove(planet):
+                    return False
+                self.index_outdated = True
+            self.aggregates.remove(planet.mass, planet.x, planet.y, planet.x_velocity, planet.y_velocity)
+            self.reset_energy_reference()
+            return True
+        return False
+
+    def set_tracers_enabled(self, tracers_enabled: bool) -> None:
+        self.tracers_enabled = tracers_enabled
+        self.planets.tracer_enabled[:len(self.planets)] = tracers_enabled
+        self.generation += 1
+        if not tracers_enabled:
+            for tracer in self.planets.tracers:
+                if tracer:
+                    tracer.clear()
+
+    def set_collisions_enabled(self, collisions_enabled: bool) -> None:
+        self.collisions_enabled = collisions_enabled
+
+    def merge_colliding_planets(self, frozen_planet: Planet | None = None) -> int:
+        positions, velocities, masses = self.state_arrays()
+        collisions = find_collisions(positions, self.planets.radii[:len(self.planets)])
+        if not len(collisions):
+            return 0
+
+        merged_planets = set()
+        with self.index_lock:
+            for group in collision_groups(collisions):
+                members = [self.planets[i] for i in group]
+                group_masses = masses[group]
+                total_mass = float(group_masses.sum())
+
+                if frozen_planet in members:
+                    survivor = frozen_planet
+                else:
+                    survivor = members[int(group_masses.argmax())]
+                    if total_mass:
+                        survivor.x, survivor.y = (group_masses @ positions[group] / total_mass).tolist()
+                        survivor.x_velocity, survivor.y_velocity = (
+                            group_masses @ velocities[group] / total_mass
+                        ).tolist()
+                survivor.set_mass(int(total_mass) if total_mass.is_integer() else total_mass)
+                merged_planets.update(planet for planet in members if planet is not survivor)
+
+            for planet in merged_planets:
+                self.planets.remove(planet)
+            self.index_outdated = True
+
+        self.reset_energy_reference()
+        return len(merged_planets)
+
+    def move_planet(self, planet: Planet, x: float | None = None, y: float | None = None) -> bool:
+        if planet not in self.planets:
+            return False
+
+        self.aggregates.move(
+            planet.mass, planet.x, planet.y,
+            planet.x if x is None else x, planet.y if y is None else y
+        )
+        if x is not None:
+            planet.x = x
+        if y is not None:
+            planet.y = y
+        self.index_outdated = True
+        self.reset_energy_reference()
+        return True
+
+    def set_planet_mass(self, planet: Planet, mass: int) -> bool:
+        if planet in self.planets and self.min_planet_mass <= mass <= self.max_planet_mass:
+            self.aggregates.change_mass(planet.mass, mass, planet.x, planet.y, planet.x_velocity, planet.y_velocity)
+            planet.set_mass(mass)
+            self.index_outdated = True
+            self.reset_energy_reference()
+            return True
+        return False
+
+    def refresh_index(self) -> None:
+        self.index.rebuild(self.state_arrays()[0], self.planets.radii[:len(self.planets)])
+        self.index_outdated = False
+
+    def find_planet_at(self, x: float, y: float) -> Planet | None:
+        with self.index_lock:
+            if self.index_outdated:
+                self.refresh_index()
+            index = self.index.query_point(x, y)
+            return None if index is None else self.planets[index]
+
+    def planets_within(self, x: float, y: float, radius: float) -> List[Planet]:
+        with self.index_lock:
+            if self.index_outdated:
+                self.refresh_index()
+            return [self.planets[index] for index in self.index.query_radius(x, y, radius)]
+
+    def center_planets(self, x: float, y: float) -> None:
+        if not self.planets:
+            return
+
+        center_of_mass_x, center_of_mass_y = self.calculate_center_of_mass()
+        difference = {
+            "x": x - center_of_mass_x,
+            "y": y - center_of_mass_y,
+        }
+
+        positions = self.state_arrays()[0]
+        positions += (difference["x"], difference["y"])
+        for tracer, tracer_enabled in zip(self.planets.tracers, self.planets.tracer_enabled.tolist()):
+            if tracer_enabled and tracer is not None:
+                tracer.shift(difference["x"], difference["y"])
+        self.aggregates.shift(difference["x"], difference["y"])
+        self.index_outdated = True
+        self.generation += 1
+
+    def state_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.planets.state()
+
+    def total_energy(self) -> float:
+        return total_energy(*self.state_arrays())
+
+    def momentum_drift(self) -> float:
+        return self.aggregates.momentum_drift()
+
+    def reset_energy_reference(self) -> None:
+        self.energy_reference = None
+
+    def energy_drift_rate(self) -> float:
+        energy = self.total_energy()
+        if self.energy_reference is None:
+            self.energy_reference = self.time, energy
+            return 0.0
+
+        reference_time, reference_energy = self.energy_reference
+        if self.time == reference_time or not reference_energy:
+            return 0.0
+        return (energy - reference_energy) / abs(reference_energy) / (self.time - reference_time)
+
+    def calculate_center_of_mass(self) -> Tuple[int, int] | None:
+        center_of_mass = self.aggregates.center_of_mass()
+        if center_of_mass:
+            return int(center_of_mass[0]), int(center_of_mass[1])
+        return None
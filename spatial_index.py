@@ -0,0 +1,65 @@
+from math import floor, ceil
+from typing import List, Tuple
+import numpy as np
+
+Cell = Tuple[int, int]
+
+
+def cell_keys(cells: np.ndarray) -> np.ndarray:
+    return (cells[..., 0] << 32) | (cells[..., 1] & 0xFFFFFFFF)
+
+
+class SpatialHash:
+    def __init__(self, cell_size: float = 64.0) -> None:
+        self.cell_size = cell_size
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def clear(self) -> None:
+        self.order = np.empty(0, dtype=np.int64)
+        self.sorted_keys = np.empty(0, dtype=np.int64)
+        self.positions = np.empty((0, 2))
+        self.radii = np.empty(0)
+        self.max_radius = 0.0
+
+    def rebuild(self, positions: np.ndarray, radii: np.ndarray) -> None:
+        keys = cell_keys(np.floor(positions / self.cell_size).astype(np.int64))
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.positions = positions.copy()
+        self.radii = radii.copy()
+        self.max_radius = float(radii.max(initial=0.0))
+
+    def rows_near(self, x: float, y: float, reach: float) -> np.ndarray:
+        cell_x, cell_y = self.cell_of(x, y)
+        cell_reach = ceil(reach / self.cell_size)
+        neighbours = np.arange(-cell_reach, cell_reach + 1)
+        cells = np.stack(np.meshgrid(cell_x + neighbours, cell_y + neighbours, indexing="ij"), axis=-1)
+        keys = cell_keys(cells.reshape(-1, 2))
+
+        starts = np.searchsorted(self.sorted_keys, keys, side="left")
+        stops = np.searchsorted(self.sorted_keys, keys, side="right")
+        occupied = stops > starts
+        if not occupied.any():
+            return np.empty(0, dtype=np.int64)
+        return self.order[np.concatenate([
+            np.arange(start, stop) for start, stop in zip(starts[occupied].tolist(), stops[occupied].tolist())
+        ])]
+
+    def query_point(self, x: float, y: float) -> int | None:
+        rows = self.rows_near(x, y, self.max_radius)
+        distances_squared = ((self.positions[rows] - (x, y)) ** 2).sum(axis=1)
+        hits = np.flatnonzero(distances_squared <= self.radii[rows] ** 2)
+        if not len(hits):
+            return None
+        return int(rows[hits[distances_squared[hits].argmin()]])
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[int]:
+        rows = self.rows_near(x, y, radius)
+        distances_squared = ((self.positions[rows] - (x, y)) ** 2).sum(axis=1)
+        return rows[distances_squared <= radius ** 2].tolist()
@@ -0,0 +1,406 @@
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import socket
+import threading
+from typing import Callable, Iterator, List, NamedTuple, Set, Tuple
+import numpy as np
+
+from planet import Planet
+from worker import SimulationSnapshot, SimulationWorker
+
+KEYFRAME = 1
+DELTA = 2
+REPLY = 3
+
+MESSAGE_HEADER_DTYPE = np.dtype([
+    ("kind", "u1"),
+    ("size", "<u4")
+])
+FRAME_HEADER_DTYPE = np.dtype([
+    ("steps", "<u8"),
+    ("number_of_bodies", "<u4"),
+    ("center_of_mass", "<f8", (2,))
+])
+ID_DTYPE = np.dtype("<i8")
+POSITION_DTYPE = np.dtype("<f8")
+DELTA_DTYPE = np.dtype("<i2")
+DELTA_RESOLUTION = 1 / 256
+MAX_DELTA = np.iinfo(DELTA_DTYPE).max
+POSITION_LIMIT = 100_000
+DEFAULT_HOST = "127.0.0.1"
+
+Address = str | Tuple[str, int]
+
+
+class TelemetryFrame(NamedTuple):
+    steps: int
+    ids: np.ndarray
+    positions: np.ndarray
+    center_of_mass: Tuple[float, float] | None
+    keyframe: bool
+
+
+class TelemetryReply(NamedTuple):
+    ok: bool
+    command: str
+
+
+def parse_address(text: str) -> Address:
+    if text.isdigit():
+        return DEFAULT_HOST, int(text)
+    return text
+
+
+def encode_message(kind: int, *parts: bytes) -> bytes:
+    header = np.zeros((), dtype=MESSAGE_HEADER_DTYPE)
+    header["kind"] = kind
+    header["size"] = sum(len(part) for part in parts)
+    return b"".join((header.tobytes(), *parts))
+
+
+def encode_frame_header(snapshot: SimulationSnapshot) -> bytes:
+    header = np.zeros((), dtype=FRAME_HEADER_DTYPE)
+    header["steps"] = snapshot.steps
+    header["number_of_bodies"] = len(snapshot.ids)
+    header["center_of_mass"] = snapshot.center_of_mass or (np.nan, np.nan)
+    return header.tobytes()
+
+
+class Subscriber:
+    def __init__(self, writer: asyncio.StreamWriter, max_rate: float) -> None:
+        self.writer = writer
+        self.interval = 1 / max_rate
+        self.snapshot: SimulationSnapshot | None = None
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.ids: np.ndarray | None = None
+        self.positions: np.ndarray | None = None
+
+    def offer(self, snapshot: SimulationSnapshot) -> None:
+        if self.snapshot is not None:
+            self.dropped += 1
+        self.snapshot = snapshot
+        self.ready.set()
+
+    def take(self) -> SimulationSnapshot | None:
+        snapshot, self.snapshot = self.snapshot, None
+        return snapshot
+
+    def set_rate(self, max_rate: float) -> bool:
+        if max_rate > 0:
+            self.interval = 1 / max_rate
+            return True
+        return False
+
+    def encode(self, snapshot: SimulationSnapshot) -> bytes:
+        frame_header = encode_frame_header(snapshot)
+        if self.ids is not None and np.array_equal(self.ids, snapshot.ids):
+            steps = np.rint((snapshot.positions - self.positions) / DELTA_RESOLUTION)
+            if np.abs(steps).max(initial=0.0) <= MAX_DELTA:
+                deltas = steps.astype(DELTA_DTYPE)
+                self.positions += deltas * DELTA_RESOLUTION
+                return encode_message(DELTA, frame_header, deltas.tobytes())
+
+        self.ids = snapshot.ids
+        self.positions = snapshot.positions.astype(POSITION_DTYPE)
+        return encode_message(KEYFRAME, frame_header, self.ids.astype(ID_DTYPE).tobytes(), self.positions.tobytes())
+
+    def reply(self, ok: bool, command: str) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(REPLY, bytes((ok,)), command.encode()))
+
+
+class TelemetryServer:
+    def __init__(
+            self,
+            address: Address,
+            worker: SimulationWorker,
+            max_rate: float = 30
+    ) -> None:
+        self.address = address
+        self.worker = worker
+        self.simulation = worker.simulation
+        self.max_rate = max_rate
+
+        self.subscribers: Set[Subscriber] = set()
+        self.latest_snapshot: SimulationSnapshot | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.server: asyncio.AbstractServer | None = None
+        self.thread = None
+
+    def start(self) -> None:
+        if self.loop:
+            return
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.server = loop.run_until_complete(self.open())
+        except OSError:
+            loop.close()
+            raise
+
+        self.loop = loop
+        self.latest_snapshot = self.worker.snapshot
+        self.worker.snapshot_listeners.append(self.publish)
+        self.thread = threading.Thread(target=loop.run_forever, name="telemetry-server", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if not self.loop:
+            return
+
+        with contextlib.suppress(ValueError):
+            self.worker.snapshot_listeners.remove(self.publish)
+        asyncio.run_coroutine_threadsafe(self.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = self.server = self.thread = None
+
+        if isinstance(self.address, str):
+            with contextlib.suppress(OSError):
+                os.unlink(self.address)
+
+    async def open(self) -> asyncio.AbstractServer:
+        if isinstance(self.address, str):
+            return await asyncio.start_unix_server(self.handle_client, self.address)
+        return await asyncio.start_server(self.handle_client, *self.address)
+
+    async def close(self) -> None:
+        self.server.close()
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        await self.server.wait_closed()
+
+    def publish(self, snapshot: SimulationSnapshot) -> None:
+        self.latest_snapshot = snapshot
+        if self.subscribers:
+            with contextlib.suppress(RuntimeError):
+                self.loop.call_soon_threadsafe(self.distribute, snapshot)
+
+    def distribute(self, snapshot: SimulationSnapshot) -> None:
+        for subscriber in self.subscribers:
+            subscriber.offer(snapshot)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscriber = Subscriber(writer, self.max_rate)
+        self.subscribers.add(subscriber)
+        subscriber.offer(self.latest_snapshot)
+        sender = asyncio.create_task(self.send_snapshots(subscriber))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    subscriber.reply(False, "line too long")
+                    continue
+                if not line:
+                    break
+                self.handle_command(subscriber, line.decode(errors="replace").strip())
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            sender.cancel()
+            writer.close()
+
+    async def send_snapshots(self, subscriber: Subscriber) -> None:
+        with contextlib.suppress(ConnectionError):
+            while True:
+                await subscriber.ready.wait()
+                subscriber.ready.clear()
+                snapshot = subscriber.take()
+                if snapshot is not None:
+                    subscriber.writer.write(subscriber.encode(snapshot))
+                    await subscriber.writer.drain()
+                    await asyncio.sleep(subscriber.interval)
+
+    def handle_command(self, subscriber: Subscriber, line: str) -> None:
+        if not line:
+            return
+
+        with contextlib.suppress(ValueError):
+            match line.split():
+                case ["spawn"]:
+                    self.submit(subscriber, line, self.spawn_planet)
+                    return
+                case ["remove"]:
+                    self.submit(subscriber, line, self.remove_planet, None)
+                    return
+                case ["remove", body_id]:
+                    self.submit(subscriber, line, self.remove_planet, int(body_id))
+                    return
+                case ["edit", body_id, *properties] if properties:
+                    values = dict(parse_property(text) for text in properties)
+                    self.submit(
+                        subscriber, line, self.edit_planet,
+                        int(body_id), values.get("x"), values.get("y"), values.get("mass")
+                    )
+                    return
+                case ["rate", max_rate]:
+                    subscriber.reply(subscriber.set_rate(parse_number(max_rate)), line)
+                    return
+        subscriber.reply(False, line)
+
+    def submit(self, subscriber: Subscriber, line: str, command: Callable[..., bool], *args) -> None:
+        self.worker.submit(self.run_command, subscriber, line, command, *args)
+
+    def run_command(self, subscriber: Subscriber, line: str, command: Callable[..., bool], *args) -> None:
+        try:
+            ok = command(*args)
+        except Exception:
+            ok = False
+        with contextlib.suppress(RuntimeError):
+            self.loop.call_soon_threadsafe(subscriber.reply, ok, line)
+
+    def find_planet(self, body_id: int | None) -> Planet | None:
+        if body_id is None:
+            return self.simulation.planets.oldest()
+        return self.simulation.planets.find(body_id)
+
+    def spawn_planet(self) -> bool:
+        if len(self.simulation.planets) < self.simulation.max_number_of_planets:
+            return self.simulation.spawn_planet() is not None
+        return False
+
+    def remove_planet(self, body_id: int | None) -> bool:
+        planet = self.find_planet(body_id)
+        if not planet:
+            return False
+
+        if planet is self.worker.frozen_planet:
+            self.worker.frozen_planet = None
+        return self.simulation.remove_planet(planet)
+
+    def edit_planet(self, body_id: int, x: float | None, y: float | None, mass: float | None) -> bool:
+        planet = self.find_planet(body_id)
+        if not planet:
+            return False
+
+        if any(value is not None and not -POSITION_LIMIT <= value <= POSITION_LIMIT for value in (x, y)):
+            return False
+        if mass is not None and (
+                not self.simulation.min_planet_mass <= mass <= self.simulation.max_planet_mass or mass != int(mass)
+        ):
+            return False
+
+        if x is not None or y is not None:
+            self.simulation.move_planet(planet, x, y)
+        if mass is not None:
+            self.simulation.set_planet_mass(planet, int(mass))
+        return True
+
+
+def parse_property(text: str) -> Tuple[str, float]:
+    name, separator, value = text.partition("=")
+    if not separator or name not in ("x", "y", "mass"):
+        raise ValueError(f"Unknown property: {text}")
+    return name, parse_number(value)
+
+
+def parse_number(text: str) -> float:
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"Not a finite number: {text}")
+    return value
+
+
+def connect(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    connection.connect(address)
+    return connection
+
+
+def read_exactly(connection: socket.socket, size: int) -> bytes | None:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def read_messages(connection: socket.socket) -> Iterator[Tuple[int, bytes]]:
+    while header_data := read_exactly(connection, MESSAGE_HEADER_DTYPE.itemsize):
+        header = np.frombuffer(header_data, dtype=MESSAGE_HEADER_DTYPE)[0]
+        payload = read_exactly(connection, int(header["size"]))
+        if payload is None:
+            return
+        yield int(header["kind"]), payload
+
+
+class TelemetryDecoder:
+    def __init__(self) -> None:
+        self.ids: np.ndarray | None = None
+        self.positions: np.ndarray | None = None
+
+    def decode(self, kind: int, payload: bytes) -> TelemetryFrame | TelemetryReply:
+        if kind == REPLY:
+            return TelemetryReply(bool(payload[0]), payload[1:].decode())
+
+        header = np.frombuffer(payload, dtype=FRAME_HEADER_DTYPE, count=1)[0]
+        number_of_bodies = int(header["number_of_bodies"])
+        offset = FRAME_HEADER_DTYPE.itemsize
+
+        if kind == KEYFRAME:
+            self.ids = np.frombuffer(payload, dtype=ID_DTYPE, count=number_of_bodies, offset=offset)
+            offset += self.ids.nbytes
+            self.positions = np.frombuffer(
+                payload, dtype=POSITION_DTYPE, count=2 * number_of_bodies, offset=offset
+            ).reshape(-1, 2).copy()
+        elif kind == DELTA:
+            if self.positions is None or len(self.positions) != number_of_bodies:
+                raise ValueError("Delta frame without a matching keyframe")
+            deltas = np.frombuffer(payload, dtype=DELTA_DTYPE, count=2 * number_of_bodies, offset=offset)
+            self.positions += deltas.reshape(-1, 2) * DELTA_RESOLUTION
+        else:
+            raise ValueError(f"Unknown message kind: {kind}")
+
+        center_of_mass = tuple(header["center_of_mass"].tolist())
+        return TelemetryFrame(
+            steps=int(header["steps"]),
+            ids=self.ids,
+            positions=self.positions.copy(),
+            center_of_mass=None if np.isnan(center_of_mass[0]) else center_of_mass,
+            keyframe=kind == KEYFRAME
+        )
+
+
+def watch(address: Address, number_of_frames: int, commands: List[str]) -> None:
+    decoder = TelemetryDecoder()
+    with connect(address) as connection:
+        for command in commands:
+            connection.sendall(f"{command}\n".encode())
+
+        received_frames = 0
+        for kind, payload in read_messages(connection):
+            message = decoder.decode(kind, payload)
+            if isinstance(message, TelemetryReply):
+                print(f"{'ok' if message.ok else 'failed'}: {message.command}")
+                continue
+
+            print(
+                f"step={message.steps} planets={len(message.ids)} "
+                f"center of mass={message.center_of_mass} "
+                f"{'keyframe' if message.keyframe else 'delta'} {len(payload)} bytes"
+            )
+            received_frames += 1
+            if received_frames >= number_of_frames:
+                break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a running simulation through its telemetry server.")
+    parser.add_argument("address", help="port on localhost or path of a Unix socket")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--command", action="append", default=[])
+    args = parser.parse_args()
+    watch(parse_address(args.address), args.frames, args.command)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from aggregates import AggregateTracker
+from simulation import Simulation
+
+
+def create_simulation() -> Simulation:
+    return Simulation(1000, 800, 30, 60, 50, 1000, 50, seed=3)
+
+
+def recomputed(simulation: Simulation) -> AggregateTracker:
+    aggregates = AggregateTracker()
+    aggregates.update_from_arrays(*simulation.state_arrays())
+    return aggregates
+
+
+def assert_aggregates_match(simulation: Simulation) -> None:
+    expected = recomputed(simulation)
+    aggregates = simulation.aggregates
+    assert aggregates.count == expected.count
+    assert aggregates.total_mass == pytest.approx(expected.total_mass)
+    assert aggregates.center_of_mass() == pytest.approx(expected.center_of_mass())
+    assert (aggregates.momentum_x, aggregates.momentum_y) == pytest.approx(
+        (expected.momentum_x, expected.momentum_y), abs=1e-6
+    )
+    assert aggregates.kinetic_energy == pytest.approx(expected.kinetic_energy, abs=1e-6)
+
+
+def test_incremental_edits_match_recomputation() -> None:
+    simulation = create_simulation()
+    rng = np.random.default_rng(0)
+
+    for _ in range(200):
+        planet = simulation.planets[int(rng.integers(len(simulation.planets)))]
+        match int(rng.integers(5)):
+            case 0:
+                simulation.create_planets(int(rng.integers(1, 4)))
+            case 1:
+                simulation.remove_planet(planet)
+            case 2:
+                simulation.move_planet(planet, *rng.uniform(0, 1000, 2).tolist())
+            case 3:
+                simulation.set_planet_mass(planet, int(rng.integers(50, 1001)))
+            case 4:
+                simulation.center_planets(*rng.uniform(0, 1000, 2).tolist())
+        assert_aggregates_match(simulation)
+
+    simulation.run(5)
+    assert_aggregates_match(simulation)
+
+
+def test_edits_of_removed_planets_are_ignored() -> None:
+    simulation = create_simulation()
+    planet = simulation.planets[4]
+    assert simulation.remove_planet(planet)
+    simulation.create_planets(1)
+
+    assert not simulation.move_planet(planet, 10.0, 20.0)
+    assert not simulation.set_planet_mass(planet, 500)
+    assert not simulation.remove_planet(planet)
+    assert_aggregates_match(simulation)
+
+
+def test_momentum_drift_is_measured_from_the_first_reading() -> None:
+    aggregates = AggregateTracker()
+    aggregates.add(2.0, 0.0, 0.0, 1.0, 0.0)
+    assert aggregates.momentum_drift() == 0.0
+
+    aggregates.momentum_x += 3.0
+    aggregates.momentum_y += 4.0
+    assert aggregates.momentum_drift() == pytest.approx(5.0)
+
+    aggregates.add(1.0, 0.0, 0.0)
+    assert aggregates.momentum_drift() == 0.0
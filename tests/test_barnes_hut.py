@@ -0,0 +1,35 @@
+from typing import Tuple
+import numpy as np
+import pytest
+
+from barnes_hut import BarnesHutEngine
+
+
+def random_bodies(number_of_bodies: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (1000, 800), (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+    return positions, masses
+
+
+@pytest.mark.parametrize("theta, tolerance", [(0.0, 1e-9), (0.5, 2e-2)])
+def test_engine_matches_reference(theta: float, tolerance: float) -> None:
+    positions, masses = random_bodies(300)
+    assert BarnesHutEngine(theta=theta).matches_reference(positions, masses, tolerance)
+
+
+def test_error_shrinks_with_the_opening_angle() -> None:
+    positions, masses = random_bodies(500, seed=1)
+    errors = [BarnesHutEngine(theta=theta).max_acceleration_error(positions, masses) for theta in (1.0, 0.7, 0.4, 0.2)]
+    assert errors == sorted(errors, reverse=True)
+    assert errors[-1] < 5e-3
+
+
+@pytest.mark.parametrize("leaf_size", [1, 8])
+def test_clustered_and_coincident_bodies(leaf_size: int) -> None:
+    positions, masses = random_bodies(200, seed=2)
+    positions[:50] = positions[0]
+    positions[50:150] = positions[50] + np.random.default_rng(3).normal(0, 1e-6, (100, 2))
+    engine = BarnesHutEngine(theta=0.5, leaf_size=leaf_size)
+    assert np.all(np.isfinite(engine.compute_accelerations(positions, masses)))
+    assert engine.matches_reference(positions, masses, 2e-2)
@@ -0,0 +1,72 @@
+from typing import Dict, Tuple
+import numpy as np
+
+from bodies import BodyStore
+
+
+def assert_store_matches(store: BodyStore, expected: Dict[int, Tuple[float, float, float]]) -> None:
+    assert len(store) == len(expected)
+    assert sorted(store.ids[:len(store)].tolist()) == sorted(expected)
+    for index, planet in enumerate(store):
+        assert planet.index == index
+        assert store.ids[index] == planet.id
+        assert store.find(planet.id) is planet
+        assert (planet.x, planet.y, planet.mass) == expected[planet.id]
+
+
+def test_random_edits_keep_arrays_compact_and_ids_stable() -> None:
+    rng = np.random.default_rng(0)
+    store = BodyStore(initial_capacity=2, max_tracer_positions=4)
+    expected: Dict[int, Tuple[float, float, float]] = {}
+    used_ids = set()
+
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.4 or not len(store):
+            x, y = rng.uniform(-100, 100, 2).tolist()
+            mass = float(rng.integers(1, 1000))
+            planet = store.add(x, y, mass)
+            planets = [planet]
+            expected[planet.id] = x, y, mass
+        elif action < 0.5:
+            number_of_bodies = int(rng.integers(0, 20))
+            positions = rng.uniform(-100, 100, (number_of_bodies, 2))
+            masses = rng.integers(1, 1000, number_of_bodies).astype(np.float64)
+            planets = store.extend(positions, np.zeros((number_of_bodies, 2)), masses)
+            expected.update(
+                (planet.id, (*position, mass))
+                for planet, position, mass in zip(planets, positions.tolist(), masses.tolist())
+            )
+        else:
+            planet = store[int(rng.integers(len(store)))]
+            tracer = store.tracer_at(len(store) - 1)
+            last_planet = store[-1]
+            values = planet.x, planet.y, planet.mass
+
+            assert store.remove(planet)
+            assert not store.remove(planet)
+            assert planet not in store
+            assert (planet.x, planet.y, planet.mass) == values
+            if last_planet is not planet:
+                assert store.tracers[last_planet.index] is tracer
+            del expected[planet.id]
+            planets = []
+
+        assert not used_ids & {planet.id for planet in planets}
+        used_ids.update(planet.id for planet in planets)
+        assert_store_matches(store, expected)
+        if expected:
+            assert store.oldest().id == min(expected)
+
+
+def test_clear_detaches_planets_and_keeps_ids_increasing() -> None:
+    store = BodyStore()
+    planets = store.extend(np.ones((3, 2)), np.zeros((3, 2)), np.full(3, 4.0))
+    store.clear()
+    assert len(store) == 0 and store.oldest() is None
+    assert all(planet not in store and planet.x == 1.0 for planet in planets)
+
+    planet = store.add(2.0, 2.0, 9.0)
+    assert planet.id == 3
+    assert store.oldest() is planet
+    assert store.radii[0] == 3
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from camera import Camera, rects_overlap, visible_mask
+
+
+def test_screen_and_world_coordinates_round_trip() -> None:
+    camera = Camera()
+    camera.pan(120.0, -40.0)
+    camera.zoom_at(300.0, 200.0, 3.0)
+
+    positions = np.random.default_rng(0).uniform(-1e5, 1e5, (100, 2))
+    screen_positions = camera.world_to_screen(positions)
+    for (x, y), (screen_x, screen_y) in zip(positions.tolist(), screen_positions.tolist()):
+        assert camera.world_point_to_screen(x, y) == pytest.approx((screen_x, screen_y))
+        assert camera.screen_to_world(screen_x, screen_y) == pytest.approx((x, y))
+
+
+def test_zoom_keeps_the_point_under_the_cursor_fixed() -> None:
+    camera = Camera()
+    camera.pan(50.0, 25.0)
+    anchor = camera.screen_to_world(400.0, 300.0)
+    for factor in (1.15, 10.0, 0.01, 0.5):
+        camera.zoom_at(400.0, 300.0, factor)
+        assert camera.screen_to_world(400.0, 300.0) == pytest.approx(anchor)
+
+
+def test_zoom_is_clamped() -> None:
+    camera = Camera(min_zoom=0.1, max_zoom=10.0)
+    camera.zoom_at(0.0, 0.0, 1000.0)
+    assert camera.zoom == 10.0
+    camera.zoom_at(0.0, 0.0, 1e-9)
+    assert camera.zoom == 0.1
+
+    camera.reset()
+    assert (camera.x, camera.y, camera.zoom) == (0.0, 0.0, 1.0)
+
+
+def test_visible_mask_culls_bodies_outside_the_viewport() -> None:
+    camera = Camera()
+    camera.zoom_at(0.0, 0.0, 0.5)
+    camera.pan(-200.0, 100.0)
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(-5000, 5000, (2000, 2))
+    radii = rng.uniform(0, 50, 2000)
+
+    visible = visible_mask(camera.world_to_screen(positions), radii * camera.zoom, 1000, 800)
+    left, top, right, bottom = camera.visible_rect(1000, 800)
+    expected = (
+        (positions[:, 0] + radii >= left) & (positions[:, 0] - radii <= right)
+        & (positions[:, 1] + radii >= top) & (positions[:, 1] - radii <= bottom)
+    )
+    assert np.array_equal(visible, expected)
+    assert 0 < visible.sum() < len(positions)
+
+
+def test_rects_overlap() -> None:
+    assert rects_overlap((0, 0, 10, 10), (5, 5, 20, 20))
+    assert rects_overlap((0, 0, 10, 10), (10, 10, 20, 20))
+    assert rects_overlap((0, 0, 100, 100), (40, 40, 60, 60))
+    assert not rects_overlap((0, 0, 10, 10), (11, 0, 20, 10))
+    assert not rects_overlap((0, 0, 10, 10), (0, -20, 10, -1))
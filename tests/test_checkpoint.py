@@ -0,0 +1,63 @@
+from pathlib import Path
+import numpy as np
+import pytest
+
+from simulation import Simulation
+from checkpoint import read_checkpoint
+
+
+def create_simulation(seed: int | None = 7) -> Simulation:
+    return Simulation(1000, 800, 40, 100, 50, 1000, 50, seed=seed)
+
+
+def assert_same_state(first: Simulation, second: Simulation) -> None:
+    for first_array, second_array in zip(first.state_arrays(), second.state_arrays()):
+        assert np.array_equal(first_array, second_array)
+
+
+def test_checkpoint_round_trip(tmp_path: Path) -> None:
+    simulation = create_simulation()
+    simulation.set_tracers_enabled(True)
+    simulation.run(25)
+    selected_planet = simulation.planets[3]
+    path = str(tmp_path / "state.gravsave")
+    simulation.save_checkpoint(path, selected_planet, paused=True)
+
+    restored = create_simulation(seed=None)
+    restored_planet, paused = restored.load_checkpoint(path)
+    assert paused
+    assert restored_planet.x == selected_planet.x and restored_planet.y == selected_planet.y
+    assert restored.steps == simulation.steps
+    assert_same_state(simulation, restored)
+
+    assert restored.tracers_enabled
+    for tracer, restored_tracer in zip(simulation.planets.tracers, restored.planets.tracers):
+        assert np.array_equal(tracer.points(), restored_tracer.points())
+
+    simulation.run(25)
+    restored.run(25)
+    assert_same_state(simulation, restored)
+
+    simulation.reset_planets()
+    restored.reset_planets()
+    assert_same_state(simulation, restored)
+
+
+def test_seeded_simulations_are_reproducible() -> None:
+    first, second = create_simulation(), create_simulation()
+    assert_same_state(first, second)
+
+    for simulation in (first, second):
+        simulation.run(10)
+        simulation.create_planets(5)
+        simulation.run(10)
+        simulation.reset_planets()
+    assert_same_state(first, second)
+    assert not np.array_equal(first.state_arrays()[0], create_simulation(seed=8).state_arrays()[0])
+
+
+def test_reading_other_files_fails(tmp_path: Path) -> None:
+    path = tmp_path / "not_a_checkpoint"
+    path.write_bytes(b"\0" * 256)
+    with pytest.raises(ValueError):
+        read_checkpoint(str(path))
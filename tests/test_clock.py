@@ -0,0 +1,25 @@
+import pytest
+
+from clock import FixedTimestepClock
+
+
+def test_steps_follow_simulated_time_regardless_of_frame_timing() -> None:
+    for frame_times in ([1 / 60] * 60, [1 / 144] * 144, [0.005, 0.03, 0.001, 0.0157] * 15 + [0.1]):
+        clock = FixedTimestepClock(1.0, 60)
+        steps = sum(clock.advance(elapsed) for elapsed in frame_times)
+        assert steps == pytest.approx(60 * sum(frame_times), abs=1)
+
+
+@pytest.mark.parametrize("time_scale", [1.0, 10.0, 31.6, 100.0])
+def test_time_scale_multiplies_the_step_rate(time_scale: float) -> None:
+    clock = FixedTimestepClock(1.0, 60, time_scale, max_catch_up_steps=250)
+    steps = sum(clock.advance(1 / 60) for _ in range(60))
+    assert steps == pytest.approx(60 * time_scale, abs=1)
+    assert clock.dropped_steps == 0
+
+
+def test_catch_up_is_capped_and_backlog_is_dropped() -> None:
+    clock = FixedTimestepClock(0.5, 60, max_catch_up_steps=10)
+    assert clock.advance(1.0) == 10
+    assert clock.dropped_steps == 110
+    assert clock.advance(1 / 60) == 2
@@ -0,0 +1,88 @@
+from typing import List, Set, Tuple
+import numpy as np
+import pytest
+
+from collisions import collision_groups, find_collisions, sweep_and_prune
+from simulation import Simulation
+
+
+def random_bodies(number_of_bodies: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (2000, 800), (number_of_bodies, 2))
+    radii = np.floor(np.sqrt(rng.uniform(50, 1000, number_of_bodies)))
+    return positions, radii
+
+
+def pair_set(pairs: np.ndarray) -> Set[Tuple[int, int]]:
+    return {(min(first, second), max(first, second)) for first, second in pairs.tolist()}
+
+
+def oracle_pairs(positions: np.ndarray, radii: np.ndarray, box_only: bool = False) -> Set[Tuple[int, int]]:
+    first, second = np.triu_indices(len(positions), k=1)
+    reach = radii[first] + radii[second]
+    if box_only:
+        touching = np.all(np.abs(positions[first] - positions[second]) <= reach[:, np.newaxis], axis=1)
+    else:
+        touching = np.hypot(*(positions[first] - positions[second]).T) <= reach
+    return set(zip(first[touching].tolist(), second[touching].tolist()))
+
+
+@pytest.mark.parametrize("max_pairs_per_chunk", [1, 7, 1_000_000])
+def test_sweep_and_prune_finds_every_overlapping_box(max_pairs_per_chunk: int) -> None:
+    positions, radii = random_bodies(600)
+    pairs = sweep_and_prune(positions, radii, max_pairs_per_chunk)
+    assert len(pairs) == len(pair_set(pairs))
+    assert pair_set(pairs) == oracle_pairs(positions, radii, box_only=True)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_find_collisions_matches_all_pairs(seed: int) -> None:
+    positions, radii = random_bodies(800, seed)
+    positions[:20] = positions[0]
+    assert pair_set(find_collisions(positions, radii)) == oracle_pairs(positions, radii)
+
+
+def test_small_inputs() -> None:
+    assert find_collisions(np.empty((0, 2)), np.empty(0)).shape == (0, 2)
+    assert find_collisions(np.zeros((1, 2)), np.ones(1)).shape == (0, 2)
+    assert pair_set(find_collisions(np.zeros((2, 2)), np.ones(2))) == {(0, 1)}
+
+
+def oracle_groups(pairs: Set[Tuple[int, int]]) -> List[Set[int]]:
+    groups: List[Set[int]] = []
+    for pair in pairs:
+        touching = [group for group in groups if group & set(pair)]
+        merged = set(pair).union(*touching)
+        groups = [group for group in groups if group not in touching] + [merged]
+    return groups
+
+
+def test_collision_groups_are_connected_components() -> None:
+    positions, radii = random_bodies(400, seed=5)
+    pairs = find_collisions(positions, radii)
+    groups = collision_groups(pairs)
+    assert sorted(map(sorted, groups)) == sorted(map(sorted, oracle_groups(pair_set(pairs))))
+
+
+def test_merging_conserves_mass_and_momentum() -> None:
+    simulation = Simulation(1000, 800, 300, 300, 50, 1000, 0, seed=6)
+    simulation.set_collisions_enabled(True)
+    positions, velocities, masses = (array.copy() for array in simulation.state_arrays())
+    velocities[:] = np.random.default_rng(7).normal(0, 1, velocities.shape)
+    simulation.state_arrays()[1][:] = velocities
+    frozen_planet = simulation.planets[0]
+    frozen_position = frozen_planet.x, frozen_planet.y
+
+    groups = collision_groups(find_collisions(positions, simulation.planets.radii[:len(simulation.planets)]))
+    merged = simulation.merge_colliding_planets(frozen_planet)
+    assert merged == sum(len(group) - 1 for group in groups) > 0
+    assert len(simulation.planets) == len(masses) - merged
+    assert frozen_planet in simulation.planets
+    assert (frozen_planet.x, frozen_planet.y) == frozen_position
+
+    _, new_velocities, new_masses = simulation.state_arrays()
+    assert new_masses.sum() == pytest.approx(masses.sum())
+    frozen_group = next((group for group in groups if 0 in group), [0])
+    moving = np.setdiff1d(np.arange(len(masses)), frozen_group)
+    expected_momentum = masses[moving] @ velocities[moving] + masses[frozen_group].sum() * velocities[0]
+    assert new_masses @ new_velocities == pytest.approx(expected_momentum)
@@ -0,0 +1,55 @@
+import argparse
+from typing import List, Tuple
+import numpy as np
+import pytest
+
+from engine import (
+    LoopEngine, NumpyEngine, add_engine_arguments, check_engine_arguments, create_engine_from_arguments,
+    reference_accelerations
+)
+
+
+def random_bodies(number_of_bodies: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (1000, 800), (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+    return positions, masses
+
+
+@pytest.mark.parametrize("block_size", [1, 64, 256])
+def test_numpy_engine_matches_reference(block_size: int) -> None:
+    positions, masses = random_bodies(300)
+    assert NumpyEngine(block_size=block_size).matches_reference(positions, masses)
+
+
+def test_reference_handles_coincident_bodies() -> None:
+    positions = np.array([[10.0, 10.0], [10.0, 10.0], [20.0, 10.0]])
+    masses = np.array([1.0, 2.0, 4.0])
+    accelerations = reference_accelerations(positions, masses)
+    assert np.all(np.isfinite(accelerations))
+    assert NumpyEngine().matches_reference(positions, masses)
+
+
+def parse_engine_arguments(arguments: List[str]) -> Tuple[argparse.ArgumentParser, argparse.Namespace]:
+    parser = argparse.ArgumentParser()
+    add_engine_arguments(parser)
+    return parser, parser.parse_args(arguments)
+
+
+def test_integrator_is_applied_to_array_engines() -> None:
+    parser, args = parse_engine_arguments(["--engine", "numpy", "--integrator", "rk4"])
+    check_engine_arguments(parser, args)
+    assert create_engine_from_arguments(args).integrator.name == "rk4"
+
+
+def test_loop_engine_rejects_other_integrators() -> None:
+    parser, args = parse_engine_arguments(["--engine", "loop"])
+    check_engine_arguments(parser, args)
+    assert isinstance(create_engine_from_arguments(args), LoopEngine)
+
+    parser, args = parse_engine_arguments(["--engine", "loop", "--integrator", "leapfrog"])
+    with pytest.raises(SystemExit):
+        check_engine_arguments(parser, args)
+    with pytest.raises(ValueError):
+        create_engine_from_arguments(args)
+
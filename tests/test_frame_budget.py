@@ -0,0 +1,29 @@
+import time
+
+from bodies import BodyStore
+from engine import PhysicsEngine, max_bodies_for_frame_budget
+from planet import Planet
+
+
+class SleepingEngine(PhysicsEngine):
+    def __init__(self, fixed_time: float, time_per_body: float) -> None:
+        self.fixed_time = fixed_time
+        self.time_per_body = time_per_body
+
+    def step(self, planets: BodyStore, frozen_planet: Planet | None = None, dt: float = 1.0) -> None:
+        time.sleep(self.fixed_time + self.time_per_body * len(planets))
+
+
+def test_fixed_step_cost_does_not_limit_the_number_of_bodies() -> None:
+    engine = SleepingEngine(fixed_time=0.02, time_per_body=1e-6)
+    assert 7_500 <= max_bodies_for_frame_budget(engine, 0.01) <= 12_500
+
+
+def test_cap_is_interpolated_between_measured_sizes() -> None:
+    engine = SleepingEngine(fixed_time=0.0, time_per_body=1e-5)
+    assert 750 <= max_bodies_for_frame_budget(engine, 0.01) <= 1_250
+
+
+def test_cap_stops_at_the_maximum() -> None:
+    engine = SleepingEngine(fixed_time=0.0, time_per_body=0.0)
+    assert max_bodies_for_frame_budget(engine, 0.01, max_number_of_bodies=1000) == 1000
@@ -0,0 +1,75 @@
+from typing import List
+
+from engine import create_engine
+from governor import QualityGovernor, QualityKnob, quality_knobs, quality_ladder
+from simulation import Simulation
+
+KNOBS = [QualityKnob("substeps", (4, 2, 1)), QualityKnob("points", (False, True))]
+
+
+def run_frames(governor: QualityGovernor, frame_time: float, number_of_frames: int) -> List[int]:
+    levels = []
+    for _ in range(number_of_frames):
+        if governor.update(frame_time):
+            levels.append(governor.level)
+    return levels
+
+
+def test_ladder_lowers_one_knob_per_level() -> None:
+    ladder = quality_ladder(KNOBS)
+    assert ladder == [
+        {"substeps": 4, "points": False},
+        {"substeps": 2, "points": False},
+        {"substeps": 2, "points": True},
+        {"substeps": 1, "points": True}
+    ]
+
+
+def test_overruns_step_quality_down_to_the_bottom() -> None:
+    governor = QualityGovernor(KNOBS, target_fps=50, settle_frames=5)
+    assert run_frames(governor, 0.017, 100) == []
+    assert run_frames(governor, 0.05, 100) == [1, 2, 3]
+    assert governor.active_knobs() == {"substeps": 1, "points": True}
+    assert governor.describe() == "Quality: substeps=1, points"
+
+
+def test_headroom_steps_quality_back_up() -> None:
+    governor = QualityGovernor(KNOBS, target_fps=50, settle_frames=5, recover_frames=20)
+    run_frames(governor, 0.05, 20)
+    assert governor.level == 3
+
+    assert run_frames(governor, 0.015, 200) == []
+    assert run_frames(governor, 0.005, 24) == [2]
+    assert run_frames(governor, 0.005, 200) == [1, 0]
+    assert governor.describe() == "Quality: full"
+
+
+def test_recovery_backs_off_after_restoring_into_an_overrun() -> None:
+    governor = QualityGovernor(KNOBS, target_fps=50, settle_frames=5, recover_frames=20)
+    run_frames(governor, 0.05, 5)
+    run_frames(governor, 0.005, 30)
+    assert governor.level == 0
+
+    run_frames(governor, 0.05, 5)
+    assert governor.level == 1
+    assert governor.recover_frames == 40
+
+
+def test_disabling_restores_full_quality() -> None:
+    governor = QualityGovernor(KNOBS, target_fps=50, settle_frames=5)
+    run_frames(governor, 0.05, 20)
+    assert governor.set_enabled(False)
+    assert governor.level == 0
+    assert run_frames(governor, 0.05, 100) == []
+
+
+def test_knobs_follow_the_engine_and_apply_to_the_simulation() -> None:
+    simulation = Simulation(
+        1000, 800, 10, 20, 50, 1000, 10, engine=create_engine("barnes-hut", theta=0.5), substeps=4, seed=1
+    )
+    knobs = quality_knobs(simulation)
+    assert [knob.name for knob in knobs] == ["tracer_interval", "points", "theta", "substeps"]
+
+    simulation.apply_quality(quality_ladder(knobs)[-1])
+    assert (simulation.tracer_interval, simulation.engine.theta, simulation.substeps) == (8, 1.0, 1)
+    simulation.run(3)
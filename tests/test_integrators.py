@@ -0,0 +1,64 @@
+from typing import Tuple
+import numpy as np
+import pytest
+
+from integrators import Integrator, INTEGRATOR_NAMES, create_integrator
+
+
+def spring(positions: np.ndarray, masses: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+    accelerations = -positions / masses[:, np.newaxis]
+    return accelerations if indices is None else accelerations[indices]
+
+
+def oscillate(integrator: Integrator, dt: float, duration: float) -> Tuple[np.ndarray, np.ndarray]:
+    positions = np.array([[1.0, 0.0], [0.0, 2.0]])
+    velocities = np.array([[0.0, 1.0], [-2.0, 0.0]])
+    masses = np.ones(2)
+    for _ in range(round(duration / dt)):
+        integrator.step(positions, velocities, masses, dt, spring)
+    return positions, velocities
+
+
+def exact_positions(duration: float) -> np.ndarray:
+    return np.array([[np.cos(duration), np.sin(duration)], [-2.0 * np.sin(duration), 2.0 * np.cos(duration)]])
+
+
+def energy(positions: np.ndarray, velocities: np.ndarray) -> float:
+    return 0.5 * float((positions ** 2).sum() + (velocities ** 2).sum())
+
+
+@pytest.mark.parametrize("name, order", [("euler", 1), ("leapfrog", 2), ("rk4", 4)])
+def test_convergence_order(name: str, order: int) -> None:
+    errors = [
+        np.abs(oscillate(create_integrator(name), dt, 2.0)[0] - exact_positions(2.0)).max()
+        for dt in (0.02, 0.01)
+    ]
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.2)
+
+
+def test_leapfrog_energy_stays_bounded_where_euler_drifts() -> None:
+    initial_energy = energy(*oscillate(create_integrator("euler"), 0.1, 0.0))
+    leapfrog_drift = abs(energy(*oscillate(create_integrator("leapfrog"), 0.1, 200.0)) / initial_energy - 1)
+    euler_drift = abs(energy(*oscillate(create_integrator("euler"), 0.1, 200.0)) / initial_energy - 1)
+    assert leapfrog_drift < 1e-2
+    assert euler_drift > 100 * leapfrog_drift
+
+
+def test_leapfrog_reuses_accelerations_between_steps() -> None:
+    integrator = create_integrator("leapfrog")
+    oscillate(integrator, 0.1, 1.0)
+    assert integrator.evaluations == 2 * 11
+
+
+@pytest.mark.parametrize("name", ["adaptive", "block"])
+def test_adaptive_integrators_track_the_exact_solution(name: str) -> None:
+    integrator = create_integrator(name)
+    positions, _ = oscillate(integrator, 0.5, 10.0)
+    assert np.abs(positions - exact_positions(10.0)).max() < 5e-2
+
+
+def test_every_integrator_is_available_by_name() -> None:
+    for name in INTEGRATOR_NAMES:
+        assert create_integrator(name).name == name
+    with pytest.raises(ValueError):
+        create_integrator("verlet")
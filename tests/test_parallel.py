@@ -0,0 +1,48 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple
+import numpy as np
+import pytest
+
+from engine import reference_accelerations
+from parallel import ParallelEngine
+
+
+def random_bodies(number_of_bodies: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (1000, 800), (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+    return positions, masses
+
+
+def test_parallel_engine_is_deterministic_across_worker_counts() -> None:
+    positions, masses = random_bodies(1000, seed=1)
+    results = []
+    for workers in (1, 2, 3):
+        engine = ParallelEngine(workers=workers, tile_size=128)
+        try:
+            results.append(engine.compute_accelerations(positions, masses))
+            results.append(engine.compute_accelerations(positions, masses))
+        finally:
+            engine.close()
+
+    for accelerations in results[1:]:
+        assert np.array_equal(accelerations, results[0])
+    assert np.allclose(results[0], reference_accelerations(positions, masses), rtol=1e-9, atol=0.0)
+
+
+def test_shared_buffers_grow_and_are_released_on_close() -> None:
+    engine = ParallelEngine(workers=2, tile_size=128)
+    try:
+        for number_of_bodies in (100, 700, 300):
+            positions, masses = random_bodies(number_of_bodies, seed=number_of_bodies)
+            assert engine.matches_reference(positions, masses)
+        assert len(engine.shared_buffers) == 1
+        assert engine.shared_buffers[0].capacity == 700
+        names = engine.shared_buffers[0].names
+    finally:
+        engine.close()
+
+    assert not engine.shared_buffers
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
@@ -0,0 +1,35 @@
+from typing import Tuple
+import numpy as np
+import pytest
+
+from particle_mesh import ParticleMeshEngine
+
+
+def random_bodies(number_of_bodies: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (1000, 800), (number_of_bodies, 2))
+    masses = rng.uniform(50, 1000, number_of_bodies)
+    return positions, masses
+
+
+@pytest.mark.parametrize("short_range_correction, tolerance", [(False, 1e-2), (True, 5e-3)], ids=["pm", "p3m"])
+def test_engine_matches_reference(short_range_correction: bool, tolerance: float) -> None:
+    positions, masses = random_bodies(300)
+    engine = ParticleMeshEngine(grid_size=128, short_range_correction=short_range_correction)
+    assert engine.matches_reference(positions, masses, tolerance)
+
+
+def test_error_shrinks_with_grid_size() -> None:
+    positions, masses = random_bodies(300, seed=1)
+    errors = [
+        ParticleMeshEngine(grid_size=grid_size).max_acceleration_error(positions, masses)
+        for grid_size in (32, 64, 128)
+    ]
+    assert errors == sorted(errors, reverse=True)
+
+
+def test_degenerate_inputs() -> None:
+    engine = ParticleMeshEngine(grid_size=32)
+    assert engine.compute_accelerations(np.empty((0, 2)), np.empty(0)).shape == (0, 2)
+    assert np.array_equal(engine.compute_accelerations(np.ones((1, 2)), np.ones(1)), np.zeros((1, 2)))
+    assert np.all(np.isfinite(engine.compute_accelerations(np.ones((3, 2)), np.ones(3))))
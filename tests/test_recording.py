@@ -0,0 +1,64 @@
+from pathlib import Path
+import numpy as np
+import pytest
+
+from recording import TrajectoryRecorder, TrajectoryReader
+from simulation import Simulation
+
+
+def test_recorder_round_trip_grows_index_and_data(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.gravrec")
+    rng = np.random.default_rng(0)
+    recorder = TrajectoryRecorder(path, max_frames=3, initial_data_size=64, move_chunk_size=40)
+    frames = []
+    for step in range(20):
+        number_of_bodies = int(rng.integers(1, 6))
+        frame = (
+            rng.normal(size=(number_of_bodies, 2)),
+            rng.normal(size=(number_of_bodies, 2)),
+            rng.uniform(1, 9, number_of_bodies)
+        )
+        assert recorder.record(step, step * 0.5, *frame)
+        frames.append(frame)
+    recorder.close()
+
+    reader = TrajectoryReader(path)
+    assert len(reader) == len(frames)
+    for frame_number, (positions, velocities, masses) in enumerate(frames):
+        frame = reader.frame(frame_number)
+        assert (frame.step, frame.time) == (frame_number, frame_number * 0.5)
+        assert np.array_equal(frame.positions, positions)
+        assert np.array_equal(frame.velocities, velocities)
+        assert np.array_equal(frame.masses, masses)
+    with pytest.raises(IndexError):
+        reader.frame(len(frames))
+    reader.close()
+
+
+def test_simulation_recording_replays_every_recorded_step(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.gravrec")
+    simulation = Simulation(1000, 800, 10, 20, 50, 1000, 50, seed=3)
+    states = [tuple(array.copy() for array in simulation.state_arrays())]
+
+    simulation.start_recording(path, record_every=2)
+    for _ in range(6):
+        simulation.step()
+        states.append(tuple(array.copy() for array in simulation.state_arrays()))
+    simulation.stop_recording()
+
+    reader = TrajectoryReader(path)
+    assert [reader.frame(frame_number).step for frame_number in range(len(reader))] == [0, 2, 4, 6]
+    for frame_number in range(len(reader)):
+        frame = reader.frame(frame_number)
+        positions, velocities, masses = states[frame.step]
+        assert np.array_equal(frame.positions, positions)
+        assert np.array_equal(frame.velocities, velocities)
+        assert np.array_equal(frame.masses, masses)
+    reader.close()
+
+
+def test_reader_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "not_a_recording"
+    path.write_bytes(b"\0" * 256)
+    with pytest.raises(ValueError):
+        TrajectoryReader(str(path))
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from ensemble import random_systems
+from scenarios import DIRECT_SUM_LIMIT, SCENARIO_NAMES, accelerations_of, body_radii, generate_scenario
+from simulation import Simulation
+
+
+@pytest.mark.parametrize("scenario", SCENARIO_NAMES)
+def test_scenarios_are_deterministic_and_within_limits(scenario: str) -> None:
+    first, second = (
+        generate_scenario(scenario, 200, 1000, 800, 50, 1000, np.random.default_rng(11)) for _ in range(2)
+    )
+    for first_array, second_array in zip(first, second):
+        assert np.array_equal(first_array, second_array)
+
+    positions, velocities, masses = first
+    assert positions.shape == velocities.shape == (len(masses), 2)
+    assert np.all((masses >= 50) & (masses <= 1000))
+    assert np.all(np.isfinite(positions)) and np.all(np.isfinite(velocities))
+    assert np.allclose(masses @ velocities, 0.0, atol=1e-6 * masses.sum())
+
+
+@pytest.mark.parametrize("scenario", SCENARIO_NAMES)
+def test_small_and_large_body_counts(scenario: str) -> None:
+    for number_of_bodies in (0, 1, 2, 3, 4, DIRECT_SUM_LIMIT + 1):
+        positions, velocities, masses = generate_scenario(
+            scenario, number_of_bodies, 1000, 800, 50, 1000, np.random.default_rng(number_of_bodies)
+        )
+        assert len(positions) == len(velocities) == len(masses) == number_of_bodies
+        assert np.all(np.isfinite(positions)) and np.all(np.isfinite(velocities))
+
+
+def test_disk_bodies_start_on_circular_orbits() -> None:
+    positions, velocities, masses = generate_scenario("disk", 300, 1000, 800, 50, 1000, np.random.default_rng(2))
+    offsets = positions - masses @ positions / masses.sum()
+    centripetal = -(accelerations_of(positions, masses) * offsets).sum(axis=1)
+
+    speeds = np.hypot(velocities[:, 0], velocities[:, 1])
+    radial_speeds = (velocities * offsets).sum(axis=1) / np.hypot(offsets[:, 0], offsets[:, 1])
+    orbiting = centripetal > 0.0
+    assert orbiting.mean() > 0.9
+
+    assert np.abs(radial_speeds).max() < 0.1 < speeds.mean()
+    assert np.allclose(speeds[orbiting], np.sqrt(centripetal[orbiting]), atol=0.1)
+    angular_momenta = offsets[:, 0] * velocities[:, 1] - offsets[:, 1] * velocities[:, 0]
+    assert np.all(angular_momenta[orbiting] > 0.0)
+
+
+def test_binary_pairs_orbit_their_shared_center() -> None:
+    positions, velocities, masses = generate_scenario(
+        "binaries", 201, 1000, 800, 50, 1000, np.random.default_rng(3)
+    )
+    pair_positions = positions[:200].reshape(-1, 2, 2)
+    pair_velocities = velocities[:200].reshape(-1, 2, 2)
+    pair_masses = masses[:200].reshape(-1, 2)
+
+    assert np.array_equal(pair_masses[:, 0], pair_masses[:, 1])
+    relative_velocities = pair_velocities - pair_velocities.mean(axis=1, keepdims=True)
+    assert np.allclose(relative_velocities[:, 0], -relative_velocities[:, 1])
+    separations = np.hypot(*(pair_positions[:, 1] - pair_positions[:, 0]).T)
+    assert np.all(separations > 2 * body_radii(pair_masses[:, 0]))
+
+
+def test_reset_switches_scenario() -> None:
+    simulation = Simulation(1000, 800, 50, 50, 50, 1000, 10, seed=1)
+    assert not simulation.state_arrays()[1].any()
+
+    simulation.reset_planets("disk")
+    assert simulation.scenario == "disk"
+    assert len(simulation.planets) == 50
+    assert simulation.state_arrays()[1].any()
+
+    simulation.reset_planets()
+    assert simulation.scenario == "disk"
+    with pytest.raises(ValueError):
+        simulation.reset_planets("spiral")
+
+
+@pytest.mark.parametrize("scenario", ("uniform", "disk", "binaries"))
+def test_ensemble_members_match_seeded_simulations(scenario: str) -> None:
+    seeds = [3, 4, 5]
+    positions, velocities, masses = random_systems(seeds, 24, 1000, 800, 50, 1000, scenario)
+
+    for run, seed in enumerate(seeds):
+        simulation = Simulation(1000, 800, 24, 24, 50, 1000, 10, seed=seed, scenario=scenario)
+        simulation_positions, simulation_velocities, simulation_masses = simulation.state_arrays()
+        assert np.array_equal(positions[run], simulation_positions)
+        assert np.array_equal(velocities[run], simulation_velocities)
+        assert np.array_equal(masses[run], simulation_masses)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from simulation import Simulation
+from spatial_index import SpatialHash
+
+
+def random_index(number_of_bodies: int, cell_size: float, seed: int = 0) -> SpatialHash:
+    rng = np.random.default_rng(seed)
+    index = SpatialHash(cell_size)
+    index.rebuild(rng.uniform(-5000, 5000, (number_of_bodies, 2)), np.floor(rng.uniform(3, 32, number_of_bodies)))
+    return index
+
+
+@pytest.mark.parametrize("cell_size", [16.0, 64.0, 500.0])
+def test_radius_queries_match_brute_force(cell_size: float) -> None:
+    index = random_index(2000, cell_size)
+    rng = np.random.default_rng(1)
+    for x, y, radius in zip(*rng.uniform(-5500, 5500, (2, 200)), rng.uniform(0, 800, 200)):
+        distances_squared = ((index.positions - (x, y)) ** 2).sum(axis=1)
+        assert sorted(index.query_radius(x, y, radius)) == np.flatnonzero(distances_squared <= radius ** 2).tolist()
+
+
+@pytest.mark.parametrize("cell_size", [16.0, 64.0])
+def test_point_queries_return_the_nearest_body_under_the_point(cell_size: float) -> None:
+    index = random_index(5000, cell_size)
+    rng = np.random.default_rng(2)
+    targets = np.concatenate((index.positions[:200] + rng.normal(0, 10, (200, 2)), rng.uniform(-5000, 5000, (200, 2))))
+
+    hits = 0
+    for x, y in targets.tolist():
+        distances_squared = ((index.positions - (x, y)) ** 2).sum(axis=1)
+        under_point = np.flatnonzero(distances_squared <= index.radii ** 2)
+        expected = int(under_point[distances_squared[under_point].argmin()]) if len(under_point) else None
+        assert index.query_point(x, y) == expected
+        hits += expected is not None
+    assert hits > 100
+
+
+def test_empty_index_finds_nothing() -> None:
+    index = SpatialHash()
+    assert index.query_point(0.0, 0.0) is None
+    assert index.query_radius(0.0, 0.0, 100.0) == []
+
+
+def test_simulation_refreshes_the_index_after_edits() -> None:
+    simulation = Simulation(1000, 800, 20, 40, 50, 1000, 50, seed=4)
+    planet = simulation.planets[5]
+    assert simulation.find_planet_at(planet.x, planet.y) is not None
+
+    simulation.move_planet(planet, -3000.0, -3000.0)
+    assert simulation.find_planet_at(-3000.0, -3000.0) == planet
+    assert simulation.planets_within(-3000.0, -3000.0, 1.0) == [planet]
+
+    simulation.remove_planet(planet)
+    assert simulation.find_planet_at(-3000.0, -3000.0) is None
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Iterator, List
+import numpy as np
+import pytest
+
+import telemetry
+from clock import FixedTimestepClock
+from simulation import Simulation
+from worker import SimulationWorker, capture_snapshot
+
+
+def decode(decoder: telemetry.TelemetryDecoder, message: bytes) -> telemetry.TelemetryFrame | telemetry.TelemetryReply:
+    header = np.frombuffer(message, dtype=telemetry.MESSAGE_HEADER_DTYPE, count=1)[0]
+    assert int(header["size"]) == len(message) - telemetry.MESSAGE_HEADER_DTYPE.itemsize
+    return decoder.decode(int(header["kind"]), message[telemetry.MESSAGE_HEADER_DTYPE.itemsize:])
+
+
+def test_frames_round_trip_through_keyframes_and_deltas() -> None:
+    simulation = Simulation(1000, 800, 30, 40, 50, 1000, 50, seed=5)
+    subscriber = telemetry.Subscriber(None, 30)
+    decoder = telemetry.TelemetryDecoder()
+
+    keyframes = []
+    for step in range(12):
+        if step == 6:
+            simulation.remove_planet()
+        snapshot = capture_snapshot(simulation)
+        frame = decode(decoder, subscriber.encode(snapshot))
+
+        keyframes.append(frame.keyframe)
+        assert frame.steps == snapshot.steps
+        assert np.array_equal(frame.ids, snapshot.ids)
+        assert np.abs(frame.positions - snapshot.positions).max() <= telemetry.DELTA_RESOLUTION / 2
+        assert frame.center_of_mass == pytest.approx(snapshot.center_of_mass)
+        simulation.step()
+
+    assert keyframes == [True] + [False] * 5 + [True] + [False] * 5
+
+
+def test_reply_round_trip() -> None:
+    message = telemetry.encode_message(telemetry.REPLY, bytes((True,)), "spawn".encode())
+    assert decode(telemetry.TelemetryDecoder(), message) == telemetry.TelemetryReply(True, "spawn")
+
+
+def test_subscriber_keeps_only_the_latest_snapshot() -> None:
+    subscriber = telemetry.Subscriber(None, 30)
+    for snapshot in ("first", "second", "third"):
+        subscriber.offer(snapshot)
+    assert subscriber.take() == "third"
+    assert subscriber.take() is None
+    assert subscriber.dropped == 2
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[telemetry.TelemetryServer]:
+    simulation = Simulation(1000, 800, 20, 100, 50, 1000, 50, seed=1)
+    worker = SimulationWorker(simulation, FixedTimestepClock(1.0, 60), 60)
+    worker.start()
+    telemetry_server = telemetry.TelemetryServer(str(tmp_path / "telemetry.sock"), worker)
+    telemetry_server.start()
+    yield telemetry_server
+    telemetry_server.stop()
+    worker.stop()
+
+
+def send_commands(server: telemetry.TelemetryServer, commands: List[bytes]) -> List[telemetry.TelemetryReply]:
+    decoder = telemetry.TelemetryDecoder()
+    replies = []
+    with telemetry.connect(server.address) as connection:
+        connection.sendall(b"".join(command + b"\n" for command in commands))
+        for kind, payload in telemetry.read_messages(connection):
+            message = decoder.decode(kind, payload)
+            if isinstance(message, telemetry.TelemetryReply):
+                replies.append(message)
+                if len(replies) == len(commands):
+                    break
+    return replies
+
+
+def test_bad_commands_are_rejected(server: telemetry.TelemetryServer) -> None:
+    commands = [
+        b"edit 1 mass=inf",
+        b"edit 1 mass=nan",
+        b"edit 1 x=1e400",
+        b"edit 1 mass=2e30",
+        b"edit 1 mass=1.5",
+        b"edit 1 colour=red",
+        b"edit 999 x=1",
+        b"remove 999",
+        b"rate inf",
+        b"rate 0",
+        b"explode",
+        b"edit 1 " + b"x" * 100_000
+    ]
+    replies = send_commands(server, commands)
+    assert [reply.ok for reply in replies] == [False] * len(commands)
+    assert server.worker.thread.is_alive()
+
+
+def test_good_commands_are_applied(server: telemetry.TelemetryServer) -> None:
+    replies = send_commands(server, [b"edit 1 mass=600", b"rate 10", b"spawn"])
+    assert [reply.ok for reply in replies] == [True, True, True]
+    assert server.simulation.planets.find(1).mass == 600
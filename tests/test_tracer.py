@@ -0,0 +1,119 @@
+from collections import deque
+import numpy as np
+import pytest
+
+from simulation import Simulation
+from tracer import TracerBuffer, restore_tracers
+
+
+def test_ring_keeps_the_latest_points_in_order() -> None:
+    rng = np.random.default_rng(2)
+    tracer = TracerBuffer(10)
+    expected = deque(maxlen=10)
+    for x, y in rng.uniform(-100, 100, (35, 2)).tolist():
+        tracer.append(x, y)
+        expected.append((x, y))
+        assert len(tracer) == len(expected)
+        assert np.array_equal(tracer.points(), np.array(expected))
+
+    min_x, min_y, max_x, max_y = tracer.world_bounds()
+    assert np.all(tracer.points() >= (min_x, min_y)) and np.all(tracer.points() <= (max_x, max_y))
+
+
+def test_shift_applies_an_offset_without_rewriting_points() -> None:
+    tracer = TracerBuffer(4)
+    for x in range(6):
+        tracer.append(float(x), 1.0)
+    stored_points = tracer.positions.copy()
+
+    tracer.shift(10.0, -1.0)
+    assert np.array_equal(tracer.positions, stored_points)
+    assert np.array_equal(tracer.points(), [[12.0, 0.0], [13.0, 0.0], [14.0, 0.0], [15.0, 0.0]])
+    assert tracer.world_bounds() == (10.0, 0.0, 15.0, 0.0)
+
+    tracer.append(0.0, 0.0)
+    assert np.array_equal(tracer.points()[-1], [0.0, 0.0])
+
+
+def test_zero_capacity_tracers_store_nothing() -> None:
+    tracer = TracerBuffer(0)
+    tracer.append(1.0, 2.0)
+    assert len(tracer) == 0
+    assert tracer.points().shape == (0, 2)
+    assert tracer.world_bounds() is None
+
+
+def test_centering_planets_moves_their_trails() -> None:
+    simulation = Simulation(1000, 800, 5, 10, 50, 1000, 20, seed=1)
+    simulation.set_tracers_enabled(True)
+    simulation.run(30)
+    trails = [simulation.planets.tracer_at(i).points() for i in range(len(simulation.planets))]
+    positions = simulation.state_arrays()[0].copy()
+
+    simulation.center_planets(100.0, 100.0)
+    offset = simulation.state_arrays()[0] - positions
+    assert np.ptp(offset, axis=0) == pytest.approx((0.0, 0.0), abs=1e-9)
+    for i, trail in enumerate(trails):
+        assert np.allclose(simulation.planets.tracer_at(i).points(), trail + offset[0])
+
+
+def test_frozen_tracers_match_live_points_and_stay_unchanged() -> None:
+    rng = np.random.default_rng(0)
+    tracer = TracerBuffer(16)
+    frozen = []
+
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.8:
+            tracer.append(*rng.uniform(-100, 100, 2).tolist())
+        elif action < 0.85:
+            tracer.shift(*rng.uniform(-10, 10, 2).tolist())
+        elif action < 0.87:
+            tracer.clear()
+        elif action < 0.89:
+            tracer.restore(rng.uniform(-100, 100, (int(rng.integers(0, 30)), 2)))
+
+        if rng.random() < 0.5:
+            snapshot = tracer.freeze()
+            assert np.array_equal(snapshot.points, tracer.points())
+            assert snapshot.bounds == tracer.world_bounds()
+            assert not snapshot.points.flags.writeable
+            frozen.append((snapshot, snapshot.points.copy()))
+
+    for snapshot, points in frozen:
+        assert np.array_equal(snapshot.points, points)
+
+
+def test_freeze_reuses_the_snapshot_until_the_tracer_changes() -> None:
+    tracer = TracerBuffer(4)
+    tracer.append(1.0, 2.0)
+    snapshot = tracer.freeze()
+    assert tracer.freeze() is snapshot
+
+    tracer.append(3.0, 4.0)
+    assert tracer.freeze() is not snapshot
+    assert np.array_equal(snapshot.points, [[1.0, 2.0]])
+
+
+def test_bulk_restore_matches_restoring_each_tracer() -> None:
+    rng = np.random.default_rng(1)
+    capacity = 8
+    for counts in (rng.integers(0, 12, 50), np.full(20, capacity)):
+        stored_points = rng.uniform(-100, 100, (int(counts.sum()), 2))
+        x_offsets, y_offsets = rng.uniform(-10, 10, (2, len(counts)))
+        tracers = restore_tracers(capacity, stored_points, counts, x_offsets, y_offsets)
+
+        ends = np.cumsum(counts)
+        for tracer, count, end, x_offset, y_offset in zip(tracers, counts, ends, x_offsets, y_offsets):
+            if not count:
+                assert tracer is None
+                continue
+
+            expected = TracerBuffer(capacity)
+            expected.restore(stored_points[end - count:end], x_offset, y_offset)
+            assert np.array_equal(tracer.points(), expected.points())
+            assert tracer.world_bounds() == expected.world_bounds()
+
+            tracer.append(1.0, 2.0)
+            expected.append(1.0, 2.0)
+            assert np.array_equal(tracer.points(), expected.points())
@@ -0,0 +1,64 @@
+from view_model import ViewModel
+
+
+def test_bind_marks_value_dirty_until_flushed() -> None:
+    calls = []
+    view_model = ViewModel()
+    view_model.bind("label", calls.append, "Number of planets: 3")
+    assert calls == []
+
+    assert view_model.flush() == 1
+    assert calls == ["Number of planets: 3"]
+    assert view_model.flush() == 0
+
+
+def test_unchanged_values_are_not_pushed_again() -> None:
+    calls = []
+    view_model = ViewModel()
+    view_model.bind("label", calls.append, "a")
+    view_model.flush()
+
+    view_model.set("label", "a")
+    assert view_model.flush() == 0
+
+    view_model.set("label", "b")
+    view_model.set("label", "c")
+    assert view_model.flush() == 1
+    assert calls == ["a", "c"]
+
+
+def test_setting_back_to_the_displayed_value_cancels_the_update() -> None:
+    calls = []
+    view_model = ViewModel()
+    view_model.bind("label", calls.append, "a")
+    view_model.flush()
+
+    view_model.set("label", "b")
+    view_model.set("label", "a")
+    assert view_model.flush() == 0
+    assert calls == ["a"]
+
+
+def test_invalidate_forces_the_next_set_through() -> None:
+    calls = []
+    view_model = ViewModel()
+    view_model.bind("input", calls.append, "10")
+    view_model.flush()
+
+    view_model.invalidate("input")
+    view_model.set("input", "10")
+    assert view_model.flush() == 1
+    assert calls == ["10", "10"]
+
+
+def test_flush_updates_each_binding_once() -> None:
+    first_calls, second_calls = [], []
+    view_model = ViewModel()
+    view_model.bind("first", first_calls.append, 1)
+    view_model.bind("second", second_calls.append, 2)
+    for value in range(5):
+        view_model.set("first", value)
+
+    assert view_model.flush() == 2
+    assert first_calls == [4]
+    assert second_calls == [2]
@@ -0,0 +1,72 @@
+import time
+from typing import Callable
+
+from clock import FixedTimestepClock
+from engine import create_engine
+from simulation import Simulation
+from worker import SimulationWorker
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def create_worker(engine_name: str = "numpy") -> SimulationWorker:
+    simulation = Simulation(1000, 800, 10, 20, 50, 1000, 50, engine=create_engine(engine_name), seed=1)
+    return SimulationWorker(simulation, FixedTimestepClock(1.0, 60), 60)
+
+
+def test_failing_command_is_reported_and_steps_continue() -> None:
+    worker = create_worker()
+    worker.start()
+    try:
+        def fail() -> None:
+            raise RuntimeError("bad command")
+
+        worker.submit(fail)
+        assert wait_for(lambda: len(worker.errors) > 0)
+        steps = worker.simulation.steps
+        assert wait_for(lambda: worker.simulation.steps > steps)
+        assert "bad command" in worker.errors[0]
+    finally:
+        worker.stop()
+
+
+def test_failing_step_is_reported_and_worker_keeps_running() -> None:
+    worker = create_worker()
+    worker.start()
+    try:
+        def fail(*args) -> None:
+            raise OSError("disk full")
+
+        worker.simulation.run = fail
+        assert wait_for(lambda: len(worker.errors) > 0)
+        assert worker.thread.is_alive()
+        assert "disk full" in worker.errors[0]
+
+        del worker.simulation.run
+        worker.errors.clear()
+        steps = worker.simulation.steps
+        assert wait_for(lambda: worker.simulation.steps > steps)
+    finally:
+        worker.stop()
+
+
+def test_removed_frozen_planet_is_released() -> None:
+    worker = create_worker("loop")
+    planet = worker.simulation.planets[2]
+    worker.frozen_planet = planet
+    worker.start()
+    try:
+        worker.submit(worker.simulation.remove_planet, planet)
+        assert wait_for(lambda: worker.frozen_planet is None)
+        steps = worker.simulation.steps
+        assert wait_for(lambda: worker.simulation.steps > steps)
+        assert not worker.errors
+    finally:
+        worker.stop()
@@ -0,0 +1,178 @@
+from typing import List, NamedTuple, Tuple
+import numpy as np
+
+Rect = Tuple[float, float, float, float]
+
+
+class FrozenTracer(NamedTuple):
+    points: np.ndarray
+    bounds: Rect | None
+
+
+class TracerBuffer:
+    def __init__(
+            self,
+            capacity: int,
+            positions: np.ndarray | None = None,
+            count: int = 0,
+            x_offset: float = 0.0,
+            y_offset: float = 0.0,
+            bounds: List[float] | None = None
+    ) -> None:
+        self.capacity = capacity
+        self.positions = positions
+        self.head = count % capacity if capacity else 0
+        self.count = count
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.bounds = bounds
+        self.appended = 0
+        self.frozen: FrozenTracer | None = None
+        self.frozen_appended = 0
+        self.frozen_points: np.ndarray | None = None
+        self.frozen_end = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, x: float, y: float) -> None:
+        if not self.capacity:
+            return
+
+        if self.positions is None:
+            self.positions = np.empty((self.capacity, 2))
+
+        x -= self.x_offset
+        y -= self.y_offset
+        self.positions[self.head] = x, y
+        if self.bounds is None:
+            self.bounds = [x, y, x, y]
+        else:
+            bounds = self.bounds
+            if x < bounds[0]:
+                bounds[0] = x
+            elif x > bounds[2]:
+                bounds[2] = x
+            if y < bounds[1]:
+                bounds[1] = y
+            elif y > bounds[3]:
+                bounds[3] = y
+
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.appended += 1
+
+    def clear(self) -> None:
+        self.head = 0
+        self.count = 0
+        self.x_offset = 0.0
+        self.y_offset = 0.0
+        self.bounds = None
+        self.frozen = None
+
+    def shift(self, dx: float, dy: float) -> None:
+        self.x_offset += dx
+        self.y_offset += dy
+        self.frozen = None
+
+    def stored_points(self) -> np.ndarray:
+        if not self.count:
+            return np.empty((0, 2))
+
+        if self.count < self.capacity:
+            return self.positions[:self.count]
+        return np.concatenate((self.positions[self.head:], self.positions[:self.head]))
+
+    def points(self) -> np.ndarray:
+        return self.stored_points() + (self.x_offset, self.y_offset)
+
+    def restore(self, stored_points: np.ndarray, x_offset: float = 0.0, y_offset: float = 0.0) -> None:
+        self.clear()
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+
+        count = min(len(stored_points), self.capacity)
+        if not count:
+            return
+
+        if self.positions is None:
+            self.positions = np.empty((self.capacity, 2))
+
+        self.positions[:count] = stored_points[len(stored_points) - count:]
+        self.head = count % self.capacity
+        self.count = count
+        self.bounds = [*self.positions[:count].min(axis=0).tolist(), *self.positions[:count].max(axis=0).tolist()]
+        self.frozen = None
+
+    def freeze(self) -> FrozenTracer:
+        new_points = self.appended - self.frozen_appended
+        if self.frozen is not None and not new_points:
+            return self.frozen
+
+        if self.frozen is None or new_points > self.count or self.frozen_end + new_points > 2 * self.capacity:
+            self.frozen_points = np.empty((2 * self.capacity, 2))
+            self.frozen_points[:self.count] = self.points()
+            self.frozen_end = self.count
+        else:
+            start = self.head - new_points
+            end = self.frozen_end + new_points
+            if start >= 0:
+                self.frozen_points[self.frozen_end:end] = self.positions[start:self.head]
+            else:
+                self.frozen_points[self.frozen_end:end] = np.concatenate(
+                    (self.positions[start:], self.positions[:self.head])
+                )
+            if self.x_offset or self.y_offset:
+                self.frozen_points[self.frozen_end:end] += (self.x_offset, self.y_offset)
+            self.frozen_end = end
+
+        points = self.frozen_points[self.frozen_end - self.count:self.frozen_end]
+        points.flags.writeable = False
+        self.frozen = FrozenTracer(points, self.world_bounds())
+        self.frozen_appended = self.appended
+        return self.frozen
+
+    def world_bounds(self) -> Rect | None:
+        if self.bounds is None:
+            return None
+
+        min_x, min_y, max_x, max_y = self.bounds
+        return min_x + self.x_offset, min_y + self.y_offset, max_x + self.x_offset, max_y + self.y_offset
+
+
+def restore_tracers(
+        capacity: int,
+        stored_points: np.ndarray,
+        counts: np.ndarray,
+        x_offsets: np.ndarray,
+        y_offsets: np.ndarray
+) -> List[TracerBuffer | None]:
+    counts = counts.astype(np.int64)
+    kept_counts = np.minimum(counts, capacity)
+    restored = np.flatnonzero(kept_counts)
+    kept_counts = kept_counts[restored]
+    tracers: List[TracerBuffer | None] = [None] * len(counts)
+    if not len(restored):
+        return tracers
+
+    block = np.empty((len(restored), capacity, 2))
+    slot_starts = np.cumsum(kept_counts) - kept_counts
+    if len(restored) == len(counts) and np.all(counts == capacity):
+        kept_points = stored_points
+        block[:] = kept_points.reshape(block.shape)
+    else:
+        slots = np.repeat(np.arange(len(restored)), kept_counts)
+        rows = np.arange(len(slots)) - slot_starts[slots]
+        kept_points = stored_points[(np.cumsum(counts)[restored] - kept_counts)[slots] + rows]
+        block.reshape(-1, 2)[slots * capacity + rows] = kept_points
+    bounds = np.hstack((
+        np.minimum.reduceat(kept_points, slot_starts), np.maximum.reduceat(kept_points, slot_starts)
+    ))
+
+    for index, positions, count, x_offset, y_offset, tracer_bounds in zip(
+            restored.tolist(), block, kept_counts.tolist(),
+            x_offsets[restored].tolist(), y_offsets[restored].tolist(), bounds.tolist()
+    ):
+        tracers[index] = TracerBuffer(capacity, positions, count, x_offset, y_offset, tracer_bounds)
+    return tracers
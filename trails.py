@@ -0,0 +1,119 @@
+from typing import Callable, Iterable, Tuple
+import numpy as np
+from PyQt5.QtGui import QImage, QPainter, QColor, QPolygonF
+from PyQt5.QtCore import Qt
+
+from camera import visible_mask
+
+View = Tuple[int, float, float, float, int, int]
+
+
+def points_to_polygon(points: np.ndarray) -> QPolygonF:
+    polygon = QPolygonF(len(points))
+    buffer = polygon.data()
+    buffer.setsize(points.size * points.itemsize)
+    np.frombuffer(buffer, dtype=np.float64).reshape(points.shape)[:] = points
+    return polygon
+
+
+class TrailLayer:
+    def __init__(
+            self,
+            fade: float = 0.0,
+            min_fade_step: float = 0.125,
+            max_segment_length: float = 100.0,
+            color: QColor = QColor(255, 255, 255)
+    ) -> None:
+        self.fade = fade
+        self.min_fade_step = min_fade_step
+        self.pending_fade = 0.0
+        self.max_segment_length = max_segment_length
+        self.color = color
+
+        self.image: QImage | None = None
+        self.view: View | None = None
+        self.ids: np.ndarray | None = None
+        self.positions: np.ndarray | None = None
+
+    def invalidate(self) -> None:
+        self.view = None
+
+    def draw(
+            self,
+            painter: QPainter,
+            view: View,
+            ids: np.ndarray,
+            screen_positions: np.ndarray,
+            histories: Callable[[], Iterable[np.ndarray]]
+    ) -> None:
+        width, height = view[-2:]
+        if self.image is None or (self.image.width(), self.image.height()) != (width, height):
+            self.image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+            self.view = None
+
+        if view != self.view:
+            layer_painter = QPainter(self.image)
+            self.image.fill(Qt.transparent)
+            layer_painter.setPen(self.color)
+            for points in histories():
+                self.draw_polyline(layer_painter, points)
+            layer_painter.end()
+            self.view = view
+            self.pending_fade = 0.0
+        elif ids is not self.ids:
+            layer_painter = QPainter(self.image)
+            if self.fade > 0:
+                self.fade_out(layer_painter)
+            self.draw_segments(layer_painter, ids, screen_positions, width, height)
+            layer_painter.end()
+
+        self.ids = ids
+        self.positions = screen_positions
+        painter.drawImage(0, 0, self.image)
+
+    def draw_polyline(self, painter: QPainter, points: np.ndarray) -> None:
+        differences = np.diff(points, axis=0)
+        breaks = np.flatnonzero((differences * differences).sum(axis=1) > self.max_segment_length ** 2) + 1
+        for part in np.split(points, breaks):
+            if len(part) > 1:
+                painter.drawPolyline(points_to_polygon(part))
+            elif len(part):
+                painter.drawPoints(points_to_polygon(part))
+
+    def fade_out(self, painter: QPainter) -> None:
+        self.pending_fade = 1.0 - (1.0 - self.pending_fade) * (1.0 - self.fade)
+        if self.pending_fade < self.min_fade_step:
+            return
+
+        painter.setCompositionMode(QPainter.CompositionMode_DestinationOut)
+        painter.fillRect(self.image.rect(), QColor(0, 0, 0, round(self.pending_fade * 255)))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        self.pending_fade = 0.0
+
+    def draw_segments(
+            self,
+            painter: QPainter,
+            ids: np.ndarray,
+            screen_positions: np.ndarray,
+            width: int,
+            height: int
+    ) -> None:
+        if np.array_equal(ids, self.ids):
+            starts = self.positions
+            ends = screen_positions
+        else:
+            order = np.argsort(self.ids)
+            sorted_ids = self.ids[order]
+            found = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+            matched = sorted_ids[found] == ids if len(sorted_ids) else np.zeros(len(ids), dtype=bool)
+            starts = self.positions[order[found[matched]]]
+            ends = screen_positions[matched]
+
+        differences = ends - starts
+        lengths_squared = (differences * differences).sum(axis=1)
+        drawn = (lengths_squared > 0.0) & (lengths_squared <= self.max_segment_length ** 2) & (
+                visible_mask(starts, 0.0, width, height) | visible_mask(ends, 0.0, width, height)
+        )
+        if drawn.any():
+            painter.setPen(self.color)
+            painter.drawLines(points_to_polygon(np.stack((starts[drawn], ends[drawn]), axis=1).reshape(-1, 2)))
@@ -0,0 +1,33 @@
+from typing import Any, Callable, Dict
+
+
+class ViewModel:
+    def __init__(self) -> None:
+        self.setters: Dict[str, Callable[[Any], None]] = {}
+        self.values: Dict[str, Any] = {}
+        self.displayed: Dict[str, Any] = {}
+        self.dirty: Dict[str, None] = {}
+
+    def bind(self, name: str, setter: Callable[[Any], None], value: Any = None) -> None:
+        self.setters[name] = setter
+        self.displayed.pop(name, None)
+        self.set(name, value)
+
+    def set(self, name: str, value: Any) -> None:
+        self.values[name] = value
+        if name in self.displayed and self.displayed[name] == value:
+            self.dirty.pop(name, None)
+        else:
+            self.dirty[name] = None
+
+    def invalidate(self, name: str) -> None:
+        self.displayed.pop(name, None)
+
+    def flush(self) -> int:
+        number_of_updates = len(self.dirty)
+        for name in self.dirty:
+            value = self.values[name]
+            self.setters[name](value)
+            self.displayed[name] = value
+        self.dirty.clear()
+        return number_of_updates
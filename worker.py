@@ -0,0 +1,132 @@
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Callable, List, NamedTuple, Tuple
+import numpy as np
+
+from planet import Planet
+from tracer import FrozenTracer
+from simulation import Simulation
+from clock import FixedTimestepClock
+
+
+class SimulationSnapshot(NamedTuple):
+    planets: Tuple[Planet, ...]
+    ids: np.ndarray
+    positions: np.ndarray
+    radii: np.ndarray
+    masses: np.ndarray
+    tracers: Tuple[FrozenTracer | None, ...]
+    center_of_mass: Tuple[int, int] | None
+    steps: int
+    generation: int
+
+
+def capture_snapshot(simulation: Simulation) -> SimulationSnapshot:
+    store = simulation.planets
+    n = len(store)
+    ids = store.ids[:n].copy()
+    positions = store.positions[:n].copy()
+    radii = store.radii[:n].copy()
+    masses = store.masses[:n].copy()
+    for array in (ids, positions, radii, masses):
+        array.flags.writeable = False
+
+    if simulation.tracers_enabled:
+        tracers = tuple(tracer.freeze() if tracer else None for tracer in store.tracers)
+    else:
+        tracers = (None,) * n
+
+    return SimulationSnapshot(
+        planets=tuple(store.views),
+        ids=ids,
+        positions=positions,
+        radii=radii,
+        masses=masses,
+        tracers=tracers,
+        center_of_mass=simulation.calculate_center_of_mass(),
+        steps=simulation.steps,
+        generation=simulation.generation
+    )
+
+
+class SimulationWorker:
+    def __init__(self, simulation: Simulation, clock: FixedTimestepClock, frames_per_second: int) -> None:
+        self.simulation = simulation
+        self.clock = clock
+        self.frame_interval = 1 / frames_per_second
+
+        self.paused = False
+        self.frozen_planet = None
+        self.physics_time = 0.0
+
+        self.commands = deque()
+        self.errors = deque(maxlen=16)
+        self.snapshot = capture_snapshot(simulation)
+        self.snapshot_listeners: List[Callable[[SimulationSnapshot], None]] = []
+        self.wake_up = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def submit(self, command: Callable, *args) -> None:
+        self.commands.append((command, args))
+        self.wake_up.set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="simulation-worker", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self.wake_up.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def apply_commands(self) -> bool:
+        applied = False
+        while self.commands:
+            command, args = self.commands.popleft()
+            try:
+                command(*args)
+            except Exception as error:
+                self.errors.append(f"{getattr(command, '__name__', 'Command')} failed: {error}")
+            applied = True
+        return applied
+
+    def run(self) -> None:
+        last_step_time = perf_counter()
+
+        while self.running:
+            changed = self.apply_commands()
+
+            step_time = perf_counter()
+            elapsed = step_time - last_step_time
+            last_step_time = step_time
+
+            if self.paused:
+                self.clock.reset()
+                self.physics_time = 0.0
+            else:
+                if self.frozen_planet is not None and self.frozen_planet not in self.simulation.planets:
+                    self.frozen_planet = None
+                number_of_steps = self.clock.advance(elapsed)
+                try:
+                    self.simulation.run(number_of_steps, self.frozen_planet)
+                except Exception as error:
+                    self.errors.append(f"Step failed: {error}")
+                self.physics_time = perf_counter() - step_time
+                changed = changed or number_of_steps > 0
+
+            if changed:
+                with self.simulation.profiler.section("snapshot"):
+                    self.snapshot = capture_snapshot(self.simulation)
+                for listener in self.snapshot_listeners:
+                    listener(self.snapshot)
+
+            self.wake_up.wait(max(self.frame_interval - (perf_counter() - step_time), 0.0))
+            self.wake_up.clear()